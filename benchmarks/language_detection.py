@@ -0,0 +1,83 @@
+"""
+语言检测基准测试 - 对比原实现（findall 生成完整列表后比较长度）与单次扫描的 LanguageDetector
+
+用法:
+    python benchmarks/language_detection.py [--repeat 5]
+"""
+import os
+import re
+import sys
+import random
+import argparse
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from language import LanguageDetector
+
+CHINESE_PATTERN = re.compile(r'[\u4e00-\u9fa5]+')
+
+
+def legacy_detect(text: str) -> str:
+    """原 ResourceParser.detect_language 的实现"""
+    chinese_chars = CHINESE_PATTERN.findall(text)
+    has_chinese = len(chinese_chars) > 0
+
+    english_words = re.findall(r'[a-zA-Z]+', text)
+    has_english = len(english_words) > 3
+
+    if has_chinese and has_english:
+        return 'mixed'
+    elif has_chinese:
+        return 'zh'
+    elif has_english:
+        return 'en'
+    else:
+        return 'unknown'
+
+
+def build_cases(seed: int = 0):
+    """构造测试文本：短标题与描述、长页面正文（英文、中文、中英混合、中文开头的混合正文）"""
+    rng = random.Random(seed)
+    english = ['cuda', 'kernel', 'attention', 'memory', 'tutorial', 'gpu', 'flash', 'guide', 'the', 'of']
+    chinese = ['并行', '计算', '教程', '显存', '优化', '注意力', '内核', '实践']
+
+    def sentence(words, count, separator=' '):
+        return separator.join(rng.choice(words) for _ in range(count))
+
+    short = [f"{sentence(english, 4)} {sentence(chinese, 3, '')} {sentence(english, 12)}" for _ in range(2000)]
+    short += [sentence(english, 16) for _ in range(2000)]
+    short += [sentence(chinese, 20, '') for _ in range(2000)]
+
+    return {
+        '短文本（6000条标题+描述）': short,
+        '长英文正文（200KB）': [sentence(english, 30000)],
+        '长中文正文（200KB）': [sentence(chinese, 40000, '，')],
+        '长混合正文（英文开头）': [sentence(english, 15000) + sentence(chinese, 20000, '')],
+        '长混合正文（中文开头）': [sentence(chinese, 20000, '') + ' ' + sentence(english, 15000)],
+    }
+
+
+def main():
+    """运行基准测试并输出耗时对比"""
+    parser = argparse.ArgumentParser(description="语言检测基准测试")
+    parser.add_argument('--repeat', type=int, default=5, help="每组测试的重复次数（取最短耗时）")
+    args = parser.parse_args()
+
+    detector = LanguageDetector()
+    extra_detector = LanguageDetector(['ja', 'ko'])
+
+    print(f"{'legacy(ms)':>12}{'single(ms)':>12}{'speedup':>9}{'ja/ko(ms)':>12}  测试用例")
+    for name, texts in build_cases().items():
+        # 结果必须与原实现一致
+        for text in texts:
+            assert detector.detect(text) == legacy_detect(text), name
+
+        legacy = min(timeit.repeat(lambda: [legacy_detect(text) for text in texts], number=1, repeat=args.repeat))
+        single = min(timeit.repeat(lambda: [detector.detect(text) for text in texts], number=1, repeat=args.repeat))
+        extra = min(timeit.repeat(lambda: [extra_detector.detect(text) for text in texts], number=1, repeat=args.repeat))
+        print(f"{legacy * 1000:>12.2f}{single * 1000:>12.2f}{legacy / single:>8.1f}x{extra * 1000:>12.2f}  {name}")
+
+
+if __name__ == '__main__':
+    main()
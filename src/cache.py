@@ -0,0 +1,345 @@
+"""
+缓存模块 - 提供基于SQLite的持久化磁盘缓存、支持条件请求的HTTP响应缓存以及搜索结果缓存
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from collections import namedtuple
+from urllib.parse import urlencode
+from typing import Dict, Any, Callable, List, Optional
+import requests
+from requests.structures import CaseInsensitiveDict
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 缓存条目：value 为原始字节，meta 为附加元数据，stored_at 为写入（或重新验证）时间戳
+CacheEntry = namedtuple('CacheEntry', ['value', 'meta', 'stored_at'])
+
+
+class DiskCache:
+    """基于SQLite的键值磁盘缓存，支持压缩与按最近访问时间的LRU淘汰（线程安全）"""
+
+    def __init__(self, path: str, max_size_mb: float = 100, compress: bool = True):
+        """
+        初始化磁盘缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            max_size_mb: 缓存内容总大小上限（MB），超出后按LRU淘汰
+            compress: 是否使用zlib压缩存储内容
+        """
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self.compress = compress
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                meta TEXT NOT NULL,
+                compressed INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_accessed ON entries (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        """
+        读取缓存条目（不判断是否过期）
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存条目，不存在时返回 None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, meta, compressed, stored_at FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+
+        value, meta, compressed, stored_at = row
+        if compressed:
+            value = zlib.decompress(value)
+        return CacheEntry(value, json.loads(meta), stored_at)
+
+    def set(self, key: str, value: bytes, meta: Dict[str, Any] = None):
+        """
+        写入缓存条目
+
+        Args:
+            key: 缓存键
+            value: 内容字节
+            meta: 附加元数据（需可JSON序列化）
+        """
+        compressed = False
+        if self.compress:
+            packed = zlib.compress(value, 6)
+            # 压缩无收益时保存原始内容
+            if len(packed) < len(value):
+                value, compressed = packed, True
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, value, meta, compressed, size, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, value, json.dumps(meta or {}, ensure_ascii=False), int(compressed), len(value), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def touch(self, key: str):
+        """
+        将条目标记为刚刚重新验证（重置其TTL）
+
+        Args:
+            key: 缓存键
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute('UPDATE entries SET stored_at = ?, accessed_at = ? WHERE key = ?', (now, now, key))
+            self._conn.commit()
+
+    def delete(self, key: str):
+        """
+        删除缓存条目
+
+        Args:
+            key: 缓存键
+        """
+        with self._lock:
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def _evict(self):
+        """总大小超过上限时，按最近访问时间从旧到新淘汰条目（调用方需持有锁）"""
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_size:
+            return
+
+        evicted = 0
+        # 淘汰到上限的90%，避免每次写入都触发淘汰
+        target = self.max_size * 0.9
+        for key, size in self._conn.execute('SELECT key, size FROM entries ORDER BY accessed_at').fetchall():
+            if total <= target:
+                break
+            self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+            total -= size
+            evicted += 1
+        logger.debug(f"缓存 {self.path} 淘汰 {evicted} 个条目")
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class HTTPCache:
+    """HTTP响应缓存：TTL内直接复用，过期后使用 ETag / Last-Modified 发送条件请求"""
+
+    # 随缓存内容保存的响应头
+    STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+    def __init__(self, store: DiskCache, ttl_seconds: float = 3600):
+        """
+        初始化HTTP响应缓存
+
+        Args:
+            store: 底层磁盘缓存
+            ttl_seconds: 缓存有效期（秒），过期后需向服务端重新验证
+        """
+        self.store = store
+        self.ttl = ttl_seconds
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Dict[str, Any] = None) -> str:
+        """
+        根据请求方法、URL与参数生成缓存键
+
+        Args:
+            method: HTTP方法
+            url: 请求地址
+            params: 查询参数
+
+        Returns:
+            缓存键（SHA-256十六进制摘要）
+        """
+        query = urlencode(sorted((params or {}).items()))
+        return hashlib.sha256(f"{method.upper()} {url}?{query}".encode('utf-8')).hexdigest()
+
+    def fetch(self, send: Callable[[Dict[str, str]], requests.Response], url: str,
+              params: Dict[str, Any] = None, headers: Dict[str, str] = None) -> requests.Response:
+        """
+        通过缓存执行GET请求
+
+        Args:
+            send: 实际发送请求的回调，接收请求头并返回响应
+            url: 请求地址
+            params: 查询参数
+            headers: 请求头
+
+        Returns:
+            响应对象；命中缓存时 response.from_cache 为 True
+        """
+        key = self.make_key('GET', url, params)
+        entry = self.store.get(key)
+
+        if entry and time.time() - entry.stored_at < self.ttl:
+            logger.debug(f"HTTP缓存命中: {url} {params}")
+            return self._build_response(entry, url)
+
+        request_headers = dict(headers or {})
+        if entry:
+            # 缓存过期时发送条件请求，服务端返回304时复用缓存内容
+            if entry.meta.get('ETag'):
+                request_headers['If-None-Match'] = entry.meta['ETag']
+            if entry.meta.get('Last-Modified'):
+                request_headers['If-Modified-Since'] = entry.meta['Last-Modified']
+
+        response = send(request_headers)
+
+        if response.status_code == 304 and entry:
+            logger.debug(f"HTTP缓存重新验证通过: {url} {params}")
+            self.store.touch(key)
+            return self._build_response(entry, url)
+
+        if response.status_code == 200:
+            meta = {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+            self.store.set(key, response.content, meta)
+
+        response.from_cache = False
+        return response
+
+    @staticmethod
+    def _build_response(entry: CacheEntry, url: str) -> requests.Response:
+        """根据缓存条目构造响应对象"""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = entry.value
+        response.headers = CaseInsensitiveDict(entry.meta)
+        response.url = url
+        response.from_cache = True
+        return response
+
+
+class QueryCache:
+    """搜索结果缓存：按查询参数缓存搜索引擎返回的结果列表，适用于不支持条件请求的搜索源"""
+
+    def __init__(self, store: DiskCache, ttl_seconds: float = 86400):
+        """
+        初始化搜索结果缓存
+
+        Args:
+            store: 底层磁盘缓存
+            ttl_seconds: 缓存有效期（秒）
+        """
+        self.store = store
+        self.ttl = ttl_seconds
+
+    @staticmethod
+    def make_key(query: Dict[str, Any]) -> str:
+        """
+        根据查询参数生成缓存键
+
+        Args:
+            query: 查询参数（关键词、结果数、地区、时间范围等）
+
+        Returns:
+            缓存键（SHA-256十六进制摘要）
+        """
+        payload = json.dumps(query, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, query: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        读取未过期的搜索结果
+
+        Args:
+            query: 查询参数
+
+        Returns:
+            搜索结果列表，未命中或已过期时返回 None
+        """
+        entry = self.store.get(self.make_key(query))
+        if entry is None or time.time() - entry.stored_at >= self.ttl:
+            return None
+        return json.loads(entry.value)
+
+    def set(self, query: Dict[str, Any], results: List[Dict[str, Any]]):
+        """
+        写入搜索结果
+
+        Args:
+            query: 查询参数
+            results: 搜索结果列表
+        """
+        payload = json.dumps(results, ensure_ascii=False).encode('utf-8')
+        self.store.set(self.make_key(query), payload, {'query': query})
+
+
+def create_query_cache(cache_dir: str, cache_config: Dict[str, Any] = None,
+                       name: str = 'query_cache') -> Optional[QueryCache]:
+    """
+    根据配置创建搜索结果缓存
+
+    Args:
+        cache_dir: 缓存目录
+        cache_config: 缓存配置（搜索源配置中的 cache 段）
+        name: 缓存数据库文件名（不含扩展名）
+
+    Returns:
+        搜索结果缓存，未启用时返回 None
+    """
+    cache_config = cache_config or {}
+    if not cache_dir or not cache_config.get('enabled', True):
+        return None
+
+    store = DiskCache(
+        os.path.join(cache_dir, f'{name}.sqlite3'),
+        max_size_mb=cache_config.get('max_size_mb', 50),
+        compress=cache_config.get('compress', True)
+    )
+    return QueryCache(store, ttl_seconds=cache_config.get('ttl_seconds', 86400))
+
+
+def create_http_cache(cache_dir: str, cache_config: Dict[str, Any] = None) -> Optional[HTTPCache]:
+    """
+    根据配置创建HTTP响应缓存
+
+    Args:
+        cache_dir: 缓存目录
+        cache_config: 缓存配置（advanced.http_cache 段）
+
+    Returns:
+        HTTP响应缓存，未启用时返回 None
+    """
+    cache_config = cache_config or {}
+    if not cache_dir or not cache_config.get('enabled', True):
+        return None
+
+    store = DiskCache(
+        os.path.join(cache_dir, 'http_cache.sqlite3'),
+        max_size_mb=cache_config.get('max_size_mb', 100),
+        compress=cache_config.get('compress', True)
+    )
+    return HTTPCache(store, ttl_seconds=cache_config.get('ttl_seconds', 3600))
@@ -0,0 +1,134 @@
+"""
+断点续传模块 - 以追加写入的JSONL运行日志记录每个 (搜索源, 关键词) 的结果，支持中断后恢复
+"""
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class RunJournal:
+    """
+    收集运行日志
+
+    每完成一个 (搜索源, 关键词) 就追加一行JSON记录并立即刷新到磁盘，
+    进程被中断（封禁、Ctrl-C、崩溃）时已完成的工作不会丢失。
+    恢复运行时读取日志，已完成的关键词直接回放结果而不再重新搜索。
+    """
+
+    def __init__(self, path: str, resume: bool = False, params: Dict[str, Any] = None):
+        """
+        初始化运行日志
+
+        Args:
+            path: 日志文件路径（JSONL）
+            resume: 是否从已有日志恢复；为 False 时清空旧日志开始新的运行
+            params: 本次运行的搜索配置，用于检测恢复时配置是否发生变化
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._completed: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        params_hash = self._hash_params(params)
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        if resume and os.path.exists(path):
+            self._load(params_hash)
+            self._file = open(path, 'a', encoding='utf-8')
+        else:
+            if resume:
+                logger.info(f"未找到运行日志 {path}，开始新的运行")
+            self._file = open(path, 'w', encoding='utf-8')
+            self._append({
+                'type': 'run',
+                'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'params_hash': params_hash
+            })
+
+    @staticmethod
+    def _hash_params(params: Dict[str, Any] = None) -> str:
+        """计算搜索配置的摘要"""
+        payload = json.dumps(params or {}, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def _load(self, params_hash: str):
+        """读取已有日志中已完成的关键词结果"""
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程在写入过程中被终止时最后一行可能不完整
+                    logger.warning(f"跳过运行日志 {self.path} 第 {line_number} 行的不完整记录")
+                    continue
+
+                if record.get('type') == 'run':
+                    if record.get('params_hash') != params_hash:
+                        logger.warning("搜索配置与中断的运行不同，已完成关键词仍将沿用日志中的结果")
+                    logger.info(f"恢复 {record.get('started_at')} 开始的运行")
+                elif record.get('type') == 'keyword':
+                    self._completed[(record['source'], record['keyword'])] = record['results']
+
+        logger.info(f"运行日志中已有 {len(self._completed)} 个已完成的 (搜索源, 关键词)")
+
+    def _append(self, record: Dict[str, Any]):
+        """追加一条记录并刷新到磁盘"""
+        with self._lock:
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def completed(self, source: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        获取某个搜索源已完成的关键词结果
+
+        Args:
+            source: 搜索源名称
+
+        Returns:
+            关键词 -> 结果列表
+        """
+        return {
+            keyword: results
+            for (record_source, keyword), results in self._completed.items()
+            if record_source == source
+        }
+
+    def record(self, source: str, keyword: str, results: List[Dict[str, Any]]):
+        """
+        记录一个已完成关键词的结果
+
+        Args:
+            source: 搜索源名称
+            keyword: 关键词
+            results: 结果列表
+        """
+        # 只写入磁盘，不在内存中保留结果（流式模式下保持内存占用恒定）
+        self._append({
+            'type': 'keyword',
+            'source': source,
+            'keyword': keyword,
+            'results': results,
+            'completed_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
+
+    def close(self):
+        """关闭日志文件"""
+        with self._lock:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,167 +1,635 @@
 """
 信息收集模块 - 负责从多个源搜索CUDA和HPC相关资源
 """
+import os
 import time
-import requests
-from typing import List, Dict, Any
+import functools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Tuple
 from ddgs import DDGS
 from tqdm import tqdm
 import logging
 
+from rate_limiter import create_rate_limiter, is_rate_limited
+from http_client import create_session, get_proxy_url
+from cache import create_http_cache, create_query_cache
+from keyword_stats import create_keyword_scheduler
+from provenance import ProvenanceTable, merge_provenance
+from github_graphql import (
+    GITHUB_GRAPHQL_URL, build_search_query, repository_to_resource,
+    build_repository_query, repository_metadata
+)
+from url_utils import ensure_url_key
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+GITHUB_SEARCH_URL = "https://api.github.com/search/repositories"
+# GitHub搜索API每页最多100条，单个查询最多返回1000条
+GITHUB_MAX_PER_PAGE = 100
+GITHUB_SEARCH_LIMIT = 1000
+
 
 class ResourceCollector:
     """资源收集器类"""
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, advanced: Dict[str, Any] = None,
+                 cache_dir: str = None):
         """
         初始化收集器
 
         Args:
             config: 配置字典
+            advanced: 高级配置（超时、代理、User-Agent 等）
+            cache_dir: 持久化缓存目录，为 None 时不启用磁盘缓存
         """
         self.config = config or {}
+        self.advanced = advanced or {}
+
+        # 所有HTTP搜索源与后续处理步骤共享的连接池会话
+        self.session = create_session(self.advanced)
+        # HTTP响应缓存（支持 ETag / Last-Modified 条件请求）
+        self.http_cache = create_http_cache(cache_dir, self.advanced.get('http_cache'))
+        # DuckDuckGo搜索结果缓存；refresh 为 True 时跳过读取缓存（仍会写入新结果）
+        ddg_cache_config = self.config.get('sources', {}).get('duckduckgo', {}).get('cache')
+        self.ddg_cache = create_query_cache(cache_dir, ddg_cache_config, name='ddg_cache')
+        self.refresh = False
+
+        # GitHub访问令牌：优先读取配置，其次读取环境变量 GITHUB_TOKEN
+        github_config = self.config.get('sources', {}).get('github', {})
+        self.github_token = github_config.get('token') or os.environ.get('GITHUB_TOKEN')
+
+        self._ddgs_kwargs = {
+            'proxy': get_proxy_url(self.advanced),
+            'timeout': self.advanced.get('timeout', 30)
+        }
         try:
-            self.ddgs = DDGS()
+            self.ddgs = DDGS(**self._ddgs_kwargs)
             logger.info("DuckDuckGo 搜索引擎初始化成功")
         except Exception as e:
             logger.error(f"DuckDuckGo 搜索引擎初始化失败: {e}")
             self.ddgs = None
         self.collected_resources = []
+        # (搜索源, 关键词) 编号表，去重时以位集记录每个资源的所有命中来源
+        self.provenance = ProvenanceTable()
+        self.source_timings = {}
+        # 运行日志（checkpoint.RunJournal），设置后每个完成的关键词都会被记录，已完成的关键词从日志回放
+        self.journal = None
+        # 搜索失败的 (搜索源, 关键词)，其结果不完整，不写入运行日志
+        self._failed_keywords = set()
+        # 结果来自搜索结果缓存的 (搜索源, 关键词)，其结果是之前搜索的回放，不计入收益统计
+        self._cached_keywords = set()
+        # 任务队列（work_queue.WorkQueue），设置后本进程作为 coordinator，搜索交给 worker 完成
+        self.work_queue = None
+        self.work_queue_run_id = None
+        self._factories_by_source = None
+
+        # 关键词收益统计与调度：按历史新URL收益排列关键词并分配结果数
+        self.keyword_scheduler = create_keyword_scheduler(cache_dir, self.config.get('scheduler'))
+        # 本次运行中每个 (搜索源, 关键词) 的搜索耗时
+        self._keyword_latency = {}
+
+        # 并发搜索使用的线程局部存储
+        self._thread_local = threading.local()
+
+        # 每个搜索源独立的令牌桶限流器，默认速率由 delay_seconds 推算
+        delay_seconds = self.config.get('delay_seconds') or 1
+        sources_config = self.config.get('sources', {})
+        self.rate_limiters = {
+            source: create_rate_limiter(source, sources_config.get(source, {}), 1.0 / delay_seconds)
+            for source in ('duckduckgo', 'github')
+        }
 
-    def search_duckduckgo(self, keywords: List[str], max_results: int = 50) -> List[Dict[str, Any]]:
+    def _get_ddgs(self):
         """
-        使用DuckDuckGo搜索资源
+        获取当前线程使用的DuckDuckGo搜索实例
+
+        主线程复用 self.ddgs，并发模式下每个工作线程各自持有一个实例，
+        避免多个线程共享同一个底层HTTP客户端。
+
+        Returns:
+            DDGS实例
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.ddgs
+        ddgs = getattr(self._thread_local, 'ddgs', None)
+        if ddgs is None:
+            ddgs = DDGS(**self._ddgs_kwargs)
+            self._thread_local.ddgs = ddgs
+        return ddgs
+
+    def _search_duckduckgo_keyword(self, keyword: str, max_results: int, region: str = 'us-en',
+                                   timelimit: str = None) -> List[Dict[str, Any]]:
+        """
+        使用DuckDuckGo搜索单个关键词
 
         Args:
-            keywords: 搜索关键词列表
+            keyword: 搜索关键词
             max_results: 最大结果数
+            region: 搜索地区
+            timelimit: 时间范围（d/w/m/y），None 表示不限
 
         Returns:
-            搜索结果列表
+            该关键词的搜索结果列表
         """
         results = []
-        
-        # 检查 DuckDuckGo 是否初始化成功
-        if self.ddgs is None:
-            logger.warning("DuckDuckGo 搜索引擎未初始化,跳过搜索")
-            return results
+        query = {
+            'keyword': keyword,
+            'max_results': max_results,
+            'region': region,
+            'timelimit': timelimit
+        }
+        started_at = time.monotonic()
+        try:
+            search_results = None
+            if self.ddg_cache is not None and not self.refresh:
+                search_results = self.ddg_cache.get(query)
+                if search_results is not None:
+                    logger.info(f"关键词 '{keyword}' 命中缓存 {len(search_results)} 条结果")
+                    self._cached_keywords.add(('DuckDuckGo', keyword))
+
+            if search_results is None:
+                # 避免请求过快
+                self.rate_limiters['duckduckgo'].acquire()
 
-        logger.info(f"开始 DuckDuckGo 搜索,关键词数量: {len(keywords)}, 每个关键词最多 {max_results} 条结果")
-        
-        for keyword in tqdm(keywords, desc="DuckDuckGo搜索"):
-            try:
                 logger.debug(f"搜索关键词: {keyword}")
                 # 执行搜索
-                search_results = list(self.ddgs.text(
+                search_results = list(self._get_ddgs().text(
                     query=keyword,
+                    region=region,
+                    timelimit=timelimit,
                     max_results=max_results
                 ))
-                
+
                 logger.info(f"关键词 '{keyword}' 返回 {len(search_results)} 条结果")
+                if self.ddg_cache is not None:
+                    self.ddg_cache.set(query, search_results)
 
-                for result in search_results:
-                    # ddgs 可能返回 'href' 或 'link' 作为 URL 字段
-                    url = result.get('href') or result.get('link') or result.get('url', '')
-                    
-                    # 跳过没有 URL 的结果
-                    if not url:
-                        logger.warning(f"跳过无 URL 的结果: {result.get('title', 'Unknown')}")
-                        logger.debug(f"结果详情: {result}")
-                        continue
-                    
-                    resource = {
-                        'title': result.get('title', ''),
-                        'url': url,
-                        'description': result.get('body', ''),
-                        'source': 'DuckDuckGo',
-                        'keyword': keyword
-                    }
-                    results.append(resource)
+            for result in search_results:
+                # ddgs 可能返回 'href' 或 'link' 作为 URL 字段
+                url = result.get('href') or result.get('link') or result.get('url', '')
 
-                # 避免请求过快
-                time.sleep(1)
+                # 跳过没有 URL 的结果
+                if not url:
+                    logger.warning(f"跳过无 URL 的结果: {result.get('title', 'Unknown')}")
+                    logger.debug(f"结果详情: {result}")
+                    continue
 
-            except Exception as e:
-                logger.error(f"DuckDuckGo搜索错误 ({keyword}): {e}", exc_info=True)
-                continue
+                resource = {
+                    'title': result.get('title', ''),
+                    'url': url,
+                    'description': result.get('body', ''),
+                    'source': 'DuckDuckGo',
+                    'keyword': keyword
+                }
+                results.append(resource)
 
-        logger.info(f"DuckDuckGo 搜索完成,共获得 {len(results)} 条结果")
+        except Exception as e:
+            logger.error(f"DuckDuckGo搜索错误 ({keyword}): {e}", exc_info=True)
+            self._mark_failed('DuckDuckGo', keyword)
+
+        self._keyword_latency[('DuckDuckGo', keyword)] = time.monotonic() - started_at
         return results
 
-    def search_github(self, keywords: List[str], min_stars: int = 10) -> List[Dict[str, Any]]:
+    def iter_duckduckgo(self, keywords: List[str], max_results: int = 50,
+                        concurrency: int = 1, region: str = 'us-en',
+                        timelimit: str = None,
+                        result_limits: Dict[str, int] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
         """
-        使用GitHub API搜索代码仓库
+        使用DuckDuckGo搜索资源，按关键词完成顺序逐个产出结果
 
         Args:
             keywords: 搜索关键词列表
-            min_stars: 最小星标数
+            max_results: 最大结果数
+            concurrency: 并发搜索的关键词数量，1 表示逐个搜索
+            region: 搜索地区
+            timelimit: 时间范围（d/w/m/y），None 表示不限
+            result_limits: 各关键词的最大结果数，未列出的关键词使用 max_results
+
+        Yields:
+            (关键词, 该关键词的搜索结果列表) 元组
+        """
+        # 检查 DuckDuckGo 是否初始化成功
+        if self.ddgs is None:
+            logger.warning("DuckDuckGo 搜索引擎未初始化,跳过搜索")
+            return
+
+        result_limits = result_limits or {}
+        concurrency = max(1, min(concurrency, len(keywords) or 1))
+        logger.info(f"开始 DuckDuckGo 搜索,关键词数量: {len(keywords)}, 每个关键词最多 {max_results} 条结果, 并发数: {concurrency}")
+
+        if concurrency == 1:
+            for keyword in tqdm(keywords, desc="DuckDuckGo搜索"):
+                yield keyword, self._search_duckduckgo_keyword(
+                    keyword, result_limits.get(keyword, max_results), region, timelimit
+                )
+        else:
+            # 并发执行各关键词搜索，全局请求速率仍由限流器控制
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ddg") as executor:
+                futures = {
+                    executor.submit(self._search_duckduckgo_keyword, keyword,
+                                    result_limits.get(keyword, max_results), region, timelimit): keyword
+                    for keyword in keywords
+                }
+                for future in tqdm(as_completed(futures), total=len(futures), desc="DuckDuckGo搜索"):
+                    yield futures[future], future.result()
+
+    def search_duckduckgo(self, keywords: List[str], max_results: int = 50,
+                          concurrency: int = 1, region: str = 'us-en',
+                          timelimit: str = None) -> List[Dict[str, Any]]:
+        """
+        使用DuckDuckGo搜索资源
+
+        Args:
+            keywords: 搜索关键词列表
+            max_results: 最大结果数
+            concurrency: 并发搜索的关键词数量，1 表示逐个搜索
+            region: 搜索地区
+            timelimit: 时间范围（d/w/m/y），None 表示不限
 
         Returns:
-            搜索结果列表
+            搜索结果列表（按关键词顺序排列）
         """
-        results = []
-        base_url = "https://api.github.com/search/repositories"
+        results = _in_keyword_order(
+            keywords, self.iter_duckduckgo(keywords, max_results, concurrency, region, timelimit)
+        )
+        logger.info(f"DuckDuckGo 搜索完成,共获得 {len(results)} 条结果")
+        return results
+
+    def _send_github_request(self, method: str, url: str, **kwargs):
+        """
+        发送受GitHub限流器约束的HTTP请求
+
+        请求前获取令牌，响应后根据速率限制响应头调整限流器；
+        若因限流被拒绝，则等待限流器暂停结束后重试一次。
+
+        Args:
+            method: HTTP方法
+            url: 请求地址
+            **kwargs: 透传给 requests.Session.request 的参数
+
+        Returns:
+            requests.Response 对象
+        """
+        limiter = self.rate_limiters['github']
+        for _ in range(2):
+            limiter.acquire()
+            response = self.session.request(method, url, **kwargs)
+            # 根据速率限制响应头调整后续请求节奏
+            limiter.update_from_headers(response.headers)
+            # 触发限流时等待限流器暂停结束后重试一次
+            if not is_rate_limited(response.status_code, response.headers):
+                break
+        return response
+
+    def _github_request(self, method: str, url: str, params: Dict[str, Any] = None,
+                        headers: Dict[str, str] = None, **kwargs):
+        """
+        发送GitHub API请求
+
+        启用HTTP缓存时，GET请求优先复用缓存，过期后发送条件请求；
+        缓存命中不消耗限流器令牌，304响应也不计入GitHub的速率额度。
+
+        Args:
+            method: HTTP方法
+            url: 请求地址
+            params: 查询参数
+            headers: 请求头
+            **kwargs: 透传给 requests.Session.request 的参数
 
-        headers = {
-            'Accept': 'application/vnd.github.v3+json'
+        Returns:
+            requests.Response 对象
+        """
+        if method.upper() == 'GET' and self.http_cache is not None:
+            return self.http_cache.fetch(
+                lambda request_headers: self._send_github_request(
+                    method, url, params=params, headers=request_headers, **kwargs
+                ),
+                url, params, headers
+            )
+        return self._send_github_request(method, url, params=params, headers=headers, **kwargs)
+
+    def _github_headers(self, accept: str) -> Dict[str, str]:
+        """
+        构建GitHub API请求头，配置了令牌时附带认证信息
+
+        Args:
+            accept: Accept 请求头取值
+
+        Returns:
+            请求头字典
+        """
+        headers = {'Accept': accept}
+        if self.github_token:
+            headers['Authorization'] = f"Bearer {self.github_token}"
+        return headers
+
+    @staticmethod
+    def _github_repo_to_resource(repo: Dict[str, Any], keyword: str) -> Dict[str, Any]:
+        """
+        将GitHub仓库数据转换为资源字典
+
+        Args:
+            repo: GitHub API返回的仓库数据
+            keyword: 搜索关键词
+
+        Returns:
+            资源字典
+        """
+        return {
+            'title': repo.get('full_name', ''),
+            'url': repo.get('html_url', ''),
+            'description': repo.get('description', ''),
+            'source': 'GitHub',
+            'stars': repo.get('stargazers_count', 0),
+            'language': repo.get('language', ''),
+            'updated_at': repo.get('updated_at', ''),
+            'keyword': keyword
         }
 
-        for keyword in tqdm(keywords, desc="GitHub搜索"):
-            try:
-                # 构建查询
-                query = f"{keyword} stars:>={min_stars}"
-                params = {
-                    'q': query,
-                    'sort': 'stars',
-                    'order': 'desc',
-                    'per_page': 30
-                }
+    def _search_github_page(self, keyword: str, query: str, page: int, per_page: int):
+        """
+        获取GitHub仓库搜索的一页结果
+
+        Args:
+            keyword: 搜索关键词（请求失败时用于标记该关键词结果不完整）
+            query: 搜索查询
+            page: 页码（从1开始）
+            per_page: 每页数量
+
+        Returns:
+            (仓库列表, 结果总数) 元组，请求失败时返回 ([], 0)
+        """
+        params = {
+            'q': query,
+            'sort': 'stars',
+            'order': 'desc',
+            'per_page': per_page,
+            'page': page
+        }
+        headers = self._github_headers('application/vnd.github.v3+json')
+        response = self._github_request('GET', GITHUB_SEARCH_URL, params=params, headers=headers)
+        if response.status_code != 200:
+            logger.warning(f"GitHub搜索返回状态码 {response.status_code} ({query}, 第{page}页)")
+            self._mark_failed('GitHub', keyword)
+            return [], 0
+
+        data = response.json()
+        return data.get('items', []), data.get('total_count', 0)
+
+    def _search_github_keyword(self, keyword: str, min_stars: int, max_results: int,
+                               page_concurrency: int) -> List[Dict[str, Any]]:
+        """
+        分页搜索单个关键词的GitHub仓库
+
+        先请求第一页获得结果总数，再并发请求剩余页（请求速率仍受限流器约束），
+        结果数达到 max_results、结果总数或API的1000条上限时停止。
+
+        Args:
+            keyword: 搜索关键词
+            min_stars: 最小星标数
+            max_results: 最大结果数
+            page_concurrency: 并发请求的页数
+
+        Returns:
+            该关键词的搜索结果列表
+        """
+        started_at = time.monotonic()
+        # 构建查询
+        query = f"{keyword} stars:>={min_stars}"
+        max_results = max(1, min(max_results, GITHUB_SEARCH_LIMIT))
+        per_page = min(max_results, GITHUB_MAX_PER_PAGE)
 
-                response = requests.get(base_url, params=params, headers=headers)
+        items, total_count = self._search_github_page(keyword, query, 1, per_page)
+        wanted = min(max_results, total_count)
+        page_count = -(-wanted // per_page)
 
-                if response.status_code == 200:
-                    data = response.json()
+        if page_count > 1 and len(items) == per_page:
+            pages = range(2, page_count + 1)
+            with ThreadPoolExecutor(max_workers=max(1, page_concurrency),
+                                    thread_name_prefix="github-page") as executor:
+                for page_items, _ in executor.map(
+                        lambda page: self._search_github_page(keyword, query, page, per_page), pages):
+                    items.extend(page_items)
 
-                    for repo in data.get('items', []):
-                        resource = {
-                            'title': repo.get('full_name', ''),
-                            'url': repo.get('html_url', ''),
-                            'description': repo.get('description', ''),
-                            'source': 'GitHub',
-                            'stars': repo.get('stargazers_count', 0),
-                            'language': repo.get('language', ''),
-                            'updated_at': repo.get('updated_at', ''),
-                            'keyword': keyword
-                        }
-                        results.append(resource)
+        self._keyword_latency[('GitHub', keyword)] = time.monotonic() - started_at
+        return [self._github_repo_to_resource(repo, keyword) for repo in items[:wanted]]
 
-                # 遵守GitHub API速率限制
-                time.sleep(2)
+    def iter_github(self, keywords: List[str], min_stars: int = 10, max_results: int = 30,
+                    page_concurrency: int = 2,
+                    result_limits: Dict[str, int] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        使用GitHub API搜索代码仓库，逐个关键词产出结果
 
+        Args:
+            keywords: 搜索关键词列表
+            min_stars: 最小星标数
+            max_results: 每个关键词的最大结果数（API上限为1000）
+            page_concurrency: 每个关键词并发请求的页数
+            result_limits: 各关键词的最大结果数，未列出的关键词使用 max_results
+
+        Yields:
+            (关键词, 该关键词的搜索结果列表) 元组
+        """
+        result_limits = result_limits or {}
+        for keyword in tqdm(keywords, desc="GitHub搜索"):
+            try:
+                yield keyword, self._search_github_keyword(
+                    keyword, min_stars, result_limits.get(keyword, max_results), page_concurrency
+                )
             except Exception as e:
                 logger.error(f"GitHub搜索错误 ({keyword}): {e}")
+                self._mark_failed('GitHub', keyword)
                 continue
 
-        return results
+    def search_github(self, keywords: List[str], min_stars: int = 10, max_results: int = 30,
+                      page_concurrency: int = 2) -> List[Dict[str, Any]]:
+        """
+        使用GitHub API搜索代码仓库
 
-    def collect_all(self, keywords_zh: List[str] = None,
-                    keywords_en: List[str] = None) -> List[Dict[str, Any]]:
+        Args:
+            keywords: 搜索关键词列表
+            min_stars: 最小星标数
+            max_results: 每个关键词的最大结果数（API上限为1000）
+            page_concurrency: 每个关键词并发请求的页数
+
+        Returns:
+            搜索结果列表
         """
-        从所有源收集资源
+        return _in_keyword_order(
+            keywords, self.iter_github(keywords, min_stars, max_results, page_concurrency)
+        )
+
+    def iter_github_graphql(self, keywords: List[str], min_stars: int = 10, max_results: int = 30,
+                            batch_size: int = 5,
+                            result_limits: Dict[str, int] = None) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        使用GitHub GraphQL API批量搜索代码仓库，关键词完成后立即产出其结果
+
+        每次请求通过别名合并最多 batch_size 个关键词的 search 字段，并只请求需要的字段；
+        超过100条结果的关键词会在后续批次中按游标继续翻页。GraphQL API 需要访问令牌。
+
+        Args:
+            keywords: 搜索关键词列表
+            min_stars: 最小星标数
+            max_results: 每个关键词的最大结果数（API上限为1000）
+            batch_size: 每次请求合并的关键词数量
+            result_limits: 各关键词的最大结果数，未列出的关键词使用 max_results
+
+        Yields:
+            (关键词, 该关键词的搜索结果列表) 元组
+        """
+        result_limits = result_limits or {}
+        batch_size = max(1, batch_size)
+        headers = self._github_headers('application/json')
+
+        # 每个关键词的分页状态
+        states = [
+            {
+                'keyword': keyword,
+                'query': f"{keyword} stars:>={min_stars} sort:stars-desc",
+                'limit': max(1, min(result_limits.get(keyword, max_results), GITHUB_SEARCH_LIMIT)),
+                'nodes': [],
+                'cursor': None,
+                'done': False
+            }
+            for keyword in keywords
+        ]
+
+        with tqdm(total=len(states), desc="GitHub GraphQL搜索") as progress:
+            while True:
+                pending = [state for state in states if not state['done']]
+                if not pending:
+                    break
+
+                batch = pending[:batch_size]
+                searches = [
+                    (state['query'],
+                     min(state['limit'] - len(state['nodes']), GITHUB_MAX_PER_PAGE),
+                     state['cursor'])
+                    for state in batch
+                ]
+                graphql, variables = build_search_query(searches)
+
+                try:
+                    response = self._github_request(
+                        'POST', GITHUB_GRAPHQL_URL,
+                        json={'query': graphql, 'variables': variables},
+                        headers=headers
+                    )
+                    if response.status_code != 200:
+                        raise RuntimeError(f"状态码 {response.status_code}")
+                    payload = response.json()
+                except Exception as e:
+                    logger.error(f"GitHub GraphQL搜索错误 ({', '.join(s['keyword'] for s in batch)}): {e}")
+                    for state in batch:
+                        state['done'] = True
+                        self._mark_failed('GitHub', state['keyword'])
+                        progress.update(1)
+                        yield state['keyword'], self._graphql_state_resources(state)
+                    continue
+
+                for error in payload.get('errors') or []:
+                    logger.warning(f"GitHub GraphQL返回错误: {error.get('message')}")
+
+                data = payload.get('data') or {}
+                for index, state in enumerate(batch):
+                    search = data.get(f"s{index}")
+                    if not search:
+                        state['done'] = True
+                        self._mark_failed('GitHub', state['keyword'])
+                    else:
+                        state['nodes'].extend(node for node in search.get('nodes') or [] if node)
+                        page_info = search.get('pageInfo') or {}
+                        wanted = min(state['limit'], search.get('repositoryCount', 0))
+                        state['cursor'] = page_info.get('endCursor')
+                        state['done'] = (not page_info.get('hasNextPage')
+                                         or len(state['nodes']) >= wanted)
+                    if state['done']:
+                        progress.update(1)
+                        yield state['keyword'], self._graphql_state_resources(state)
+
+    @staticmethod
+    def _graphql_state_resources(state: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """将GraphQL搜索状态中累积的仓库节点转换为资源列表"""
+        return [
+            repository_to_resource(node, state['keyword'])
+            for node in state['nodes'][:state['limit']]
+        ]
+
+    def search_github_graphql(self, keywords: List[str], min_stars: int = 10, max_results: int = 30,
+                              batch_size: int = 5) -> List[Dict[str, Any]]:
+        """
+        使用GitHub GraphQL API批量搜索代码仓库
+
+        Args:
+            keywords: 搜索关键词列表
+            min_stars: 最小星标数
+            max_results: 每个关键词的最大结果数（API上限为1000）
+            batch_size: 每次请求合并的关键词数量
+
+        Returns:
+            搜索结果列表（按关键词顺序排列）
+        """
+        return _in_keyword_order(
+            keywords, self.iter_github_graphql(keywords, min_stars, max_results, batch_size)
+        )
+
+    def fetch_repository_metadata(self, repositories: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        通过一次GraphQL请求获取多个仓库的元数据（需要访问令牌）
+
+        Args:
+            repositories: (所有者, 仓库名) 列表，一次最多100个
+
+        Returns:
+            (所有者, 仓库名) -> 元数据字段；不存在或无权访问的仓库不包含在内，请求失败时返回空字典
+        """
+        if not repositories:
+            return {}
+        graphql, variables = build_repository_query(repositories)
+        try:
+            response = self._github_request(
+                'POST', GITHUB_GRAPHQL_URL,
+                json={'query': graphql, 'variables': variables},
+                headers=self._github_headers('application/json')
+            )
+            if response.status_code != 200:
+                raise RuntimeError(f"状态码 {response.status_code}")
+            payload = response.json()
+        except Exception as e:
+            logger.error(f"GitHub 仓库元数据请求错误 ({len(repositories)} 个仓库): {e}")
+            return {}
+
+        # 不存在的仓库会返回 NOT_FOUND 错误，其余仓库的数据不受影响
+        for error in payload.get('errors') or []:
+            if error.get('type') != 'NOT_FOUND':
+                logger.warning(f"GitHub GraphQL返回错误: {error.get('message')}")
+
+        data = payload.get('data') or {}
+        metadata = {}
+        for index, repository in enumerate(repositories):
+            node = data.get(f"r{index}")
+            if node:
+                metadata[repository] = repository_metadata(node)
+        return metadata
+
+    def _source_factories(self, keywords_zh: List[str] = None, keywords_en: List[str] = None
+                          ) -> List[Tuple[str, List[str], int, Callable[..., Iterator[Tuple[str, List[Dict[str, Any]]]]]]]:
+        """
+        根据配置列出所有已启用的搜索源
 
         Args:
             keywords_zh: 中文关键词列表
             keywords_en: 英文关键词列表
 
         Returns:
-            所有收集到的资源
+            (搜索源名称, 该源使用的关键词列表, 每个关键词的最大结果数, 结果流创建函数) 列表；
+            结果流创建函数接收关键词列表与可选的各关键词结果数 result_limits
         """
-        all_resources = []
-
         # 默认关键词
         if not keywords_zh:
             keywords_zh = [
@@ -179,68 +647,451 @@ class ResourceCollector:
                 "CUDA optimization guide"
             ]
 
+        factories = []
+
         # 从配置读取源设置
         sources_config = self.config.get('sources', {})
-        
+
         # DuckDuckGo搜索
         ddg_config = sources_config.get('duckduckgo', {})
         if ddg_config.get('enabled', True):
-            logger.info("=" * 50)
-            logger.info("开始 DuckDuckGo 搜索...")
-            logger.info("=" * 50)
             ddg_max_results = ddg_config.get('max_results', 30)
-            ddg_results = self.search_duckduckgo(
+            factories.append((
+                'DuckDuckGo',
                 keywords_zh + keywords_en,
-                max_results=ddg_max_results
-            )
-            all_resources.extend(ddg_results)
-            logger.info(f"DuckDuckGo 搜索完成: 获得 {len(ddg_results)} 个资源")
+                ddg_max_results,
+                lambda keywords, result_limits=None: self.iter_duckduckgo(
+                    keywords,
+                    max_results=ddg_max_results,
+                    concurrency=ddg_config.get('concurrency', 1),
+                    region=ddg_config.get('region', 'us-en'),
+                    timelimit=ddg_config.get('timelimit'),
+                    result_limits=result_limits
+                )
+            ))
         else:
             logger.info("DuckDuckGo 搜索已禁用")
 
         # GitHub搜索
         github_config = sources_config.get('github', {})
         if github_config.get('enabled', True):
-            logger.info("=" * 50)
-            logger.info("开始 GitHub 搜索...")
-            logger.info("=" * 50)
             github_min_stars = github_config.get('min_stars', 10)
-            github_results = self.search_github(
-                keywords_en,  # GitHub主要使用英文
-                min_stars=github_min_stars
-            )
-            all_resources.extend(github_results)
-            logger.info(f"GitHub 搜索完成: 获得 {len(github_results)} 个资源")
+            github_max_results = github_config.get('max_results', 30)
+            # GraphQL API 需要令牌，未配置令牌时回退到 REST 搜索
+            github_api = github_config.get('api', 'auto')
+            if github_api == 'graphql' and not self.github_token:
+                logger.warning("GitHub GraphQL API 需要访问令牌，回退到 REST 搜索")
+            if github_api != 'rest' and self.github_token:
+                github_stream = lambda keywords, result_limits=None: self.iter_github_graphql(
+                    keywords,
+                    min_stars=github_min_stars,
+                    max_results=github_max_results,
+                    batch_size=github_config.get('graphql_batch_size', 5),
+                    result_limits=result_limits
+                )
+            else:
+                github_stream = lambda keywords, result_limits=None: self.iter_github(
+                    keywords,
+                    min_stars=github_min_stars,
+                    max_results=github_max_results,
+                    page_concurrency=github_config.get('page_concurrency', 2),
+                    result_limits=result_limits
+                )
+            # GitHub主要使用英文
+            factories.append(('GitHub', keywords_en, github_max_results, github_stream))
         else:
             logger.info("GitHub 搜索已禁用")
 
+        return factories
+
+    def _source_streams(self, keywords_zh: List[str] = None,
+                        keywords_en: List[str] = None) -> List[Tuple[str, Iterator[Tuple[str, List[Dict[str, Any]]]]]]:
+        """
+        根据配置构建所有已启用搜索源的结果流
+
+        启用关键词调度时，各搜索源的关键词按历史新URL收益排序并分配结果数，
+        每个关键词的实际收益在完成后记录下来。
+        设置了任务队列（self.work_queue）时，搜索由 worker 进程完成，
+        本进程作为 coordinator 只写入任务并汇总结果。
+
+        Args:
+            keywords_zh: 中文关键词列表
+            keywords_en: 英文关键词列表
+
+        Returns:
+            (搜索源名称, 按关键词产出结果的迭代器) 列表
+        """
+        streams = []
+        for source_name, keywords, max_results, make_stream in self._source_factories(keywords_zh, keywords_en):
+            # 中英文关键词列表可能有重复项，同一搜索源的每个关键词只搜索与记录一次
+            keywords = list(dict.fromkeys(keywords))
+            if self.work_queue is not None:
+                make_stream = functools.partial(self._iter_work_queue, source_name)
+            if self.keyword_scheduler is not None:
+                keywords, result_limits = self.keyword_scheduler.schedule(source_name, keywords, max_results)
+                make_stream = functools.partial(self._iter_recording_yield, source_name, make_stream,
+                                                result_limits=result_limits)
+            streams.append((source_name, self._journaled_stream(source_name, keywords, make_stream)))
+        return streams
+
+    def _iter_recording_yield(self, source_name: str, make_stream: Callable[..., Iterator[Tuple[str, List[Dict[str, Any]]]]],
+                              keywords: List[str], result_limits: Dict[str, int] = None
+                              ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        运行结果流并记录每个关键词的收益（结果数、新URL数、重复率、耗时）
+
+        Args:
+            source_name: 搜索源名称
+            make_stream: 结果流创建函数
+            keywords: 关键词列表
+            result_limits: 各关键词的最大结果数
+
+        Yields:
+            (关键词, 结果列表) 元组
+        """
+        if self.work_queue is not None:
+            # 结果数由 worker 的配置决定
+            stream = make_stream(keywords)
+        else:
+            stream = make_stream(keywords, result_limits=result_limits)
+
+        stats = self.keyword_scheduler.stats
+        for keyword, results in stream:
+            # 搜索失败的关键词与缓存回放的结果不计入收益统计
+            # （缓存结果的新URL数必然为0，计入后会压低收益并缩减结果数，使下次运行无法命中缓存）
+            cached = (source_name, keyword) in self._cached_keywords
+            self._cached_keywords.discard((source_name, keyword))
+            if cached:
+                self._keyword_latency.pop((source_name, keyword), None)
+            elif (source_name, keyword) not in self._failed_keywords:
+                latency = self._keyword_latency.pop((source_name, keyword), None)
+                stats.record(source_name, keyword, results, latency)
+            yield keyword, results
+
+    def _iter_work_queue(self, source_name: str, keywords: List[str]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        coordinator：将关键词写入任务队列，并按完成顺序产出 worker 提交的结果
+
+        Args:
+            source_name: 搜索源名称
+            keywords: 关键词列表
+
+        Yields:
+            (关键词, 结果列表) 元组
+        """
+        run_id = self.work_queue_run_id
+        self.work_queue.enqueue(run_id, source_name, keywords)
+        remaining = len(set(keywords))
+        logger.info(f"{source_name}: 已写入 {remaining} 个任务，等待 worker 处理 (运行 {run_id})")
+
+        last_report = time.monotonic()
+        while remaining:
+            finished = self.work_queue.take_finished(run_id, source_name)
+            for task in finished:
+                remaining -= 1
+                if task.status != 'done':
+                    logger.error(f"{source_name}: 关键词 '{task.keyword}' 的任务失败: {task.error}")
+                    self._mark_failed(source_name, task.keyword)
+                yield task.keyword, task.results
+
+            if remaining and not finished:
+                if time.monotonic() - last_report >= 60:
+                    last_report = time.monotonic()
+                    logger.info(f"{source_name}: 仍有 {remaining} 个任务未完成，"
+                                f"队列状态 {self.work_queue.progress(run_id)}")
+                time.sleep(self.work_queue.poll_interval)
+
+    def enabled_sources(self) -> List[str]:
+        """
+        获取已启用的搜索源名称
+
+        Returns:
+            搜索源名称列表
+        """
+        return list(self._task_factories())
+
+    def _task_factories(self) -> Dict[str, Callable[[List[str]], Iterator[Tuple[str, List[Dict[str, Any]]]]]]:
+        """获取 worker 使用的搜索源结果流创建函数（首次调用时构建）"""
+        if self._factories_by_source is None:
+            self._factories_by_source = {
+                name: make_stream for name, _, _, make_stream in self._source_factories()
+            }
+        return self._factories_by_source
+
+    def run_task(self, source_name: str, keyword: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        worker：执行单个 (搜索源, 关键词) 任务
+
+        Args:
+            source_name: 搜索源名称
+            keyword: 关键词
+
+        Returns:
+            (结果列表, 是否完整完成) 元组
+        """
+        factories = self._task_factories()
+        if source_name not in factories:
+            raise ValueError(f"搜索源 {source_name} 未启用")
+
+        self._failed_keywords.discard((source_name, keyword))
+        results = []
+        searched = False
+        for _, keyword_results in factories[source_name]([keyword]):
+            results.extend(keyword_results)
+            searched = True
+        # 搜索源未产出该关键词（如搜索引擎未初始化、请求异常）同样视为失败
+        return results, searched and (source_name, keyword) not in self._failed_keywords
+
+    def _journaled_stream(self, source_name: str, keywords: List[str],
+                          make_stream: Callable[[List[str]], Iterator[Tuple[str, List[Dict[str, Any]]]]]
+                          ) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        为搜索源的结果流接入运行日志
+
+        运行日志中已完成的关键词直接回放结果，只有未完成的关键词才真正搜索，
+        每个关键词完成后立即写入运行日志。未设置运行日志时直接返回原始结果流。
+
+        Args:
+            source_name: 搜索源名称
+            keywords: 关键词列表
+            make_stream: 根据关键词列表创建结果流的函数
+
+        Yields:
+            (关键词, 结果列表) 元组
+        """
+        if self.journal is None:
+            yield from make_stream(keywords)
+            return
+
+        completed = self.journal.completed(source_name)
+        pending = [keyword for keyword in keywords if keyword not in completed]
+        replayed = [keyword for keyword in keywords if keyword in completed]
+        if replayed:
+            logger.info(f"{source_name}: 从运行日志恢复 {len(replayed)} 个已完成关键词，"
+                        f"剩余 {len(pending)} 个待搜索")
+        for keyword in replayed:
+            # 回放结果的副本，避免后续处理修改日志中保存的结果
+            yield keyword, [dict(resource) for resource in completed[keyword]]
+
+        if pending:
+            for keyword, results in make_stream(pending):
+                if (source_name, keyword) in self._failed_keywords:
+                    logger.warning(f"{source_name}: 关键词 '{keyword}' 搜索未完整完成，不写入运行日志")
+                else:
+                    self.journal.record(source_name, keyword, results)
+                yield keyword, results
+
+    def _mark_failed(self, source_name: str, keyword: str):
+        """
+        标记搜索失败的关键词，恢复运行时该关键词将被重新搜索
+
+        Args:
+            source_name: 搜索源名称
+            keyword: 关键词
+        """
+        self._failed_keywords.add((source_name, keyword))
+
+    def _fan_in_sources(self, streams: List[Tuple[str, Iterator[Tuple[str, List[Dict[str, Any]]]]]]
+                        ) -> Iterator[Tuple[str, str, List[Dict[str, Any]]]]:
+        """
+        汇合多个搜索源的结果流
+
+        启用 parallel_sources（默认）时，每个搜索源在独立线程中运行，
+        各自使用自己的限流器，总耗时取决于最慢的搜索源而不是各源耗时之和。
+        每个搜索源的耗时记录在 self.source_timings 中。
+
+        Args:
+            streams: (搜索源名称, 按关键词产出结果的迭代器) 列表
+
+        Yields:
+            (搜索源名称, 关键词, 结果列表) 元组，按到达顺序产出
+        """
+        self.source_timings = {}
+
+        if not self.config.get('parallel_sources', True) or len(streams) <= 1:
+            for source_name, stream in streams:
+                started_at = self._start_source(source_name)
+                for keyword, results in stream:
+                    yield source_name, keyword, results
+                self._finish_source(source_name, started_at)
+            return
+
+        output = queue.Queue()
+        finished = object()
+        # 消费方提前结束（如 Ctrl-C 或调用方停止迭代）时通知各搜索源在下一个关键词前停止
+        stop = threading.Event()
+
+        def drain(source_name, stream):
+            started_at = self._start_source(source_name)
+            try:
+                for keyword, results in stream:
+                    if stop.is_set():
+                        logger.info(f"{source_name} 搜索已中止")
+                        break
+                    output.put((source_name, keyword, results))
+            except Exception as e:
+                logger.error(f"{source_name} 搜索异常终止: {e}", exc_info=True)
+            finally:
+                self._finish_source(source_name, started_at)
+                output.put((source_name, finished, None))
+
+        executor = ThreadPoolExecutor(max_workers=len(streams), thread_name_prefix="source")
+        try:
+            for source_name, stream in streams:
+                executor.submit(drain, source_name, stream)
+
+            remaining = len(streams)
+            while remaining:
+                source_name, keyword, results = output.get()
+                if keyword is finished:
+                    remaining -= 1
+                    continue
+                yield source_name, keyword, results
+        finally:
+            stop.set()
+            # 不等待仍在进行的搜索，正常结束时所有线程都已退出
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    @staticmethod
+    def _start_source(source_name: str) -> float:
+        """记录搜索源开始时间"""
+        logger.info("=" * 50)
+        logger.info(f"开始 {source_name} 搜索...")
+        logger.info("=" * 50)
+        return time.monotonic()
+
+    def _finish_source(self, source_name: str, started_at: float):
+        """记录搜索源耗时"""
+        elapsed = time.monotonic() - started_at
+        self.source_timings[source_name] = elapsed
+        logger.info(f"{source_name} 搜索结束，耗时 {elapsed:.1f} 秒")
+
+    def collect_all(self, keywords_zh: List[str] = None,
+                    keywords_en: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        从所有源收集资源
+
+        Args:
+            keywords_zh: 中文关键词列表
+            keywords_en: 英文关键词列表
+
+        Returns:
+            所有收集到的资源（按搜索源顺序排列）
+        """
+        started_at = time.monotonic()
+        streams = self._source_streams(keywords_zh, keywords_en)
+        source_results = {source_name: [] for source_name, _ in streams}
+
+        for source_name, _, results in self._fan_in_sources(streams):
+            source_results[source_name].extend(results)
+
+        all_resources = []
+        for source_name, results in source_results.items():
+            all_resources.extend(results)
+            logger.info(f"{source_name} 搜索完成: 获得 {len(results)} 个资源，"
+                        f"耗时 {self.source_timings.get(source_name, 0):.1f} 秒")
+
         # 保存结果
         self.collected_resources = all_resources
+        summary = ", ".join(f"{name}: {len(results)}" for name, results in source_results.items())
         logger.info("=" * 50)
-        logger.info(f"总共收集到 {len(all_resources)} 个资源 (DuckDuckGo: {len(ddg_results) if ddg_config.get('enabled', True) else 0}, GitHub: {len(github_results) if github_config.get('enabled', True) else 0})")
+        logger.info(f"总共收集到 {len(all_resources)} 个资源 ({summary})，"
+                    f"总耗时 {time.monotonic() - started_at:.1f} 秒")
         logger.info("=" * 50)
 
         return all_resources
 
+    def iter_all(self, keywords_zh: List[str] = None,
+                 keywords_en: List[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        从所有源流式收集资源：每个关键词完成后立即产出其结果，不在内存中累积
+
+        Args:
+            keywords_zh: 中文关键词列表
+            keywords_en: 英文关键词列表
+
+        Yields:
+            资源字典
+        """
+        streams = self._source_streams(keywords_zh, keywords_en)
+        for _, _, results in self._fan_in_sources(streams):
+            yield from results
+
     def get_unique_resources(self) -> List[Dict[str, Any]]:
         """
         去重并返回唯一资源
 
+        以规范化URL的64位哈希（resource['url_key']）作为去重键，
+        协议、www.、末尾斜杠、跟踪参数等差异不会产生重复资源。
+        同一资源的所有命中来源合并到保留资源的 provenance 位集中。
+
         Returns:
             去重后的资源列表
         """
-        seen_urls = set()
-        unique_resources = []
-
+        unique = {}
         for resource in self.collected_resources:
-            url = resource.get('url', '')
-            if url and url not in seen_urls:
-                seen_urls.add(url)
-                unique_resources.append(resource)
+            key = ensure_url_key(resource)
+            if key is None:
+                continue
+            self.provenance.mark(resource)
+            kept = unique.get(key)
+            if kept is None:
+                unique[key] = resource
+            else:
+                merge_provenance(kept, resource)
+        unique_resources = list(unique.values())
 
         logger.info(f"去重后剩余 {len(unique_resources)} 个资源")
         return unique_resources
 
+    @staticmethod
+    def iter_unique(resources: Iterable[Dict[str, Any]],
+                    provenance: ProvenanceTable = None) -> Iterator[Dict[str, Any]]:
+        """
+        流式去重：只保留每个规范化URL第一次出现的资源
+
+        为保持内存占用恒定，不保留已产出的资源，因此流式模式下只记录第一次命中的来源。
+
+        Args:
+            resources: 资源迭代器
+            provenance: 来源编号表，提供时为产出的资源初始化 provenance 位集
+
+        Yields:
+            去重后的资源字典
+        """
+        seen_keys = set()
+        for resource in resources:
+            key = ensure_url_key(resource)
+            if key is not None and key not in seen_keys:
+                seen_keys.add(key)
+                if provenance is not None:
+                    provenance.mark(resource)
+                yield resource
+
+
+def _in_keyword_order(keywords: List[str],
+                      keyword_results: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    将按完成顺序产出的 (关键词, 结果) 按关键词原始顺序合并，保证输出与串行模式一致
+
+    Args:
+        keywords: 关键词列表（可包含重复关键词）
+        keyword_results: (关键词, 结果列表) 迭代器
+
+    Returns:
+        合并后的结果列表
+    """
+    by_keyword = {}
+    for keyword, results in keyword_results:
+        by_keyword.setdefault(keyword, []).append(results)
+
+    merged = []
+    for keyword in keywords:
+        batches = by_keyword.get(keyword)
+        if batches:
+            merged.extend(batches.pop(0))
+    return merged
+
 
 # 测试代码
 if __name__ == "__main__":
@@ -0,0 +1,174 @@
+"""
+GitHub GraphQL模块 - 构建批量搜索查询与仓库元数据查询，并将返回的仓库节点转换为资源字典
+"""
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+
+# 只请求 ResourceCollector 实际使用的字段
+REPOSITORY_FIELDS = """
+        nameWithOwner
+        url
+        description
+        stargazerCount
+        primaryLanguage { name }
+        updatedAt"""
+
+# 元数据刷新请求的字段；README 按常见文件名依次查找，只读取文件大小
+METADATA_FIELDS = """
+      stargazerCount
+      updatedAt
+      isArchived
+      primaryLanguage { name }
+      licenseInfo { spdxId }
+      repositoryTopics(first: 20) { nodes { topic { name } } }
+      readmeMd: object(expression: "HEAD:README.md") { ... on Blob { byteSize } }
+      readmeRst: object(expression: "HEAD:README.rst") { ... on Blob { byteSize } }
+      readmeTxt: object(expression: "HEAD:README") { ... on Blob { byteSize } }"""
+
+# github.com 仓库链接：https://github.com/<owner>/<name>[/...]
+REPOSITORY_URL_PATTERN = re.compile(
+    r'^https?://(?:www\.)?github\.com/([A-Za-z0-9](?:[A-Za-z0-9-]{0,38}))/([A-Za-z0-9._-]{1,100})(?:[/?#]|$)',
+    re.IGNORECASE
+)
+
+# github.com 下不是用户名的一级路径
+RESERVED_OWNERS = {
+    'about', 'apps', 'blog', 'collections', 'contact', 'customer-stories', 'enterprise', 'events',
+    'explore', 'features', 'issues', 'login', 'marketplace', 'new', 'notifications', 'orgs',
+    'pricing', 'pulls', 'search', 'settings', 'sponsors', 'topics', 'trending'
+}
+
+
+def build_search_query(searches: List[Tuple[str, int, Optional[str]]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    构建包含多个别名 search 字段的批量搜索查询
+
+    查询字符串与游标通过 GraphQL 变量传递，无需手动转义关键词。
+
+    Args:
+        searches: (查询字符串, 本页数量, 分页游标) 列表，游标为 None 表示第一页
+
+    Returns:
+        (GraphQL查询, 变量字典) 元组，第 i 个搜索的别名为 s{i}
+    """
+    declarations = []
+    fields = []
+    variables = {}
+    for index, (query, first, after) in enumerate(searches):
+        declarations.append(f"$q{index}: String!, $a{index}: String")
+        fields.append(f"""
+  s{index}: search(query: $q{index}, type: REPOSITORY, first: {int(first)}, after: $a{index}) {{
+    repositoryCount
+    pageInfo {{ hasNextPage endCursor }}
+    nodes {{
+      ... on Repository {{{REPOSITORY_FIELDS}
+      }}
+    }}
+  }}""")
+        variables[f"q{index}"] = query
+        variables[f"a{index}"] = after
+
+    graphql = f"query({', '.join(declarations)}) {{{''.join(fields)}\n}}"
+    return graphql, variables
+
+
+def repository_to_resource(node: Dict[str, Any], keyword: str) -> Dict[str, Any]:
+    """
+    将GraphQL仓库节点转换为资源字典（字段与REST搜索结果保持一致）
+
+    Args:
+        node: GraphQL返回的 Repository 节点
+        keyword: 搜索关键词
+
+    Returns:
+        资源字典
+    """
+    primary_language = node.get('primaryLanguage') or {}
+    return {
+        'title': node.get('nameWithOwner', ''),
+        'url': node.get('url', ''),
+        'description': node.get('description', ''),
+        'source': 'GitHub',
+        'stars': node.get('stargazerCount', 0),
+        'language': primary_language.get('name', ''),
+        'updated_at': node.get('updatedAt', ''),
+        'keyword': keyword
+    }
+
+
+def parse_repository_url(url: str) -> Optional[Tuple[str, str]]:
+    """
+    从 github.com 链接中解析仓库所有者与名称
+
+    Args:
+        url: 资源链接
+
+    Returns:
+        (所有者, 仓库名) 元组，不是仓库链接时返回 None
+    """
+    match = REPOSITORY_URL_PATTERN.match(url or '')
+    if not match:
+        return None
+    owner, name = match.group(1), match.group(2)
+    if name.endswith('.git'):
+        name = name[:-4]
+    if owner.lower() in RESERVED_OWNERS or not name:
+        return None
+    return owner, name
+
+
+def build_repository_query(repositories: List[Tuple[str, str]]) -> Tuple[str, Dict[str, Any]]:
+    """
+    构建包含多个别名 repository 字段的批量元数据查询
+
+    Args:
+        repositories: (所有者, 仓库名) 列表
+
+    Returns:
+        (GraphQL查询, 变量字典) 元组，第 i 个仓库的别名为 r{i}
+    """
+    declarations = []
+    fields = []
+    variables = {}
+    for index, (owner, name) in enumerate(repositories):
+        declarations.append(f"$o{index}: String!, $n{index}: String!")
+        fields.append(f"""
+  r{index}: repository(owner: $o{index}, name: $n{index}) {{{METADATA_FIELDS}
+  }}""")
+        variables[f"o{index}"] = owner
+        variables[f"n{index}"] = name
+
+    graphql = f"query({', '.join(declarations)}) {{{''.join(fields)}\n}}"
+    return graphql, variables
+
+
+def repository_metadata(node: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    将元数据查询返回的仓库节点转换为资源字段
+
+    Args:
+        node: GraphQL返回的 Repository 节点
+
+    Returns:
+        资源字段字典（stars、updated_at、topics、license、archived、readme_size、language），
+            updated_at 与搜索结果一致取自 updatedAt
+    """
+    topics = [
+        (topic_node.get('topic') or {}).get('name')
+        for topic_node in (node.get('repositoryTopics') or {}).get('nodes') or []
+        if topic_node
+    ]
+    readme = node.get('readmeMd') or node.get('readmeRst') or node.get('readmeTxt') or {}
+    license_info = node.get('licenseInfo') or {}
+    primary_language = node.get('primaryLanguage') or {}
+    return {
+        'stars': node.get('stargazerCount', 0),
+        'updated_at': node.get('updatedAt') or '',
+        'topics': ', '.join(topic for topic in topics if topic),
+        'license': license_info.get('spdxId') or '',
+        'archived': bool(node.get('isArchived')),
+        'readme_size': readme.get('byteSize'),
+        'language': primary_language.get('name', '')
+    }
@@ -0,0 +1,94 @@
+"""
+HTTP客户端模块 - 创建带连接池、超时、代理与重试配置的共享会话
+"""
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """为未显式指定超时的请求补充默认超时的适配器"""
+
+    def __init__(self, *args, timeout: float = 30, **kwargs):
+        """
+        初始化适配器
+
+        Args:
+            timeout: 默认请求超时时间（秒）
+        """
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        """发送请求，未指定超时时使用默认超时"""
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def get_proxy_url(advanced_config: Dict[str, Any]) -> Optional[str]:
+    """
+    读取代理地址
+
+    Args:
+        advanced_config: 高级配置（config.yaml 中的 advanced 段）
+
+    Returns:
+        代理地址，未启用代理时返回 None
+    """
+    if advanced_config.get('enable_proxy') and advanced_config.get('proxy_url'):
+        return advanced_config['proxy_url']
+    return None
+
+
+def create_session(advanced_config: Dict[str, Any] = None) -> requests.Session:
+    """
+    创建共享的HTTP会话
+
+    会话复用 keep-alive 连接池，所有基于HTTP的搜索源与后续的页面抓取步骤
+    都应通过同一个会话发送请求，以避免重复的 TCP/TLS 握手。
+
+    Args:
+        advanced_config: 高级配置（config.yaml 中的 advanced 段）
+
+    Returns:
+        配置好的 requests.Session
+    """
+    advanced_config = advanced_config or {}
+
+    retry = Retry(
+        total=advanced_config.get('max_retries', 3),
+        backoff_factor=0.5,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD', 'POST']),
+        raise_on_status=False
+    )
+    pool_size = advanced_config.get('pool_size', 10)
+    adapter = TimeoutHTTPAdapter(
+        timeout=advanced_config.get('timeout', 30),
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=retry
+    )
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': advanced_config.get('user_agent') or DEFAULT_USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate',
+        'Connection': 'keep-alive'
+    })
+
+    proxy_url = get_proxy_url(advanced_config)
+    if proxy_url:
+        session.proxies.update({'http': proxy_url, 'https': proxy_url})
+        logger.info(f"HTTP会话使用代理: {proxy_url}")
+
+    return session
@@ -0,0 +1,261 @@
+"""
+关键词收益统计模块 - 跨运行记录每个关键词的结果数、新URL数、重复率与耗时，并据此调度关键词
+"""
+import os
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import Dict, Any, List, Optional, Tuple
+import logging
+
+from url_utils import ensure_url_key
+
+logger = logging.getLogger(__name__)
+
+# 关键词历史收益：new_per_search 为每次搜索新URL数的指数滑动平均，new_ratio 为新URL占比的指数滑动平均
+KeywordYield = namedtuple('KeywordYield', [
+    'source', 'keyword', 'runs', 'total_results', 'total_new',
+    'new_per_search', 'new_ratio', 'avg_latency', 'last_run_at'
+])
+
+
+class KeywordStats:
+    """关键词收益统计（基于SQLite，线程安全）"""
+
+    def __init__(self, path: str, smoothing: float = 0.5):
+        """
+        初始化统计存储
+
+        Args:
+            path: SQLite数据库文件路径
+            smoothing: 指数滑动平均中最近一次运行的权重（0-1），越大越偏重近期表现
+        """
+        self.path = path
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript('''
+            CREATE TABLE IF NOT EXISTS seen_urls (
+                url_key INTEGER PRIMARY KEY,
+                first_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS keyword_runs (
+                source TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                run_at REAL NOT NULL,
+                results INTEGER NOT NULL,
+                new_urls INTEGER NOT NULL,
+                duplicate_rate REAL NOT NULL,
+                latency REAL
+            );
+            CREATE TABLE IF NOT EXISTS keyword_stats (
+                source TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                runs INTEGER NOT NULL,
+                total_results INTEGER NOT NULL,
+                total_new INTEGER NOT NULL,
+                new_per_search REAL NOT NULL,
+                new_ratio REAL NOT NULL,
+                total_latency REAL NOT NULL,
+                timed_runs INTEGER NOT NULL,
+                last_run_at REAL NOT NULL,
+                PRIMARY KEY (source, keyword)
+            );
+        ''')
+        self._conn.commit()
+
+    def record(self, source: str, keyword: str, results: List[Dict[str, Any]],
+               latency: float = None) -> int:
+        """
+        记录一次关键词搜索的收益：此前从未见过的URL计为新URL
+
+        Args:
+            source: 搜索源名称
+            keyword: 关键词
+            results: 搜索结果列表
+            latency: 搜索耗时（秒），未知时为 None
+
+        Returns:
+            新URL数
+        """
+        keys = {key for key in (ensure_url_key(resource) for resource in results) if key is not None}
+        now = time.time()
+
+        with self._lock:
+            known = set()
+            key_list = list(keys)
+            # 分批查询，避免超过SQLite的参数数量上限
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT url_key FROM seen_urls WHERE url_key IN ({', '.join('?' for _ in chunk)})", chunk
+                ))
+            new_keys = keys - known
+            self._conn.executemany('INSERT OR IGNORE INTO seen_urls (url_key, first_seen) VALUES (?, ?)',
+                                   [(key, now) for key in new_keys])
+
+            new_count = len(new_keys)
+            duplicate_rate = 1 - new_count / len(results) if results else 0.0
+            new_ratio = new_count / len(results) if results else 0.0
+            self._conn.execute(
+                'INSERT INTO keyword_runs (source, keyword, run_at, results, new_urls, duplicate_rate, latency) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (source, keyword, now, len(results), new_count, duplicate_rate, latency)
+            )
+
+            row = self._conn.execute(
+                'SELECT new_per_search, new_ratio FROM keyword_stats WHERE source = ? AND keyword = ?',
+                (source, keyword)
+            ).fetchone()
+            if row is None:
+                self._conn.execute(
+                    'INSERT INTO keyword_stats (source, keyword, runs, total_results, total_new, new_per_search, '
+                    'new_ratio, total_latency, timed_runs, last_run_at) VALUES (?, ?, 1, ?, ?, ?, ?, ?, ?, ?)',
+                    (source, keyword, len(results), new_count, float(new_count), new_ratio,
+                     latency or 0.0, int(latency is not None), now)
+                )
+            else:
+                alpha = self.smoothing
+                self._conn.execute(
+                    'UPDATE keyword_stats SET runs = runs + 1, total_results = total_results + ?, '
+                    'total_new = total_new + ?, new_per_search = ?, new_ratio = ?, '
+                    'total_latency = total_latency + ?, timed_runs = timed_runs + ?, last_run_at = ? '
+                    'WHERE source = ? AND keyword = ?',
+                    (len(results), new_count,
+                     alpha * new_count + (1 - alpha) * row[0],
+                     alpha * new_ratio + (1 - alpha) * row[1],
+                     latency or 0.0, int(latency is not None), now, source, keyword)
+                )
+            self._conn.commit()
+
+        logger.debug(f"{source} 关键词 '{keyword}': {len(results)} 条结果，{new_count} 个新URL")
+        return new_count
+
+    def get(self, source: str, keyword: str) -> Optional[KeywordYield]:
+        """
+        读取关键词的历史收益
+
+        Args:
+            source: 搜索源名称
+            keyword: 关键词
+
+        Returns:
+            历史收益，没有记录时返回 None
+        """
+        rows = self._query('WHERE source = ? AND keyword = ?', (source, keyword))
+        return rows[0] if rows else None
+
+    def all(self) -> List[KeywordYield]:
+        """
+        读取所有关键词的历史收益
+
+        Returns:
+            按搜索源、每次搜索新URL数降序排列的历史收益列表
+        """
+        return self._query('', ())
+
+    def _query(self, where: str, params: Tuple) -> List[KeywordYield]:
+        """查询关键词统计"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT source, keyword, runs, total_results, total_new, new_per_search, new_ratio, '
+                'CASE WHEN timed_runs > 0 THEN total_latency / timed_runs END, last_run_at '
+                f'FROM keyword_stats {where} ORDER BY source, new_per_search DESC', params
+            ).fetchall()
+        return [KeywordYield(*row) for row in rows]
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class KeywordScheduler:
+    """
+    关键词调度器
+
+    按历史上每次搜索带来的新URL数从高到低排列关键词，并按新URL占比缩减重复率高的关键词的结果数，
+    让有限的请求额度优先用于能发现新资源的关键词。没有历史记录的关键词排在最前并使用完整结果数。
+    """
+
+    def __init__(self, stats: KeywordStats, min_results_share: float = 0.3, min_results: int = 5):
+        """
+        初始化调度器
+
+        Args:
+            stats: 关键词收益统计
+            min_results_share: 新URL占比为0的关键词保留的结果数比例
+            min_results: 每个关键词的最小结果数
+        """
+        self.stats = stats
+        self.min_results_share = min_results_share
+        self.min_results = min_results
+
+    def schedule(self, source: str, keywords: List[str], max_results: int) -> Tuple[List[str], Dict[str, int]]:
+        """
+        为搜索源排列关键词并分配结果数
+
+        Args:
+            source: 搜索源名称
+            keywords: 关键词列表（重复项只保留第一个）
+            max_results: 配置的每个关键词最大结果数
+
+        Returns:
+            (排序后的关键词列表, 关键词 -> 结果数) 元组
+        """
+        keywords = list(dict.fromkeys(keywords))
+        history = {keyword: self.stats.get(source, keyword) for keyword in keywords}
+
+        def priority(keyword):
+            record = history[keyword]
+            # 没有历史记录的关键词优先探索
+            return float('inf') if record is None else record.new_per_search
+
+        ordered = sorted(keywords, key=priority, reverse=True)
+
+        limits = {}
+        for keyword, record in history.items():
+            if record is None:
+                limits[keyword] = max_results
+                continue
+            share = self.min_results_share + (1 - self.min_results_share) * record.new_ratio
+            limits[keyword] = max(min(self.min_results, max_results), round(max_results * share))
+
+        if any(record is not None for record in history.values()):
+            logger.info(f"{source} 关键词调度: " + ", ".join(
+                f"{keyword}({limits[keyword]})" for keyword in ordered
+            ))
+        return ordered, limits
+
+
+def create_keyword_scheduler(cache_dir: str, scheduler_config: Dict[str, Any] = None) -> Optional[KeywordScheduler]:
+    """
+    根据配置创建关键词调度器
+
+    Args:
+        cache_dir: 统计数据库所在目录
+        scheduler_config: 调度配置（search.scheduler 段）
+
+    Returns:
+        关键词调度器，未启用时返回 None
+    """
+    scheduler_config = scheduler_config or {}
+    if not cache_dir or not scheduler_config.get('enabled', True):
+        return None
+
+    stats = KeywordStats(
+        os.path.join(cache_dir, 'keyword_stats.sqlite3'),
+        smoothing=scheduler_config.get('smoothing', 0.5)
+    )
+    return KeywordScheduler(
+        stats,
+        min_results_share=scheduler_config.get('min_results_share', 0.3),
+        min_results=scheduler_config.get('min_results', 5)
+    )
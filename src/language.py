@@ -0,0 +1,103 @@
+"""
+语言检测模块 - 单次扫描文本判断中文、英文、中英混合以及可选的日文、韩文，结果确定后立即停止扫描
+"""
+import re
+from typing import Dict, FrozenSet, Iterable, Optional, Pattern
+
+# 各文字的字符范围（每个模式匹配一段连续字符）
+SCRIPT_PATTERNS = {
+    'zh': r'[\u4e00-\u9fa5]+',
+    'en': r'[a-zA-Z]+',
+    # 平假名与片假名（不含中文里也会出现的间隔号与长音符）
+    'ja': r'[\u3041-\u3096\u30a1-\u30fa]+',
+    # 谚文音节、字母与兼容字母
+    'ko': r'[\uac00-\ud7af\u1100-\u11ff\u3130-\u318f]+',
+}
+
+# 可选的附加语言标签
+EXTRA_SCRIPTS = ('ja', 'ko')
+
+# 英文单词数超过该值才视为包含英文
+ENGLISH_WORD_THRESHOLD = 3
+
+
+class LanguageDetector:
+    """
+    单次扫描的语言检测器
+
+    所有文字的模式合并为一个正则，按位置依次查找；某种文字的结论确定后（已出现中文，
+    或英文单词数已超过阈值），后续扫描改用只包含仍需判断的文字的正则，剩余文本中
+    已确定文字的字符由正则引擎直接跳过。所有结论确定后立即返回，不为每个词分配列表。
+
+    启用附加语言时，文本中出现假名即判定为 ja，出现谚文即判定为 ko（以先出现者为准）；
+    日文汉字与中文共用字符范围，因此附加语言优先于 zh / en / mixed。
+    """
+
+    def __init__(self, extra_scripts: Iterable[str] = ()):
+        """
+        初始化语言检测器
+
+        Args:
+            extra_scripts: 启用的附加语言标签（ja、ko），默认只区分 zh / en / mixed
+        """
+        unknown = set(extra_scripts) - set(EXTRA_SCRIPTS)
+        if unknown:
+            raise ValueError(f"不支持的语言标签: {', '.join(sorted(unknown))}")
+        self.extra_scripts = tuple(script for script in EXTRA_SCRIPTS if script in extra_scripts)
+        self._patterns: Dict[FrozenSet[str], Optional[Pattern]] = {}
+
+    @property
+    def rules(self) -> Dict[str, str]:
+        """检测使用的文字模式（用于计算分类规则版本）"""
+        return {script: SCRIPT_PATTERNS[script] for script in ('zh', 'en') + self.extra_scripts}
+
+    def _pattern(self, scripts: FrozenSet[str]) -> Optional[Pattern]:
+        """获取只匹配指定文字的合并正则（按文字集合缓存），集合为空时返回 None"""
+        if scripts not in self._patterns:
+            alternatives = [f"(?P<{script}>{SCRIPT_PATTERNS[script]})"
+                            for script in SCRIPT_PATTERNS if script in scripts]
+            self._patterns[scripts] = re.compile('|'.join(alternatives)) if alternatives else None
+        return self._patterns[scripts]
+
+    def detect(self, text: str) -> str:
+        """
+        检测文本语言
+
+        Args:
+            text: 待检测文本
+
+        Returns:
+            语言标识（zh / en / mixed / unknown，启用附加语言时还可能为 ja / ko）
+        """
+        pending = frozenset(('zh', 'en') + self.extra_scripts)
+        pattern = self._pattern(pending)
+        has_chinese = False
+        english_words = 0
+        position = 0
+
+        while pattern is not None:
+            match = pattern.search(text, position)
+            if match is None:
+                break
+            position = match.end()
+            script = match.lastgroup
+            if script == 'zh':
+                has_chinese = True
+            elif script == 'en':
+                english_words += 1
+                if english_words <= ENGLISH_WORD_THRESHOLD:
+                    continue
+            else:
+                return script
+            # 该文字的结论已确定，剩余文本只查找仍需判断的文字
+            pending = pending - {script}
+            pattern = self._pattern(pending)
+
+        has_english = english_words > ENGLISH_WORD_THRESHOLD
+        if has_chinese and has_english:
+            return 'mixed'
+        elif has_chinese:
+            return 'zh'
+        elif has_english:
+            return 'en'
+        return 'unknown'
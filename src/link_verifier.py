@@ -0,0 +1,232 @@
+"""
+链接校验模块 - 并发探测资源链接的可用性、重定向后的最终地址与内容类型，结果带TTL缓存
+"""
+import os
+import time
+import threading
+from urllib.parse import urlsplit
+from typing import Dict, Any, List, Iterable, Iterator, Optional
+import requests
+import logging
+
+from cache import DiskCache
+from page_fetcher import HostScheduler, interleave_by_host, iter_concurrently
+
+logger = logging.getLogger(__name__)
+
+# 校验结果写入资源的字段
+VERIFY_FIELDS = ('http_status', 'final_url', 'content_type', 'content_length', 'alive')
+
+# HEAD 返回这些状态码时改用 GET 重试（服务端不支持或拒绝 HEAD 的常见表现）
+HEAD_FALLBACK_STATUSES = {400, 403, 404, 405, 406, 429, 500, 501, 502, 503}
+
+# 确认链接已失效的状态码；其他 4xx（如401、403、429）多为鉴权或反爬，不视为失效
+DEAD_STATUSES = {404, 410, 451}
+
+
+class LinkVerifier:
+    """链接校验器：先发送 HEAD 请求，必要时改用只请求首字节的 GET 请求"""
+
+    def __init__(self, session: requests.Session, store: DiskCache = None, ttl_seconds: float = 604800,
+                 max_workers: int = 16, max_per_host: int = 4, host_delay: float = 0.2, timeout: float = 10):
+        """
+        初始化链接校验器
+
+        Args:
+            session: 共享的HTTP会话
+            store: 校验结果的持久化缓存，为 None 时不缓存
+            ttl_seconds: 校验结果有效期（秒），过期后重新校验
+            max_workers: 全局最大并发请求数
+            max_per_host: 每个主机的最大并发请求数
+            host_delay: 同一主机相邻两次请求的最小间隔（秒）
+            timeout: 请求超时时间（秒）
+        """
+        self.session = session
+        self.store = store
+        self.ttl = ttl_seconds
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.host_scheduler = HostScheduler(max_per_host, host_delay)
+        self._cache_hits = 0
+        self._hits_lock = threading.Lock()
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """校验结果的缓存键"""
+        return f"verify:{url}"
+
+    def _cached(self, url: str) -> Optional[Dict[str, Any]]:
+        """读取未过期的校验结果"""
+        if self.store is None:
+            return None
+        entry = self.store.get(self._cache_key(url))
+        if entry is None or time.time() - entry.stored_at >= self.ttl:
+            return None
+        return entry.meta
+
+    def probe(self, url: str) -> Dict[str, Any]:
+        """
+        探测单个链接
+
+        Args:
+            url: 链接地址
+
+        Returns:
+            包含 http_status、final_url、content_type、content_length、alive 的字典；
+            服务端错误（5xx）、超时与连接失败可能是暂时的（或是本地网络、代理故障），alive 为 None 且不写入缓存
+        """
+        cached = self._cached(url)
+        if cached is not None:
+            with self._hits_lock:
+                self._cache_hits += 1
+            return cached
+
+        host = urlsplit(url).hostname
+        if not host:
+            return {'http_status': None, 'final_url': url, 'content_type': None,
+                    'content_length': None, 'alive': False}
+
+        with self.host_scheduler.slot(host):
+            try:
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+                if response.status_code in HEAD_FALLBACK_STATUSES:
+                    response = self._ranged_get(url)
+            except requests.RequestException as e:
+                logger.debug(f"链接校验失败 ({url}): {e}")
+                return {'http_status': None, 'final_url': url, 'content_type': None,
+                        'content_length': None, 'alive': None}
+
+        result = {
+            'http_status': response.status_code,
+            'final_url': response.url or url,
+            'content_type': self._content_type(response),
+            'content_length': self._content_length(response),
+            'alive': None if response.status_code >= 500 else response.status_code not in DEAD_STATUSES
+        }
+        # 服务端错误可能是暂时的，不写入缓存
+        if response.status_code < 500:
+            self._store(url, result)
+        return result
+
+    def _ranged_get(self, url: str) -> requests.Response:
+        """发送只请求首字节的 GET 请求（不读取响应体）"""
+        with self.session.get(url, headers={'Range': 'bytes=0-0'}, stream=True,
+                              allow_redirects=True, timeout=self.timeout) as response:
+            return response
+
+    @staticmethod
+    def _content_type(response: requests.Response) -> Optional[str]:
+        """读取不含参数的内容类型"""
+        content_type = response.headers.get('Content-Type')
+        if not content_type:
+            return None
+        return content_type.split(';', 1)[0].strip().lower()
+
+    @staticmethod
+    def _content_length(response: requests.Response) -> Optional[int]:
+        """读取内容长度（范围请求时从 Content-Range 中读取总长度）"""
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code == 206 and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            return int(total) if total.isdigit() else None
+        if response.status_code != 200:
+            return None
+        length = response.headers.get('Content-Length', '')
+        return int(length) if length.isdigit() else None
+
+    def _store(self, url: str, result: Dict[str, Any]):
+        """写入校验结果缓存"""
+        if self.store is not None:
+            self.store.set(self._cache_key(url), b'', result)
+
+    def _verify_one(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """校验资源链接并将结果写入资源"""
+        resource.update(self.probe(resource['url']))
+        return resource
+
+    @staticmethod
+    def should_verify(resource: Dict[str, Any]) -> bool:
+        """
+        判断资源是否需要校验
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            是否校验
+        """
+        return urlsplit(resource.get('url') or '').scheme in ('http', 'https')
+
+    def iter_verify(self, resources: Iterable[Dict[str, Any]], drop_dead: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        流式校验链接，按完成顺序产出资源
+
+        Args:
+            resources: 资源迭代器
+            drop_dead: 是否丢弃已失效的链接
+
+        Yields:
+            补充了校验结果的资源
+        """
+        for resource in iter_concurrently(self._verify_one, resources, self.max_workers,
+                                          accept=self.should_verify, thread_name_prefix="verify"):
+            if drop_dead and resource.get('alive') is False:
+                logger.debug(f"丢弃失效链接: {resource.get('url')} ({resource.get('http_status')})")
+                continue
+            yield resource
+
+    def verify(self, resources: List[Dict[str, Any]], drop_dead: bool = True) -> List[Dict[str, Any]]:
+        """
+        校验资源列表的链接（保持原始顺序）
+
+        Args:
+            resources: 资源列表
+            drop_dead: 是否丢弃已失效的链接
+
+        Returns:
+            校验后的资源列表
+        """
+        started_at = time.monotonic()
+        self._cache_hits = 0
+        targets = interleave_by_host([resource for resource in resources if self.should_verify(resource)])
+        for _ in self.iter_verify(targets, drop_dead=False):
+            pass
+
+        dead = [resource for resource in resources if resource.get('alive') is False]
+        logger.info(f"链接校验完成: {len(targets)} 个链接（缓存命中 {self._cache_hits} 个），"
+                    f"失效 {len(dead)} 个，耗时 {time.monotonic() - started_at:.1f} 秒")
+        if drop_dead:
+            return [resource for resource in resources if resource.get('alive') is not False]
+        return resources
+
+
+def create_link_verifier(session: requests.Session, verify_config: Dict[str, Any] = None,
+                         cache_dir: str = None, force: bool = False) -> Optional[LinkVerifier]:
+    """
+    根据配置创建链接校验器
+
+    Args:
+        session: 共享的HTTP会话
+        verify_config: 校验配置（config.yaml 中的 verify 段）
+        cache_dir: 校验结果持久化缓存目录，为 None 时不缓存
+        force: 忽略 enabled 开关（verify 命令使用）
+
+    Returns:
+        链接校验器，未启用时返回 None
+    """
+    verify_config = verify_config or {}
+    if not force and not verify_config.get('enabled', False):
+        return None
+
+    store = None
+    if cache_dir:
+        store = DiskCache(os.path.join(cache_dir, 'verify_cache.sqlite3'), max_size_mb=verify_config.get('max_size_mb', 20))
+    return LinkVerifier(
+        session,
+        store,
+        ttl_seconds=verify_config.get('ttl_seconds', 604800),
+        max_workers=verify_config.get('max_workers', 16),
+        max_per_host=verify_config.get('max_per_host', 4),
+        host_delay=verify_config.get('host_delay', 0.2),
+        timeout=verify_config.get('timeout', 10)
+    )
@@ -4,6 +4,8 @@
 """
 import os
 import sys
+import time
+import uuid
 import argparse
 import yaml
 import logging
@@ -14,8 +16,15 @@ from typing import Dict, Any, List
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from collector import ResourceCollector
-from parsers import ResourceParser
+from parsers import create_resource_parser
 from storage import ResourceStorage
+from url_utils import ensure_url_key
+from near_dup import NearDuplicateFilter, remove_near_duplicates
+from checkpoint import RunJournal
+from work_queue import create_work_queue, default_worker_id, LeaseKeeper
+from page_fetcher import create_page_fetcher
+from link_verifier import create_link_verifier
+from repo_metadata import create_repo_metadata_refresher
 
 # 初始化colorama（Windows支持）
 init(autoreset=True)
@@ -40,9 +49,35 @@ class AutomatedInfoCollector:
             config_path: 配置文件路径
         """
         self.config = self.load_config(config_path)
-        self.collector = ResourceCollector(self.config.get('search', {}))
-        self.parser = ResourceParser()
         self.storage = ResourceStorage(self.config.get('output', {}).get('path', 'resources'))
+        # 资源解析器：未变化的资源复用输出目录 .cache 下缓存的分类结果
+        self.parser = create_resource_parser(
+            self.config.get('parsing'),
+            cache_dir=os.path.join(self.storage.output_dir, '.cache')
+        )
+        self.collector = ResourceCollector(
+            self.config.get('search', {}),
+            self.config.get('advanced', {}),
+            cache_dir=os.path.join(self.storage.output_dir, '.cache')
+        )
+        # 页面抓取器（可选的信息补充步骤），复用收集器的HTTP会话
+        self.fetcher = create_page_fetcher(
+            self.collector.session,
+            self.config.get('enrichment'),
+            cache_dir=os.path.join(self.storage.output_dir, '.cache')
+        )
+        # 仓库元数据刷新器：通过GraphQL批量补全/刷新 github.com 仓库链接的星标数等元数据
+        self.repo_refresher = create_repo_metadata_refresher(
+            self.collector.fetch_repository_metadata,
+            self.config.get('search', {}).get('sources', {}).get('github', {}).get('metadata_refresh'),
+            has_token=bool(self.collector.github_token)
+        )
+        # 链接校验器（可选步骤），复用收集器的HTTP会话
+        self.verifier = create_link_verifier(
+            self.collector.session,
+            self.config.get('verify'),
+            cache_dir=os.path.join(self.storage.output_dir, '.cache')
+        )
 
     def load_config(self, config_path: str = None) -> Dict[str, Any]:
         """
@@ -162,16 +197,16 @@ class AutomatedInfoCollector:
             print(f"  最高评分: {max(scores):.1f}")
             print(f"  4分以上资源: {sum(1 for s in scores if s >= 4.0)}")
 
-    def collect(self, keywords: List[str] = None):
+    def get_keywords(self, keywords: List[str] = None):
         """
-        执行收集任务
+        获取本次搜索使用的中英文关键词
 
         Args:
-            keywords: 额外的搜索关键词
-        """
-        print(Fore.CYAN + "[搜索] 开始收集资源...")
+            keywords: 额外的搜索关键词（追加到英文关键词中）
 
-        # 获取关键词
+        Returns:
+            (中文关键词列表, 英文关键词列表) 元组
+        """
         keywords_zh = self.config['search']['keywords_zh']
         keywords_en = self.config['search']['keywords_en']
 
@@ -179,14 +214,204 @@ class AutomatedInfoCollector:
         if keywords:
             keywords_en.extend(keywords)
 
-        # 收集资源
         print(Fore.YELLOW + f"  搜索关键词: {len(keywords_zh)} 个中文 + {len(keywords_en)} 个英文")
+        return keywords_zh, keywords_en
+
+    def print_top_resources(self, resources: List[Dict[str, Any]]):
+        """
+        打印 Top 5 高质量资源
+
+        Args:
+            resources: 资源列表
+        """
+        print(Fore.CYAN + "\n[推荐] Top 5 高质量资源:")
+        print(Fore.CYAN + "-" * 60)
+        top_resources = self.parser.get_top_resources(resources, 5)
+        for i, r in enumerate(top_resources, 1):
+            print(f"\n{Fore.YELLOW}{i}. {r['title']}")
+            print(f"   {Fore.WHITE}URL: {r['url']}")
+            print(f"   {Fore.GREEN}评分: {r['quality_score']:.1f} | 类型: {r['type']} | 语言: {r['language_detected']}")
+            print(f"   {Fore.CYAN}推荐: {r['recommendation']}")
+
+    def open_journal(self, command: str, resume: bool = False) -> RunJournal:
+        """
+        打开本次运行的运行日志，并交给收集器记录每个完成的关键词
+
+        Args:
+            command: 命令名称（search / update），每个命令使用独立的日志文件
+            resume: 是否从上次中断的运行恢复
+
+        Returns:
+            运行日志
+        """
+        path = os.path.join(self.storage.output_dir, '.journal', f'{command}.jsonl')
+        journal = RunJournal(path, resume=resume, params=self.config.get('search'))
+        self.collector.journal = journal
+        if resume:
+            print(Fore.YELLOW + f"[恢复] 运行日志: {path}")
+        return journal
+
+    def use_work_queue(self):
+        """以 coordinator 模式运行：搜索任务写入任务队列，由 worker 进程执行"""
+        work_queue = create_work_queue(self.storage.output_dir, self.config.get('work_queue'))
+        self.collector.work_queue = work_queue
+        self.collector.work_queue_run_id = uuid.uuid4().hex[:12]
+        print(Fore.YELLOW + f"[队列] 任务队列: {work_queue.path}，运行 {self.collector.work_queue_run_id}")
+        print(Fore.YELLOW + "  请使用 worker 命令启动一个或多个 worker 处理任务")
+
+    def run_worker(self, worker_id: str = None):
+        """
+        以 worker 模式运行：从任务队列领取 (搜索源, 关键词) 任务并提交结果
+
+        队列空闲超过 work_queue.idle_timeout 秒后退出（0 表示一直运行）。
+
+        Args:
+            worker_id: worker 标识，默认为 主机名-进程号
+        """
+        queue_config = self.config.get('work_queue', {})
+        work_queue = create_work_queue(self.storage.output_dir, queue_config)
+        worker_id = worker_id or default_worker_id()
+        idle_timeout = queue_config.get('idle_timeout', 60)
+        sources = self.collector.enabled_sources()
+        print(Fore.CYAN + f"[Worker] {worker_id} 开始处理任务队列: {work_queue.path}")
+        print(Fore.YELLOW + f"  处理的搜索源: {', '.join(sources)}")
+
+        completed = failed = 0
+        idle_since = time.monotonic()
+        while True:
+            task = work_queue.claim(worker_id, sources)
+            if task is None:
+                if idle_timeout and time.monotonic() - idle_since >= idle_timeout:
+                    break
+                time.sleep(work_queue.poll_interval)
+                continue
+
+            print(Fore.WHITE + f"[任务] {task.source}: {task.keyword} (第 {task.attempts} 次尝试)")
+            try:
+                with LeaseKeeper(work_queue, task, worker_id):
+                    results, succeeded = self.collector.run_task(task.source, task.keyword)
+            except Exception as e:
+                logger.error(f"任务执行失败 ({task.source}: {task.keyword}): {e}")
+                results, succeeded = [], False
+                error = str(e)
+            else:
+                error = '搜索未完整完成'
+
+            if succeeded:
+                if work_queue.complete(task, worker_id, results):
+                    completed += 1
+                else:
+                    logger.warning(f"任务 {task.id} 的租约已被其他 worker 接管，丢弃本次结果")
+            else:
+                work_queue.fail(task, worker_id, error)
+                failed += 1
+            idle_since = time.monotonic()
+
+        work_queue.close()
+        print(Fore.GREEN + f"\n[完成] 队列空闲 {idle_timeout} 秒，worker 退出：完成 {completed} 个任务，失败 {failed} 个")
+
+    def get_near_duplicate_config(self) -> Dict[str, Any]:
+        """
+        读取近似重复检测配置
+
+        Returns:
+            配置字典（max_distance、min_features），未启用时返回 None
+        """
+        dedup_config = self.config.get('dedup', {})
+        if not dedup_config.get('near_duplicate', True):
+            return None
+        return {
+            'max_distance': dedup_config.get('max_distance', 6),
+            'min_features': dedup_config.get('min_features', 8)
+        }
+
+    def merge_existing_provenance(self, existing: Dict[str, Any], resource: Dict[str, Any]) -> bool:
+        """
+        将新命中的来源合并到已有资源的位集中（导出字段由调用方在重新评分前写入）
+
+        Args:
+            existing: 已有资源（原地修改）
+            resource: 新收集的同一资源
+
+        Returns:
+            命中来源是否增加
+        """
+        bits = self.seed_existing_provenance(existing)
+        merged = bits | resource.get('provenance', 0)
+        existing['provenance'] = merged
+        return merged != bits
+
+    def seed_existing_provenance(self, existing: Dict[str, Any]) -> int:
+        """
+        由已有资源的命中关键词列初始化其位集（已初始化时直接返回）
+
+        Args:
+            existing: 已有资源（原地修改）
+
+        Returns:
+            资源的位集
+        """
+        if existing.get('provenance'):
+            return existing['provenance']
+        provenance = self.collector.provenance
+        # 早期导出文件没有命中关键词列，以其搜索来源与关键词作为初始记录
+        existing['provenance'] = provenance.parse(existing.get('matched_keywords')) or provenance.mark(existing)
+        return existing['provenance']
+
+    def refresh_priority(self, resource: Dict[str, Any]):
+        """仓库元数据刷新的优先级：缺少星标数的资源优先，其次按当前评分从高到低"""
+        return resource.get('stars') is None, self.parser.calculate_quality_score(resource)
+
+    def drop_dead_links(self) -> bool:
+        """是否在导出前丢弃已失效的链接"""
+        return self.config.get('verify', {}).get('drop_dead', True)
+
+    def collect(self, keywords: List[str] = None):
+        """
+        执行收集任务
+
+        Args:
+            keywords: 额外的搜索关键词
+        """
+        print(Fore.CYAN + "[搜索] 开始收集资源...")
+
+        # 获取关键词
+        keywords_zh, keywords_en = self.get_keywords(keywords)
+
+        # 收集资源
         resources = self.collector.collect_all(keywords_zh, keywords_en)
 
         # 去重
         resources = self.collector.get_unique_resources()
         print(Fore.GREEN + f"[完成] 收集完成，共 {len(resources)} 个唯一资源")
 
+        # 近似重复过滤（每个簇保留评分最高的资源）
+        near_dup_config = self.get_near_duplicate_config()
+        if near_dup_config:
+            resources = remove_near_duplicates(resources, self.parser.calculate_quality_score, **near_dup_config)
+            print(Fore.GREEN + f"[去重] 近似重复过滤后剩余 {len(resources)} 个资源")
+
+        # 校验链接，丢弃失效链接
+        if self.verifier:
+            print(Fore.CYAN + "\n[校验] 校验资源链接...")
+            resources = self.verifier.verify(resources, drop_dead=self.drop_dead_links())
+            print(Fore.GREEN + f"[校验] 校验后剩余 {len(resources)} 个资源")
+
+        # 刷新仓库链接的元数据
+        if self.repo_refresher:
+            print(Fore.CYAN + "\n[刷新] 刷新仓库元数据...")
+            refreshed = self.repo_refresher.refresh(resources, self.refresh_priority)
+            print(Fore.GREEN + f"[刷新] 刷新 {len(refreshed)} 个仓库链接的元数据")
+
+        # 抓取页面补充信息
+        if self.fetcher:
+            print(Fore.CYAN + "\n[抓取] 抓取资源页面...")
+            resources = self.fetcher.enrich(resources)
+
+        # 展开命中来源（参与评分并导出）
+        for resource in resources:
+            self.collector.provenance.annotate(resource)
+
         # 解析资源
         print(Fore.CYAN + "\n[解析] 解析资源信息...")
         resources = self.parser.parse_resources(resources)
@@ -217,33 +442,235 @@ class AutomatedInfoCollector:
             print(Fore.GREEN + f"[CSV] 备份: {csv_path}")
 
         # 显示Top资源
-        print(Fore.CYAN + "\n[推荐] Top 5 高质量资源:")
-        print(Fore.CYAN + "-" * 60)
-        top_resources = self.parser.get_top_resources(filtered, 5)
-        for i, r in enumerate(top_resources, 1):
-            print(f"\n{Fore.YELLOW}{i}. {r['title']}")
-            print(f"   {Fore.WHITE}URL: {r['url']}")
-            print(f"   {Fore.GREEN}评分: {r['quality_score']:.1f} | 类型: {r['type']} | 语言: {r['language_detected']}")
-            print(f"   {Fore.CYAN}推荐: {r['recommendation']}")
+        self.print_top_resources(filtered)
+
+        print(Fore.GREEN + "\n[成功] 收集任务完成！")
+
+    def collect_stream(self, keywords: List[str] = None):
+        """
+        以流式模式执行收集任务
+
+        每个关键词的结果一到达就依次完成去重、解析、过滤并追加写入CSV，
+        收集过程中不在内存中累积完整结果集。Excel 需要完整数据，
+        因此在收集结束后由已写入的CSV生成。
+
+        Args:
+            keywords: 额外的搜索关键词
+        """
+        print(Fore.CYAN + "[搜索] 开始流式收集资源...")
+
+        # 获取关键词
+        keywords_zh, keywords_en = self.get_keywords(keywords)
+
+        min_score = self.config['filters']['min_quality_score']
+        excel_file = self.config['output']['excel_file']
+        csv_file = excel_file.replace('.xlsx', '.csv')
+
+        total = 0
+        with self.storage.open_csv_stream(csv_file) as writer:
+            resources = self.collector.iter_unique(self.collector.iter_all(keywords_zh, keywords_en),
+                                                   self.collector.provenance)
+            # 流式模式下近似重复簇保留最先到达的资源
+            near_dup_config = self.get_near_duplicate_config()
+            if near_dup_config:
+                # 代表资源可能已写入CSV，只保存指纹索引，不记录其他来源链接
+                resources = NearDuplicateFilter(**near_dup_config, keep_representatives=False).iter_filter(resources)
+            # 校验链接，丢弃失效链接
+            if self.verifier:
+                resources = self.verifier.iter_verify(resources, drop_dead=self.drop_dead_links())
+            # 刷新仓库链接的元数据（按到达顺序凑批）
+            if self.repo_refresher:
+                resources = self.repo_refresher.iter_refresh(resources)
+            # 抓取页面补充信息
+            if self.fetcher:
+                resources = self.fetcher.iter_enrich(resources)
+            for resource in resources:
+                total += 1
+                resource = self.parser.parse_resource(self.collector.provenance.annotate(resource))
+                # 过滤低质量资源
+                if resource.get('quality_score', 0) >= min_score:
+                    writer.write(resource)
+            self.parser.flush_memo()
+
+        print(Fore.GREEN + f"[完成] 收集完成，共 {total} 个唯一资源")
+        print(Fore.YELLOW + f"\n[过滤] 质量过滤: {writer.count}/{total} (>={min_score}分)")
+        print(Fore.GREEN + f"[CSV] 文件: {writer.filepath}")
+
+        # 由CSV生成Excel
+        print(Fore.CYAN + "\n[保存] 生成Excel...")
+        filtered = self.storage.load_existing_resources(csv_file)
+        categorized = self.parser.categorize_resources(filtered)
+        self.print_statistics(filtered)
+        excel_path = self.storage.save_to_excel(filtered, categorized, excel_file)
+        print(Fore.GREEN + f"[Excel] 文件: {excel_path}")
+
+        # 显示Top资源
+        self.print_top_resources(filtered)
 
         print(Fore.GREEN + "\n[成功] 收集任务完成！")
 
-    def update(self, existing_file: str):
+    def update(self, existing_file: str, keywords: List[str] = None):
         """
         增量更新资源
 
+        以已有导出文件的URL建立索引：只解析和评分新出现的资源；
+        已有资源仅在来源元数据（星标数、更新时间）变化时重新评分，
+        最后合并写回导出文件。
+
         Args:
-            existing_file: 已存在的资源文件
+            existing_file: 已存在的资源文件（.xlsx 或 .csv）
+            keywords: 额外的搜索关键词
         """
         print(Fore.CYAN + "[加载] 加载已有资源...")
         existing = self.storage.load_existing_resources(existing_file)
         print(f"  已有 {len(existing)} 个资源")
+        url_index = self.storage.build_url_index(existing)
+
+        # 收集资源
+        print(Fore.CYAN + "[搜索] 开始收集资源...")
+        keywords_zh, keywords_en = self.get_keywords(keywords)
+        self.collector.collect_all(keywords_zh, keywords_en)
+        collected = self.collector.get_unique_resources()
+
+        # 以已有资源预热近似重复过滤器，与已有资源近似重复的新资源只记录为其他来源链接；
+        # 预热前由命中关键词列初始化位集，合并的命中来源追加到已有记录上
+        near_filter = None
+        near_dup_config = self.get_near_duplicate_config()
+        if near_dup_config:
+            near_filter = NearDuplicateFilter(**near_dup_config)
+            for resource in existing:
+                self.seed_existing_provenance(resource)
+                near_filter.add_representative(resource)
+
+        # 区分新资源与元数据变化的已有资源
+        existing_ids = {id(resource) for resource in existing}
+        new_resources = []
+        changed = {}
+        near_dup_count = 0
+        unchanged_count = 0
+        for resource in collected:
+            position = url_index.get(ensure_url_key(resource))
+            if position is None:
+                if near_filter:
+                    representative = near_filter.match(resource)
+                    if representative is not None:
+                        near_dup_count += 1
+                        # 合并到已有资源时，其其他来源链接与命中来源已变化
+                        if id(representative) in existing_ids:
+                            changed[id(representative)] = representative
+                        continue
+                new_resources.append(resource)
+                continue
+
+            current = existing[position]
+            metadata_changed = self.storage.source_metadata_changed(current, resource)
+            if metadata_changed:
+                for field in self.storage.SOURCE_METADATA_FIELDS:
+                    if resource.get(field) not in (None, ''):
+                        current[field] = resource[field]
+            if self.merge_existing_provenance(current, resource) or metadata_changed:
+                changed[id(current)] = current
+            else:
+                unchanged_count += 1
+
+        # 重新评分来源元数据、命中来源或其他来源链接变化的已有资源
+        for current in changed.values():
+            self.collector.provenance.annotate(current)
+            self.parser.rescore_resource(current)
+        changed_count = len(changed)
+
+        print(Fore.GREEN + f"[完成] 新增 {len(new_resources)} 个资源，重新评分 {changed_count} 个已有资源，"
+              f"跳过 {near_dup_count} 个近似重复资源，其余 {unchanged_count} 个未变化")
+
+        # 校验新资源的链接
+        if self.verifier and new_resources:
+            print(Fore.CYAN + "\n[校验] 校验新资源链接...")
+            new_resources = self.verifier.verify(new_resources, drop_dead=self.drop_dead_links())
+
+        # 刷新新资源与已过期的已有资源的仓库元数据，元数据变化的已有资源重新评分
+        if self.repo_refresher:
+            print(Fore.CYAN + "\n[刷新] 刷新仓库元数据...")
+            refreshed = self.repo_refresher.refresh(new_resources + existing, self.refresh_priority)
+            refreshed_existing = [resource for resource in refreshed if id(resource) in existing_ids]
+            for resource in refreshed_existing:
+                self.parser.rescore_resource(resource)
+            print(Fore.GREEN + f"[刷新] 刷新 {len(refreshed)} 个仓库链接的元数据"
+                  f"（其中已有资源 {len(refreshed_existing)} 个）")
+
+        # 抓取新资源的页面补充信息
+        if self.fetcher and new_resources:
+            print(Fore.CYAN + "\n[抓取] 抓取新资源页面...")
+            new_resources = self.fetcher.enrich(new_resources)
+
+        # 只解析新资源
+        for resource in new_resources:
+            self.collector.provenance.annotate(resource)
+        new_resources = self.parser.parse_resources(new_resources)
+
+        # 过滤低质量的新资源后合并
+        min_score = self.config['filters']['min_quality_score']
+        new_resources = [r for r in new_resources if r.get('quality_score', 0) >= min_score]
+        merged = self.storage.merge_resources(existing, new_resources)
+        categorized = self.parser.categorize_resources(merged)
+
+        # 打印统计
+        self.print_statistics(merged)
+
+        # 写回导出文件
+        print(Fore.CYAN + "\n[保存] 保存结果...")
+        base_name = os.path.splitext(existing_file)[0]
+        excel_path = self.storage.save_to_excel(merged, categorized, f"{base_name}.xlsx")
+        print(Fore.GREEN + f"[Excel] 文件: {excel_path}")
+        if existing_file.endswith('.csv') or self.config['output'].get('csv_backup', True):
+            csv_path = self.storage.save_to_csv(merged, f"{base_name}.csv")
+            print(Fore.GREEN + f"[CSV] 备份: {csv_path}")
+
+        print(Fore.GREEN + "\n[成功] 增量更新完成！")
+
+    def verify(self, existing_file: str):
+        """
+        校验已有导出文件中的资源链接
+
+        校验结果在有效期内缓存，重复执行时只请求新增或已过期的链接。
+        校验后根据内容类型重新判断资源类型并重新评分，写回导出文件。
+
+        Args:
+            existing_file: 已存在的资源文件（.xlsx 或 .csv）
+        """
+        print(Fore.CYAN + "[加载] 加载已有资源...")
+        resources = self.storage.load_existing_resources(existing_file)
+        print(f"  已有 {len(resources)} 个资源")
+
+        verifier = self.verifier or create_link_verifier(
+            self.collector.session,
+            self.config.get('verify'),
+            cache_dir=os.path.join(self.storage.output_dir, '.cache'),
+            force=True
+        )
+        print(Fore.CYAN + "[校验] 校验资源链接...")
+        checked = verifier.verify(resources, drop_dead=self.drop_dead_links())
+        dead_count = sum(1 for r in resources if r.get('alive') is False)
+        print(Fore.GREEN + f"[完成] 校验 {len(resources)} 个资源，失效 {dead_count} 个，保留 {len(checked)} 个")
+
+        # 内容类型参与资源类型判断，重新分类并评分
+        for resource in checked:
+            resource['type'] = self.parser.detect_resource_type(resource)
+            self.parser.rescore_resource(resource)
+        categorized = self.parser.categorize_resources(checked)
 
-        # 收集新资源
-        self.collect()
+        # 打印统计
+        self.print_statistics(checked)
 
-        # TODO: 实现增量更新逻辑
-        print(Fore.YELLOW + "[警告] 增量更新功能开发中...")
+        # 写回导出文件
+        print(Fore.CYAN + "\n[保存] 保存结果...")
+        base_name = os.path.splitext(existing_file)[0]
+        excel_path = self.storage.save_to_excel(checked, categorized, f"{base_name}.xlsx")
+        print(Fore.GREEN + f"[Excel] 文件: {excel_path}")
+        if existing_file.endswith('.csv') or self.config['output'].get('csv_backup', True):
+            csv_path = self.storage.save_to_csv(checked, f"{base_name}.csv")
+            print(Fore.GREEN + f"[CSV] 备份: {csv_path}")
+
+        print(Fore.GREEN + "\n[成功] 链接校验完成！")
 
     def show_stats(self):
         """显示当前资源统计"""
@@ -257,6 +684,23 @@ class AutomatedInfoCollector:
         resources = self.storage.load_existing_resources(excel_file)
         self.print_statistics(resources)
 
+        # 关键词历史收益
+        if self.collector.keyword_scheduler is not None:
+            self.print_keyword_yields()
+
+    def print_keyword_yields(self):
+        """打印各关键词的历史收益（每次搜索的新URL数、重复率与平均耗时）"""
+        yields = self.collector.keyword_scheduler.stats.all()
+        if not yields:
+            return
+
+        print(Fore.YELLOW + "\n  关键词收益 (每次搜索新URL数 | 重复率 | 平均耗时 | 搜索次数):")
+        for record in yields:
+            duplicate_rate = 1 - record.total_new / record.total_results if record.total_results else 0.0
+            latency = f"{record.avg_latency:.1f}s" if record.avg_latency is not None else "-"
+            print(f"    [{record.source}] {record.keyword}: {record.new_per_search:.1f} | "
+                  f"{duplicate_rate:.0%} | {latency} | {record.runs}")
+
 
 def main():
     """主函数"""
@@ -266,8 +710,8 @@ def main():
 
     parser.add_argument(
         'command',
-        choices=['search', 'update', 'stats'],
-        help='执行的命令: search(搜索新资源), update(增量更新), stats(显示统计)'
+        choices=['search', 'update', 'verify', 'stats', 'worker'],
+        help='执行的命令: search(搜索新资源), update(增量更新), verify(校验链接), stats(显示统计), worker(处理任务队列)'
     )
 
     parser.add_argument(
@@ -283,25 +727,69 @@ def main():
 
     parser.add_argument(
         '--file',
-        help='用于update命令的已存在文件'
+        help='用于update/verify命令的已存在文件'
+    )
+
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help='忽略DuckDuckGo搜索结果缓存，重新搜索所有关键词'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='从上次中断的运行恢复：已完成的关键词直接使用运行日志中的结果'
+    )
+
+    parser.add_argument(
+        '--distributed',
+        action='store_true',
+        help='分布式模式：search/update 只写入任务队列并汇总结果，搜索由 worker 命令执行'
+    )
+
+    parser.add_argument(
+        '--worker-id',
+        help='worker 标识（默认为 主机名-进程号）'
+    )
+
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='流式模式：结果边收集边解析并追加写入CSV'
     )
 
     args = parser.parse_args()
 
     # 创建收集器
     collector = AutomatedInfoCollector(args.config)
+    collector.collector.refresh = args.refresh
     collector.print_banner()
+    if args.distributed and args.command in ('search', 'update'):
+        collector.use_work_queue()
 
     # 执行命令
     if args.command == 'search':
-        collector.collect(args.keywords)
+        with collector.open_journal('search', args.resume):
+            if args.stream:
+                collector.collect_stream(args.keywords)
+            else:
+                collector.collect(args.keywords)
     elif args.command == 'update':
         if not args.file:
             print(Fore.RED + "[错误] update命令需要指定--file参数")
             sys.exit(1)
-        collector.update(args.file)
+        with collector.open_journal('update', args.resume):
+            collector.update(args.file, args.keywords)
+    elif args.command == 'verify':
+        if not args.file:
+            print(Fore.RED + "[错误] verify命令需要指定--file参数")
+            sys.exit(1)
+        collector.verify(args.file)
     elif args.command == 'stats':
         collector.show_stats()
+    elif args.command == 'worker':
+        collector.run_worker(args.worker_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,180 @@
+"""
+多模式匹配模块 - Aho-Corasick 自动机，单次扫描文本即可找出所有关键词，用于资源类型分类
+"""
+from collections import deque
+from typing import Dict, List, Iterable, Iterator, Set, Tuple
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick 多模式匹配自动机
+
+    构建时把失败链接展开为确定性转移表（只保存不回到根节点的转移），
+    匹配时每个字符只需一次字典查找，耗时与文本长度成正比，与模式数量无关。
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()):
+        """
+        初始化自动机
+
+        Args:
+            patterns: 初始模式列表
+        """
+        self.patterns: List[str] = []
+        self._ids: Dict[str, int] = {}
+        # 字典树：每个状态的子节点、失败链接与匹配输出
+        self._children: List[Dict[str, int]] = [{}]
+        self._outputs: List[Tuple[int, ...]] = [()]
+        self._delta: List[Dict[str, int]] = []
+        for pattern in patterns:
+            self.add(pattern)
+
+    def add(self, pattern: str) -> int:
+        """
+        添加模式（相同模式只保存一次）
+
+        Args:
+            pattern: 模式字符串（非空）
+
+        Returns:
+            模式编号
+        """
+        if not pattern:
+            raise ValueError("模式不能为空")
+        pattern_id = self._ids.get(pattern)
+        if pattern_id is not None:
+            return pattern_id
+
+        state = 0
+        for char in pattern:
+            child = self._children[state].get(char)
+            if child is None:
+                child = len(self._children)
+                self._children[state][char] = child
+                self._children.append({})
+                self._outputs.append(())
+            state = child
+
+        pattern_id = len(self.patterns)
+        self.patterns.append(pattern)
+        self._ids[pattern] = pattern_id
+        self._outputs[state] = (pattern_id,)
+        # 新增模式后需要重新构建
+        self._delta = []
+        return pattern_id
+
+    def build(self):
+        """按广度优先顺序计算失败链接，合并后缀输出并生成确定性转移表"""
+        state_count = len(self._children)
+        fail = [0] * state_count
+        outputs = list(self._outputs)
+        delta: List[Dict[str, int]] = [dict() for _ in range(state_count)]
+        delta[0] = dict(self._children[0])
+
+        queue = deque(self._children[0].values())
+        while queue:
+            state = queue.popleft()
+            # 失败状态已在之前处理：继承其转移与输出，再用自身子节点覆盖
+            transitions = dict(delta[fail[state]])
+            for char, child in self._children[state].items():
+                fail[child] = delta[fail[state]].get(char, 0)
+                transitions[char] = child
+                queue.append(child)
+            delta[state] = transitions
+            if outputs[fail[state]]:
+                outputs[state] = outputs[state] + outputs[fail[state]]
+
+        self._outputs = outputs
+        self._delta = delta
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """
+        扫描文本，产出所有（含重叠的）匹配
+
+        Args:
+            text: 待匹配文本
+
+        Yields:
+            (起始位置, 模式编号) 元组，起始位置为匹配在文本中的下标
+        """
+        if not self._delta:
+            self.build()
+        delta = self._delta
+        outputs = self._outputs
+        patterns = self.patterns
+        state = 0
+        for index, char in enumerate(text):
+            state = delta[state].get(char, 0)
+            if outputs[state]:
+                for pattern_id in outputs[state]:
+                    yield index - len(patterns[pattern_id]) + 1, pattern_id
+
+
+class TaxonomyMatcher:
+    """
+    资源类型分类匹配器
+
+    把所有类型关键词与URL特殊规则编译进同一个自动机：关键词在整段文本中出现即计1分
+    （同一关键词多次出现只计一次），URL规则只统计完全落在URL区间内的匹配，每条规则最多加一次分。
+    """
+
+    def __init__(self, type_keywords: Dict[str, List[str]],
+                 url_rules: List[Tuple[Tuple[str, ...], str, float]] = ()):
+        """
+        编译分类规则
+
+        Args:
+            type_keywords: 类型 -> 关键词列表
+            url_rules: (URL模式元组, 类型, 加分) 列表，任一模式出现在URL中即加分
+        """
+        self.types = list(type_keywords)
+        self.automaton = AhoCorasick()
+        # 模式编号 -> 命中时加分的类型列表（同一关键词可属于多个类型）
+        self._keyword_types: Dict[int, List[str]] = {}
+        # 模式编号 -> 包含该模式的URL规则编号
+        self._url_rules_by_pattern: Dict[int, List[int]] = {}
+        self.url_rules = list(url_rules)
+
+        for resource_type, keywords in type_keywords.items():
+            for keyword in keywords:
+                pattern_id = self.automaton.add(keyword)
+                self._keyword_types.setdefault(pattern_id, []).append(resource_type)
+        for rule_id, (patterns, _, _) in enumerate(self.url_rules):
+            for pattern in patterns:
+                pattern_id = self.automaton.add(pattern)
+                self._url_rules_by_pattern.setdefault(pattern_id, []).append(rule_id)
+        self.automaton.build()
+
+    def match(self, text: str, url_start: int = 0, url_end: int = 0) -> Tuple[Dict[str, float], Set[str]]:
+        """
+        单次扫描文本，计算每种类型的得分
+
+        Args:
+            text: 已转为小写的合并文本
+            url_start: URL在文本中的起始下标
+            url_end: URL在文本中的结束下标（不含）
+
+        Returns:
+            (类型 -> 得分, 在URL区间内出现的URL规则模式集合) 元组
+        """
+        keyword_hits = set()
+        url_hits = set()
+        patterns = self.automaton.patterns
+        url_rules_by_pattern = self._url_rules_by_pattern
+        for start, pattern_id in self.automaton.iter_matches(text):
+            keyword_hits.add(pattern_id)
+            if (pattern_id in url_rules_by_pattern and start >= url_start
+                    and start + len(patterns[pattern_id]) <= url_end):
+                url_hits.add(pattern_id)
+
+        scores = dict.fromkeys(self.types, 0)
+        for pattern_id in keyword_hits:
+            for resource_type in self._keyword_types.get(pattern_id, ()):
+                scores[resource_type] += 1
+
+        fired_rules = {rule_id for pattern_id in url_hits for rule_id in url_rules_by_pattern[pattern_id]}
+        for rule_id in sorted(fired_rules):
+            _, resource_type, weight = self.url_rules[rule_id]
+            scores[resource_type] += weight
+
+        return scores, {patterns[pattern_id] for pattern_id in url_hits}
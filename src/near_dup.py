@@ -0,0 +1,295 @@
+"""
+近似重复检测模块 - 基于SimHash指纹与分段LSH索引识别转载、镜像等近似重复资源
+"""
+import re
+import hashlib
+from collections import Counter
+from functools import lru_cache
+from itertools import combinations
+from typing import Dict, Any, List, Callable, Iterable, Optional, Tuple
+import numpy as np
+import logging
+
+from provenance import merge_provenance
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_BITS = 64
+
+# 英文/数字词与连续中日韩字符
+_WORD_PATTERN = re.compile(r'[a-z0-9]+')
+_CJK_PATTERN = re.compile(r'[\u4e00-\u9fff\u3040-\u30ff\uac00-\ud7af]+')
+
+
+def extract_features(text: str) -> Counter:
+    """
+    提取文本特征：英文按单词，中日韩文字按相邻二元组
+
+    Args:
+        text: 文本
+
+    Returns:
+        特征 -> 出现次数
+    """
+    text = (text or '').lower()
+    features = Counter(_WORD_PATTERN.findall(text))
+    for run in _CJK_PATTERN.findall(text):
+        if len(run) == 1:
+            features[run] += 1
+        else:
+            features.update(run[i:i + 2] for i in range(len(run) - 1))
+    return features
+
+
+@lru_cache(maxsize=1 << 18)
+def _feature_hash(feature: str) -> int:
+    """计算特征的64位哈希（常见词重复出现，结果带缓存）"""
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def simhash(features: Counter) -> int:
+    """
+    计算SimHash指纹
+
+    Args:
+        features: 特征 -> 权重
+
+    Returns:
+        64位指纹（无符号整数）
+    """
+    if not features:
+        return 0
+    hashes = np.array([_feature_hash(f) for f in features], dtype='>u8')
+    weights = np.array(list(features.values()), dtype=np.int64)
+    # 每个特征展开为64个比特位，按权重对每一位投票
+    bits = np.unpackbits(hashes.view(np.uint8)).reshape(len(hashes), FINGERPRINT_BITS)
+    votes = weights @ (bits.astype(np.int64) * 2 - 1)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), 'big')
+
+
+class SimHashIndex:
+    """
+    SimHash近邻索引
+
+    把64位指纹切分为 max_distance + r 个分块，每张索引表以其中 r 个分块的取值为键。
+    根据鸽巢原理，汉明距离不超过 max_distance 的两个指纹至少有 r 个分块完全相同，
+    因此必然在某张表中落入同一个桶，只需比较同桶的候选指纹，复杂度为亚二次。
+    r 的取值保证每张表的键至少为 MIN_KEY_BITS 位，使桶足够稀疏。
+    """
+
+    MIN_KEY_BITS = 16
+
+    def __init__(self, max_distance: int = 6, max_bucket_size: int = 256):
+        """
+        初始化索引
+
+        Args:
+            max_distance: 判定为近似重复的最大汉明距离
+            max_bucket_size: 每个桶中参与比较的最近条目数上限，防止常见指纹退化为二次比较
+        """
+        self.max_distance = max_distance
+        self.max_bucket_size = max_bucket_size
+
+        # 选择每张表使用的分块数 r
+        chosen = 1
+        while (FINGERPRINT_BITS // (max_distance + chosen)) * chosen < self.MIN_KEY_BITS:
+            chosen += 1
+        block_count = max_distance + chosen
+        block_width = FINGERPRINT_BITS // block_count
+        block_masks = []
+        for i in range(block_count):
+            width = block_width if i < block_count - 1 else FINGERPRINT_BITS - i * block_width
+            block_masks.append(((1 << width) - 1) << (i * block_width))
+
+        self._table_masks = [
+            sum(masks) for masks in combinations(block_masks, chosen)
+        ]
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._table_masks]
+        # 桶中只保存条目序号，指纹与ID集中保存
+        self._fingerprints: List[int] = []
+        self._item_ids: List[Any] = []
+
+    def find(self, fingerprint: int) -> Optional[Any]:
+        """
+        查找与指纹近似重复的已索引条目
+
+        Args:
+            fingerprint: 64位指纹
+
+        Returns:
+            第一个匹配条目的ID，没有匹配时返回 None
+        """
+        fingerprints = self._fingerprints
+        for mask, table in zip(self._table_masks, self._tables):
+            for position in table.get(fingerprint & mask, ()):
+                if (fingerprint ^ fingerprints[position]).bit_count() <= self.max_distance:
+                    return self._item_ids[position]
+        return None
+
+    def add(self, item_id: Any, fingerprint: int):
+        """
+        将条目加入索引
+
+        Args:
+            item_id: 条目ID
+            fingerprint: 64位指纹
+        """
+        position = len(self._fingerprints)
+        self._fingerprints.append(fingerprint)
+        self._item_ids.append(item_id)
+        for mask, table in zip(self._table_masks, self._tables):
+            key = fingerprint & mask
+            bucket = table.get(key)
+            if bucket is None:
+                table[key] = [position]
+            else:
+                bucket.append(position)
+                if len(bucket) > self.max_bucket_size:
+                    del bucket[0]
+
+
+class NearDuplicateFilter:
+    """
+    近似重复过滤器：按标题+描述的SimHash指纹聚类，保留每个簇的代表资源并记录其他来源链接
+
+    keep_representatives 为 False 时只保存指纹索引，不保存代表资源（内存不随资源字典增长），
+    近似重复资源直接丢弃，不记录其他来源链接与命中来源。
+    """
+
+    def __init__(self, max_distance: int = 6, min_features: int = 8, max_bucket_size: int = 256,
+                 keep_representatives: bool = True):
+        """
+        初始化过滤器
+
+        Args:
+            max_distance: 判定为近似重复的最大汉明距离
+            min_features: 参与近似重复检测所需的最少特征数，文本过短的资源不做判定
+            max_bucket_size: 每个分段桶中参与比较的最近条目数上限
+            keep_representatives: 是否保存代表资源，以便记录近似重复资源的链接与命中来源
+        """
+        self.min_features = min_features
+        self.index = SimHashIndex(max_distance, max_bucket_size)
+        self.keep_representatives = keep_representatives
+        self._representatives: Dict[int, Dict[str, Any]] = {}
+        self._count = 0
+
+    def fingerprint(self, resource: Dict[str, Any]) -> Optional[int]:
+        """
+        计算资源指纹
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            64位指纹，文本过短时返回 None
+        """
+        features = extract_features(f"{resource.get('title') or ''} {resource.get('description') or ''}")
+        if len(features) < self.min_features:
+            return None
+        return simhash(features)
+
+    def _check(self, resource: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """检查资源，返回 (是否为新的代表资源, 被合并到的代表资源)"""
+        fingerprint = self.fingerprint(resource)
+        if fingerprint is None:
+            return True, None
+
+        matched = self.index.find(fingerprint)
+        if matched is not None:
+            representative = self._representatives.get(matched)
+            if representative is not None:
+                alternates = representative.get('alternate_urls')
+                url = resource.get('url', '')
+                representative['alternate_urls'] = f"{alternates} | {url}" if alternates else url
+                merge_provenance(representative, resource)
+            return False, representative
+
+        self._add(resource, fingerprint)
+        return True, None
+
+    def check(self, resource: Dict[str, Any]) -> bool:
+        """
+        检查资源是否为已见资源的近似重复，是则将其链接记录到代表资源上
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            True 表示资源为新的代表资源，False 表示为近似重复
+        """
+        return self._check(resource)[0]
+
+    def match(self, resource: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        检查资源，若为近似重复则将其链接与命中来源合并到代表资源
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            被合并到的代表资源；资源为新的代表资源（或不保存代表资源）时返回 None
+        """
+        return self._check(resource)[1]
+
+    def add_representative(self, resource: Dict[str, Any]):
+        """
+        直接将资源作为代表加入索引（不做检查，用于以已有资源预热过滤器）
+
+        Args:
+            resource: 资源字典
+        """
+        fingerprint = self.fingerprint(resource)
+        if fingerprint is not None:
+            self._add(resource, fingerprint)
+
+    def _add(self, resource: Dict[str, Any], fingerprint: int):
+        """登记代表资源"""
+        item_id = self._count
+        self._count += 1
+        if self.keep_representatives:
+            self._representatives[item_id] = resource
+        self.index.add(item_id, fingerprint)
+
+    def iter_filter(self, resources: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        """
+        流式过滤：按到达顺序保留每个簇中第一个出现的资源
+
+        流式模式下先到达的代表资源可能已写出，应以 keep_representatives=False 创建过滤器，
+        此时近似重复资源的链接与命中来源不会记录到代表资源上。
+
+        Args:
+            resources: 资源迭代器
+
+        Yields:
+            非近似重复的资源
+        """
+        for resource in resources:
+            if self.check(resource):
+                yield resource
+
+
+def remove_near_duplicates(resources: List[Dict[str, Any]],
+                           score: Callable[[Dict[str, Any]], float],
+                           max_distance: int = 6, min_features: int = 8) -> List[Dict[str, Any]]:
+    """
+    去除近似重复资源，每个簇保留评分最高的代表
+
+    资源按评分从高到低依次加入索引，因此每个簇的代表总是评分最高者；
+    被合并资源的链接记录在代表资源的 alternate_urls 字段中，命中来源合并到代表资源的 provenance 位集中。
+
+    Args:
+        resources: 资源列表
+        score: 计算资源先验评分的函数
+        max_distance: 判定为近似重复的最大汉明距离
+        min_features: 参与近似重复检测所需的最少特征数
+
+    Returns:
+        去重后的资源列表（保持原始顺序）
+    """
+    near_filter = NearDuplicateFilter(max_distance, min_features)
+    order = sorted(range(len(resources)), key=lambda i: score(resources[i]), reverse=True)
+    kept = sorted(i for i in order if near_filter.check(resources[i]))
+
+    result = [resources[i] for i in kept]
+    logger.info(f"近似重复过滤: {len(resources)} -> {len(result)} 个资源")
+    return result
@@ -0,0 +1,396 @@
+"""
+页面抓取模块 - 并发抓取资源页面（全局并发与按主机限流），提取标题、描述、页面类型等信息补充到资源中
+"""
+import time
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+from typing import Dict, Any, List, Callable, Iterable, Iterator, Optional
+import requests
+from bs4 import BeautifulSoup
+import logging
+
+from robots import RobotsCache, create_robots_cache
+
+logger = logging.getLogger(__name__)
+
+# 提取正文长度前移除的非正文元素
+NON_CONTENT_TAGS = ['script', 'style', 'noscript', 'template', 'svg', 'nav', 'header', 'footer', 'aside', 'form']
+
+# 抓取结果写入资源的字段
+PAGE_FIELDS = ('page_title', 'meta_description', 'og_type', 'canonical_url', 'text_length')
+
+
+class HostScheduler:
+    """
+    按主机限流的调度器
+
+    限制每个主机同时进行的请求数，并保证同一主机相邻两次请求的开始时间间隔不小于该主机的延迟。
+    声明了 Crawl-delay 的主机按其间隔逐个请求。
+    """
+
+    def __init__(self, max_per_host: int = 2, delay: float = 1.0):
+        """
+        初始化调度器
+
+        Args:
+            max_per_host: 每个主机的最大并发请求数
+            delay: 同一主机相邻两次请求之间的最小间隔（秒）
+        """
+        self.max_per_host = max(1, max_per_host)
+        self.delay = delay
+        self._cond = threading.Condition()
+        self._active: Dict[str, int] = defaultdict(int)
+        self._next_start: Dict[str, float] = {}
+        self._host_delays: Dict[str, float] = {}
+
+    def set_crawl_delay(self, host: str, delay: float):
+        """
+        设置主机声明的 Crawl-delay：该主机此后按此间隔（不小于默认间隔）逐个请求
+
+        Args:
+            host: 主机名
+            delay: 抓取间隔（秒）
+        """
+        with self._cond:
+            self._host_delays[host] = max(self.delay, delay)
+
+    def acquire(self, host: str):
+        """
+        等待直到可以向主机发起请求，并占用一个该主机的并发名额
+
+        Args:
+            host: 主机名
+        """
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                delay = self._host_delays.get(host)
+                limit = self.max_per_host if delay is None else 1
+                if self._active[host] < limit:
+                    wait_seconds = self._next_start.get(host, 0) - now
+                    if wait_seconds <= 0:
+                        self._active[host] += 1
+                        self._next_start[host] = now + (self.delay if delay is None else delay)
+                        return
+                    self._cond.wait(wait_seconds)
+                else:
+                    self._cond.wait()
+
+    def release(self, host: str):
+        """
+        释放主机的并发名额
+
+        Args:
+            host: 主机名
+        """
+        with self._cond:
+            self._active[host] -= 1
+            if self._active[host] <= 0:
+                del self._active[host]
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, host: str):
+        """
+        占用主机并发名额的上下文管理器
+
+        Args:
+            host: 主机名
+        """
+        self.acquire(host)
+        try:
+            yield
+        finally:
+            self.release(host)
+
+
+def extract_page_metadata(body: bytes, encoding: str = None) -> Dict[str, Any]:
+    """
+    从HTML中提取页面信息
+
+    Args:
+        body: HTML内容（可能已按字节上限截断）
+        encoding: 响应头声明的编码，None 时由 BeautifulSoup 自动检测
+
+    Returns:
+        包含 page_title、meta_description、og_type、canonical_url、text_length 的字典（缺失的字段不包含）
+    """
+    soup = BeautifulSoup(body, 'html.parser', from_encoding=encoding)
+    metadata = {}
+
+    if soup.title and soup.title.string:
+        metadata['page_title'] = ' '.join(soup.title.string.split())
+
+    def meta_content(**attrs):
+        tag = soup.find('meta', attrs=attrs)
+        content = tag.get('content') if tag else None
+        return ' '.join(content.split()) if content else None
+
+    description = meta_content(name='description') or meta_content(property='og:description')
+    if description:
+        metadata['meta_description'] = description
+
+    og_type = meta_content(property='og:type')
+    if og_type:
+        metadata['og_type'] = og_type.lower()
+
+    for link in soup.find_all('link', href=True):
+        rel = link.get('rel') or []
+        if 'canonical' in [value.lower() for value in rel]:
+            metadata['canonical_url'] = link['href'].strip()
+            break
+
+    for tag in soup(NON_CONTENT_TAGS):
+        tag.decompose()
+    body_tag = soup.body or soup
+    metadata['text_length'] = len(body_tag.get_text(' ', strip=True))
+
+    return metadata
+
+
+def interleave_by_host(resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    按主机轮流排列资源，避免同一主机的大量请求集中占用线程
+
+    Args:
+        resources: 资源列表
+
+    Returns:
+        重新排列后的资源列表
+    """
+    by_host: Dict[str, deque] = defaultdict(deque)
+    for resource in resources:
+        by_host[urlsplit(resource.get('url') or '').hostname or ''].append(resource)
+
+    queues = deque(by_host.values())
+    ordered = []
+    while queues:
+        host_queue = queues.popleft()
+        ordered.append(host_queue.popleft())
+        if host_queue:
+            queues.append(host_queue)
+    return ordered
+
+
+def iter_concurrently(func: Callable[[Dict[str, Any]], Dict[str, Any]], resources: Iterable[Dict[str, Any]],
+                      max_workers: int, accept: Callable[[Dict[str, Any]], bool] = None,
+                      thread_name_prefix: str = "fetch") -> Iterator[Dict[str, Any]]:
+    """
+    以有界窗口并发处理资源：同时提交的任务不超过 max_workers 的两倍，按完成顺序产出结果
+
+    Args:
+        func: 处理单个资源的函数
+        resources: 资源迭代器
+        max_workers: 并发线程数
+        accept: 判断资源是否需要处理的函数，不需要处理的资源原样产出
+        thread_name_prefix: 线程名前缀
+
+    Yields:
+        处理后的资源
+    """
+    max_pending = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix) as executor:
+        pending = set()
+        for resource in resources:
+            if accept is not None and not accept(resource):
+                yield resource
+                continue
+
+            pending.add(executor.submit(func, resource))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in pending:
+            yield future.result()
+
+
+class PageFetcher:
+    """
+    页面抓取器：全局并发数由线程池大小限制，每个主机的并发与请求间隔由 HostScheduler 限制
+
+    启用 robots.txt 检查时，被禁止的URL在占用主机名额之前就被跳过，主机声明的 Crawl-delay 会被遵守。
+    """
+
+    def __init__(self, session: requests.Session, max_workers: int = 16, max_per_host: int = 2,
+                 host_delay: float = 1.0, max_bytes: int = 262144, timeout: float = 15,
+                 sources: List[str] = None, robots: RobotsCache = None, max_crawl_delay: float = 30):
+        """
+        初始化页面抓取器
+
+        Args:
+            session: 共享的HTTP会话
+            max_workers: 全局最大并发抓取数
+            max_per_host: 每个主机的最大并发抓取数
+            host_delay: 同一主机相邻两次抓取之间的最小间隔（秒）
+            max_bytes: 每个页面最多读取的字节数
+            timeout: 请求超时时间（秒）
+            sources: 需要抓取页面的搜索源，None 表示全部
+            robots: robots.txt 缓存，为 None 时不检查 robots.txt
+            max_crawl_delay: 可接受的最大 Crawl-delay（秒），声明了更长间隔的主机不抓取
+        """
+        self.session = session
+        self.max_workers = max(1, max_workers)
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self.sources = set(sources) if sources else None
+        self.host_scheduler = HostScheduler(max_per_host, host_delay)
+        self.robots = robots
+        self.max_crawl_delay = max_crawl_delay
+        self._skipped = 0
+        self._skipped_lock = threading.Lock()
+
+    def should_fetch(self, resource: Dict[str, Any]) -> bool:
+        """
+        判断资源是否需要抓取页面
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            是否抓取
+        """
+        if self.sources is not None and resource.get('source') not in self.sources:
+            return False
+        return urlsplit(resource.get('url') or '').scheme in ('http', 'https')
+
+    def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        抓取单个页面并提取信息
+
+        Args:
+            url: 页面地址
+
+        Returns:
+            页面信息字典，请求失败或不是HTML页面时返回 None
+        """
+        host = urlsplit(url).hostname
+        if not host:
+            return None
+
+        # 在占用主机名额之前检查 robots.txt
+        if self.robots is not None and not self._check_robots(url, host):
+            with self._skipped_lock:
+                self._skipped += 1
+            return None
+
+        with self.host_scheduler.slot(host):
+            try:
+                with self.session.get(url, stream=True, timeout=self.timeout,
+                                      headers={'Accept': 'text/html,application/xhtml+xml'}) as response:
+                    if response.status_code != 200:
+                        logger.debug(f"页面抓取返回状态码 {response.status_code}: {url}")
+                        return None
+                    content_type = response.headers.get('Content-Type', '').lower()
+                    if 'html' not in content_type:
+                        return None
+                    body = self._read_capped(response)
+                    encoding = response.encoding if 'charset' in content_type else None
+            except requests.RequestException as e:
+                logger.debug(f"页面抓取失败 ({url}): {e}")
+                return None
+
+        # 在释放主机名额后再解析页面
+        try:
+            return extract_page_metadata(body, encoding)
+        except Exception as e:
+            logger.debug(f"页面解析失败 ({url}): {e}")
+            return None
+
+    def _check_robots(self, url: str, host: str) -> bool:
+        """检查 robots.txt 是否允许抓取，并登记主机的 Crawl-delay"""
+        if not self.robots.allowed(url):
+            logger.debug(f"robots.txt 禁止抓取: {url}")
+            return False
+
+        delay = self.robots.crawl_delay(url)
+        if delay is not None:
+            if delay > self.max_crawl_delay:
+                logger.debug(f"Crawl-delay {delay} 秒超过上限，跳过: {url}")
+                return False
+            self.host_scheduler.set_crawl_delay(host, delay)
+        return True
+
+    def _read_capped(self, response: requests.Response) -> bytes:
+        """读取响应内容，最多 max_bytes 字节"""
+        chunks = []
+        size = 0
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.max_bytes:
+                break
+        return b''.join(chunks)[:self.max_bytes]
+
+    def _enrich_one(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """抓取资源页面并将页面信息写入资源"""
+        metadata = self.fetch(resource['url'])
+        if metadata:
+            resource.update(metadata)
+        return resource
+
+    def iter_enrich(self, resources: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        流式补充页面信息：同时进行的抓取数不超过 max_workers 的两倍，按完成顺序产出资源
+
+        Args:
+            resources: 资源迭代器
+
+        Yields:
+            补充了页面信息的资源（抓取失败或无需抓取的资源原样产出）
+        """
+        yield from iter_concurrently(self._enrich_one, resources, self.max_workers, accept=self.should_fetch)
+
+    def enrich(self, resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        补充资源列表的页面信息（原地修改，保持原始顺序）
+
+        Args:
+            resources: 资源列表
+
+        Returns:
+            补充了页面信息的资源列表
+        """
+        targets = interleave_by_host([resource for resource in resources if self.should_fetch(resource)])
+        started_at = time.monotonic()
+        self._skipped = 0
+        enriched = sum(1 for resource in self.iter_enrich(targets) if 'text_length' in resource)
+        elapsed = time.monotonic() - started_at
+        logger.info(f"页面抓取完成: {enriched}/{len(targets)} 个页面，"
+                    f"robots.txt 跳过 {self._skipped} 个，耗时 {elapsed:.1f} 秒")
+        return resources
+
+
+def create_page_fetcher(session: requests.Session, fetch_config: Dict[str, Any] = None,
+                        cache_dir: str = None) -> Optional[PageFetcher]:
+    """
+    根据配置创建页面抓取器
+
+    Args:
+        session: 共享的HTTP会话
+        fetch_config: 抓取配置（config.yaml 中的 enrichment 段）
+        cache_dir: robots.txt 持久化缓存目录
+
+    Returns:
+        页面抓取器，未启用时返回 None
+    """
+    fetch_config = fetch_config or {}
+    if not fetch_config.get('enabled', False):
+        return None
+
+    robots_config = fetch_config.get('robots') or {}
+    return PageFetcher(
+        session,
+        max_workers=fetch_config.get('max_workers', 16),
+        max_per_host=fetch_config.get('max_per_host', 2),
+        host_delay=fetch_config.get('host_delay', 1.0),
+        max_bytes=fetch_config.get('max_bytes', 262144),
+        timeout=fetch_config.get('timeout', 15),
+        sources=fetch_config.get('sources'),
+        robots=create_robots_cache(session, cache_dir, robots_config),
+        max_crawl_delay=robots_config.get('max_crawl_delay', 30)
+    )
@@ -0,0 +1,186 @@
+"""
+分类缓存模块 - 以分类输入文本的哈希为键持久化保存资源类型与语言检测结果，分类规则变化时自动失效
+"""
+import os
+import time
+import sqlite3
+import threading
+from typing import Dict, Any, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 单条查询中 IN 子句的最大键数（低于旧版SQLite的变量数上限999）
+_QUERY_BATCH_SIZE = 500
+
+# 缓存的写入缓冲达到该条数时自动写入数据库
+_FLUSH_THRESHOLD = 1000
+
+
+class ParseMemo:
+    """
+    分类结果缓存：缓存键 -> (资源类型, 语言)
+
+    数据库记录创建时的规则版本，打开时版本不一致（类型关键词、URL规则或检测逻辑发生变化）即清空全部条目。
+    写入与访问时间更新先缓冲在内存中，由 flush 批量提交；条目数超过上限时按最近使用时间淘汰。
+    """
+
+    def __init__(self, path: str, version: str, max_entries: int = 200000):
+        """
+        初始化分类缓存
+
+        Args:
+            path: SQLite数据库文件路径
+            version: 分类规则版本（规则内容的哈希）
+            max_entries: 最多保存的条目数，0 表示不限
+        """
+        self.path = path
+        self.version = version
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        self._touched = set()
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS memo (
+                key TEXT PRIMARY KEY,
+                type TEXT NOT NULL,
+                language TEXT NOT NULL,
+                used_at REAL NOT NULL
+            ) WITHOUT ROWID
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_memo_used ON memo (used_at)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS info (name TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+        row = self._conn.execute("SELECT value FROM info WHERE name = 'version'").fetchone()
+        if row is None or row[0] != version:
+            if row is not None:
+                logger.info("分类规则已变化，清空分类缓存")
+            self._conn.execute('DELETE FROM memo')
+            self._conn.execute("INSERT OR REPLACE INTO info (name, value) VALUES ('version', ?)", (version,))
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        读取单个分类结果
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            (资源类型, 语言) 元组，未命中时返回 None
+        """
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Tuple[str, str]]:
+        """
+        批量读取分类结果（每次查询最多500个键）
+
+        Args:
+            keys: 缓存键列表
+
+        Returns:
+            命中的 缓存键 -> (资源类型, 语言)
+        """
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        with self._lock:
+            for key in keys:
+                if key in self._pending:
+                    found[key] = self._pending[key]
+            remaining = [key for key in keys if key not in found]
+            for start in range(0, len(remaining), _QUERY_BATCH_SIZE):
+                batch = remaining[start:start + _QUERY_BATCH_SIZE]
+                placeholders = ', '.join('?' * len(batch))
+                for key, resource_type, language in self._conn.execute(
+                        f'SELECT key, type, language FROM memo WHERE key IN ({placeholders})', batch):
+                    found[key] = (resource_type, language)
+            self._touched.update(found)
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put(self, key: str, classification: Tuple[str, str]):
+        """
+        缓冲写入分类结果，缓冲达到阈值时自动提交
+
+        Args:
+            key: 缓存键
+            classification: (资源类型, 语言) 元组
+        """
+        with self._lock:
+            self._pending[key] = tuple(classification)
+            should_flush = len(self._pending) >= _FLUSH_THRESHOLD
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """提交缓冲的写入与访问时间更新，并淘汰超出上限的条目"""
+        now = time.time()
+        with self._lock:
+            if not self._pending and not self._touched:
+                return
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO memo (key, type, language, used_at) VALUES (?, ?, ?, ?)',
+                ((key, resource_type, language, now) for key, (resource_type, language) in self._pending.items())
+            )
+            self._conn.executemany(
+                'UPDATE memo SET used_at = ? WHERE key = ?',
+                ((now, key) for key in self._touched if key not in self._pending)
+            )
+            self._pending.clear()
+            self._touched.clear()
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """条目数超过上限时淘汰最久未使用的条目（调用方需持有锁）"""
+        if not self.max_entries:
+            return
+        count = self._conn.execute('SELECT COUNT(*) FROM memo').fetchone()[0]
+        if count <= self.max_entries:
+            return
+        # 淘汰到上限的90%，避免每次提交都触发淘汰
+        excess = count - int(self.max_entries * 0.9)
+        self._conn.execute(
+            'DELETE FROM memo WHERE key IN (SELECT key FROM memo ORDER BY used_at LIMIT ?)', (excess,)
+        )
+        logger.debug(f"分类缓存 {self.path} 淘汰 {excess} 个条目")
+
+    def close(self):
+        """提交缓冲内容并关闭数据库连接"""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+def create_parse_memo(cache_dir: str, memo_config: Dict[str, Any] = None,
+                      version: str = '') -> Optional[ParseMemo]:
+    """
+    根据配置创建分类缓存
+
+    Args:
+        cache_dir: 缓存目录
+        memo_config: 缓存配置（parsing.memo 段）
+        version: 分类规则版本（ResourceParser.rules_version）
+
+    Returns:
+        分类缓存，未启用时返回 None
+    """
+    memo_config = memo_config or {}
+    if not cache_dir or not memo_config.get('enabled', True):
+        return None
+    return ParseMemo(
+        os.path.join(cache_dir, 'parse_memo.sqlite3'),
+        version,
+        max_entries=memo_config.get('max_entries', 200000)
+    )
@@ -1,19 +1,86 @@
 """
 数据解析模块 - 负责解析、分类和评分资源
 """
-import re
-from datetime import datetime
-from typing import Dict, Any, List
+import os
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Iterable, Optional, Callable, Tuple
+import numpy as np
+import pandas as pd
 import logging
 
+from matcher import TaxonomyMatcher
+from language import LanguageDetector, SCRIPT_PATTERNS, ENGLISH_WORD_THRESHOLD
+from parse_memo import create_parse_memo
+
 logger = logging.getLogger(__name__)
 
+# 批量解析中可直接交给 pd.to_datetime 的 ISO 8601 时间格式（时区偏移只能出现在时间之后），
+# 其余写法逐行回退到 datetime.fromisoformat，保证与逐行解析结果一致
+_SIMPLE_ISO_PATTERN = r'(?:19|20)\d{2}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?(?:Z|[+-]\d{2}:\d{2})?)?'
+_TZ_SUFFIX_PATTERN = r'(?:Z|[+-]\d{2}:\d{2})$'
+
+# 类型与语言检测逻辑的版本号：修改检测代码（而非规则数据）时递增，使分类缓存失效
+CLASSIFIER_VERSION = 1
+
+# 影响类型与语言检测结果的资源字段（分类缓存键由这些字段计算）
+CLASSIFIER_FIELDS = ('title', 'url', 'final_url', 'description', 'page_title', 'meta_description',
+                     'topics', 'og_type', 'content_type')
+
+
+def _substring_finder(column: pd.Series) -> Callable[[str], np.ndarray]:
+    """
+    创建整列子串检测函数，返回布尔数组
+
+    字符串列由 pyarrow 存储时使用 pandas 的向量化 str.contains；否则 str.contains 同样逐个元素
+    调用Python函数，直接对字符串列表使用 in 运算符开销更小。
+    """
+    if getattr(column.dtype, 'storage', None) == 'pyarrow':
+        return lambda pattern: column.str.contains(pattern, regex=False).to_numpy(dtype=bool)
+    texts = column.tolist()
+    return lambda pattern: np.fromiter((pattern in text for text in texts), dtype=bool, count=len(texts))
+
+
+# 并行解析时每个工作进程持有的解析器（由进程池初始化函数设置一次）
+_worker_parser = None
+
+
+def _init_parse_worker(parser: 'ResourceParser'):
+    """
+    进程池初始化函数：保存主进程传入的解析器，编译好的匹配器在每个工作进程中只传输一次
+
+    以 fork 方式启动时解析器不经过序列化，会继承主进程的分类缓存及其数据库连接；
+    工作进程不使用分类缓存（未命中的资源由主进程写入缓存）。
+    """
+    global _worker_parser
+    parser.memo = None
+    _worker_parser = parser
+
+
+def _parse_chunk(chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """在工作进程中逐条解析一块资源（不经过分类缓存）"""
+    return [_worker_parser._apply_classification(resource, _worker_parser.classify(resource)) for resource in chunk]
+
 
 class ResourceParser:
     """资源解析器类"""
 
-    def __init__(self):
-        """初始化解析器"""
+    def __init__(self, workers: int = 1, chunk_size: int = 500, min_parallel_size: int = 2000,
+                 extra_languages: Iterable[str] = ()):
+        """
+        初始化解析器
+
+        Args:
+            workers: 并行解析的进程数，0 表示使用全部CPU核心，1 表示串行解析
+            chunk_size: 每个任务块包含的资源数
+            min_parallel_size: 资源数少于该值时串行解析（进程启动与数据传输的开销大于收益）
+            extra_languages: 语言检测启用的附加语言标签（ja、ko）
+        """
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.chunk_size = max(1, chunk_size)
+        self.min_parallel_size = min_parallel_size
         # 资源类型关键词映射
         self.type_keywords = {
             'website': [
@@ -29,8 +96,94 @@ class ResourceParser:
             'technical_whitepaper': ['whitepaper', 'white paper', '技术报告', 'report', '研究报告', 'analysis', 'technical paper', 'specification']
         }
 
-        # 语言检测模式
-        self.chinese_pattern = re.compile(r'[\u4e00-\u9fa5]+')
+        # URL特殊规则：(任一模式出现在URL中, 类型, 加分)
+        self.url_type_rules = [
+            (('github.com', 'gitlab.com'), 'code', 3),
+            (('.pdf',), 'book', 2),
+            (('forum', 'stackexchange', 'stackoverflow'), 'forum', 2),
+            (('slideshare', 'lecture'), 'course_notes', 2),
+            (('arxiv.org', 'whitepaper'), 'technical_whitepaper', 2),
+            (('.edu', 'university'), 'course_notes', 1)
+        ]
+
+        # 类型关键词与URL规则编译为同一个多模式匹配自动机，分类时只需扫描一次文本
+        self.type_matcher = TaxonomyMatcher(self.type_keywords, self.url_type_rules)
+
+        # 页面 og:type 对资源类型的提示（类型, 加分）
+        self.og_type_hints = {
+            'article': ('blog', 1),
+            'blog': ('blog', 1),
+            'book': ('book', 2),
+            'books.book': ('book', 2)
+        }
+
+        # 链接校验得到的内容类型对资源类型的提示（类型, 加分）
+        self.content_type_hints = {
+            'application/pdf': ('book', 2),
+            'application/epub+zip': ('book', 2),
+            'application/vnd.ms-powerpoint': ('course_notes', 2),
+            'application/vnd.openxmlformats-officedocument.presentationml.presentation': ('course_notes', 2)
+        }
+
+        # 官方网站（评分加分）
+        self.official_sites = ['nvidia.com', 'cuda.com', 'github.com/nvidia',
+                               'docs.nvidia.com', 'developer.nvidia.com']
+
+        # 各类型的推荐理由
+        self.type_reasons = {
+            'website': "权威在线资源入口",
+            'blog': "实战经验分享",
+            'code': "包含实践代码示例",
+            'forum': "社区讨论活跃",
+            'course_notes': "来自课程笔记或讲座资料",
+            'book': "系统学习的公开书籍",
+            'exam': "用于自测的练习题库",
+            'technical_whitepaper': "深入的技术/白皮书分析"
+        }
+
+        # 语言检测器（单次扫描，结论确定后提前结束）
+        self.language_detector = LanguageDetector(extra_languages)
+
+        # 分类结果缓存（可选，由 create_resource_parser 根据配置设置）
+        self.memo = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """序列化时不包含分类缓存（数据库连接只在主进程中使用）"""
+        state = self.__dict__.copy()
+        state['memo'] = None
+        return state
+
+    def rules_version(self) -> str:
+        """
+        计算分类规则版本：类型关键词、URL规则、页面类型提示、语言检测模式与检测逻辑版本号的哈希
+
+        Returns:
+            版本字符串（SHA-256十六进制摘要）
+        """
+        rules = {
+            'classifier_version': CLASSIFIER_VERSION,
+            'type_keywords': self.type_keywords,
+            'url_type_rules': self.url_type_rules,
+            'og_type_hints': self.og_type_hints,
+            'content_type_hints': self.content_type_hints,
+            'language_rules': self.language_detector.rules
+        }
+        payload = json.dumps(rules, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def memo_key(resource: Dict[str, Any]) -> str:
+        """
+        根据影响分类结果的字段计算分类缓存键
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            缓存键（128位BLAKE2b十六进制摘要）
+        """
+        payload = '\x1f'.join(str(resource.get(field) or '') for field in CLASSIFIER_FIELDS)
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
 
     def detect_resource_type(self, resource: Dict[str, Any]) -> str:
         """
@@ -44,30 +197,29 @@ class ResourceParser:
         """
         title = (resource.get('title') or '').lower()
         url = (resource.get('url') or '').lower()
+        # 链接校验发现重定向时，重定向后的地址一并参与URL规则
+        final_url = (resource.get('final_url') or '').lower()
+        if final_url and final_url != url:
+            url = f"{url} {final_url}"
         description = (resource.get('description') or '').lower()
 
-        # 合并所有文本进行检测
+        # 合并所有文本进行检测（抓取到页面信息或仓库主题时一并参与检测）
         combined_text = f"{title} {url} {description}"
-
-        # 检测每种类型的关键词
-        type_scores = {}
-        for resource_type, keywords in self.type_keywords.items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            type_scores[resource_type] = score
-
-        # 特殊规则
-        if 'github.com' in url or 'gitlab.com' in url:
-            type_scores['code'] += 3
-        if '.pdf' in url:
-            type_scores['book'] += 2
-        if 'forum' in url or 'stackexchange' in url or 'stackoverflow' in url:
-            type_scores['forum'] += 2
-        if 'slideshare' in url or 'lecture' in url:
-            type_scores['course_notes'] += 2
-        if 'arxiv.org' in url or 'whitepaper' in url:
-            type_scores['technical_whitepaper'] += 2
-        if any(domain in url for domain in ['.edu', 'university']):
-            type_scores['course_notes'] += 1
+        page_text = ' '.join(resource.get(field) or '' for field in ('page_title', 'meta_description', 'topics'))
+        if page_text.strip():
+            combined_text = f"{combined_text} {page_text.lower()}"
+
+        # 一次扫描同时统计每种类型的关键词命中与URL特殊规则（URL规则只匹配URL所在区间）
+        url_start = len(title) + 1
+        type_scores, url_hits = self.type_matcher.match(combined_text, url_start, url_start + len(url))
+
+        og_hint = self.og_type_hints.get(resource.get('og_type') or '')
+        if og_hint:
+            type_scores[og_hint[0]] += og_hint[1]
+        content_type_hint = self.content_type_hints.get(resource.get('content_type') or '')
+        # URL 中已有 .pdf 时不重复加分
+        if content_type_hint and not (content_type_hint[0] == 'book' and '.pdf' in url_hits):
+            type_scores[content_type_hint[0]] += content_type_hint[1]
 
         # 返回得分最高的类型
         if max(type_scores.values()) > 0:
@@ -82,28 +234,11 @@ class ResourceParser:
             resource: 资源字典
 
         Returns:
-            语言标识 (zh/en/mixed)
+            语言标识 (zh/en/mixed，启用附加语言时还可能为 ja/ko)
         """
         title = resource.get('title') or ''
         description = resource.get('description') or ''
-        combined_text = f"{title} {description}"
-
-        # 检测中文字符
-        chinese_chars = self.chinese_pattern.findall(combined_text)
-        has_chinese = len(chinese_chars) > 0
-
-        # 检测英文（简单判断）
-        english_words = re.findall(r'[a-zA-Z]+', combined_text)
-        has_english = len(english_words) > 3
-
-        if has_chinese and has_english:
-            return 'mixed'
-        elif has_chinese:
-            return 'zh'
-        elif has_english:
-            return 'en'
-        else:
-            return 'unknown'
+        return self.language_detector.detect(f"{title} {description}")
 
     def calculate_quality_score(self, resource: Dict[str, Any]) -> float:
         """
@@ -117,9 +252,9 @@ class ResourceParser:
         """
         score = 3.0  # 基础分
 
-        # GitHub仓库特殊评分
-        if resource.get('source') == 'GitHub':
-            stars = resource.get('stars', 0)
+        # GitHub仓库特殊评分（其他来源的仓库链接刷新元数据后同样适用）
+        if resource.get('source') == 'GitHub' or resource.get('stars') is not None:
+            stars = resource.get('stars') or 0
             if stars >= 1000:
                 score += 2.0
             elif stars >= 100:
@@ -127,9 +262,14 @@ class ResourceParser:
             elif stars >= 10:
                 score += 0.5
 
+            # 已归档的仓库不再维护，减分且不计更新加分
+            archived = resource.get('archived') is True
+            if archived:
+                score -= 1.0
+
             # 最近更新加分
             updated_at = resource.get('updated_at', '')
-            if updated_at:
+            if updated_at and not archived:
                 try:
                     update_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
                     days_ago = (datetime.now(update_date.tzinfo) - update_date).days
@@ -142,18 +282,32 @@ class ResourceParser:
 
         # 官方网站加分
         url = resource.get('url', '').lower()
-        official_sites = ['nvidia.com', 'cuda.com', 'github.com/nvidia',
-                          'docs.nvidia.com', 'developer.nvidia.com']
-        if any(site in url for site in official_sites):
+        if any(site in url for site in self.official_sites):
             score += 1.0
 
-        # 描述完整度加分
+        # 描述完整度加分（抓取到的页面描述更完整时以其为准）
         description = resource.get('description') or ''
+        meta_description = resource.get('meta_description') or ''
+        if len(meta_description) > len(description):
+            description = meta_description
         if description and len(description) > 100:
             score += 0.3
         if description and len(description) > 200:
             score += 0.2
 
+        # 被多个 (搜索源, 关键词) 命中的资源相关性更高，每多一次命中加0.2分，最多加0.6分
+        hit_count = resource.get('hit_count') or 0
+        if hit_count > 1:
+            score += min(0.2 * (hit_count - 1), 0.6)
+
+        # 页面正文长度：内容充实的页面加分，几乎没有正文的页面减分
+        text_length = resource.get('text_length')
+        if text_length is not None:
+            if text_length >= 3000:
+                score += 0.3
+            elif text_length < 300:
+                score -= 0.3
+
         # 确保分数在1-5范围内
         return min(max(score, 1.0), 5.0)
 
@@ -171,17 +325,7 @@ class ResourceParser:
 
         # 基于类型的推荐
         resource_type = resource.get('type', '')
-        type_reasons = {
-            'website': "权威在线资源入口",
-            'blog': "实战经验分享",
-            'code': "包含实践代码示例",
-            'forum': "社区讨论活跃",
-            'course_notes': "来自课程笔记或讲座资料",
-            'book': "系统学习的公开书籍",
-            'exam': "用于自测的练习题库",
-            'technical_whitepaper': "深入的技术/白皮书分析"
-        }
-        reason = type_reasons.get(resource_type)
+        reason = self.type_reasons.get(resource_type)
         if reason:
             reasons.append(reason)
 
@@ -193,12 +337,17 @@ class ResourceParser:
             reasons.append("优质资源")
 
         # 基于GitHub星标的推荐
-        stars = resource.get('stars', 0)
+        stars = resource.get('stars') or 0
         if stars >= 1000:
             reasons.append(f"社区广泛认可({stars}★)")
         elif stars >= 100:
             reasons.append(f"受欢迎项目({stars}★)")
 
+        # 基于命中次数的推荐
+        hit_count = resource.get('hit_count') or 0
+        if hit_count >= 3:
+            reasons.append(f"多个关键词命中({hit_count}次)")
+
         # 基于更新时间的推荐
         if resource.get('updated_recently'):
             reasons.append("持续更新维护")
@@ -212,46 +361,425 @@ class ResourceParser:
 
         return "；".join(reasons) if reasons else "值得关注的资源"
 
+    def is_updated_recently(self, resource: Dict[str, Any]) -> bool:
+        """
+        检查资源是否在最近90天内更新
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            是否最近更新
+        """
+        updated_at = resource.get('updated_at', '')
+        if updated_at:
+            try:
+                update_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+                days_ago = (datetime.now(update_date.tzinfo) - update_date).days
+                return days_ago < 90
+            except:
+                return False
+        return False
+
+    def rescore_resource(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        重新计算资源的评分、更新状态与推荐理由（保留已有的类型与语言）
+
+        用于增量更新中来源元数据（如星标数、更新时间）发生变化的已有资源。
+
+        Args:
+            resource: 已解析的资源字典（原地修改）
+
+        Returns:
+            更新后的资源字典
+        """
+        resource['quality_score'] = self.calculate_quality_score(resource)
+
+        # 检查是否最近更新
+        resource['updated_recently'] = self.is_updated_recently(resource)
+
+        # 生成推荐理由
+        resource['recommendation'] = self.generate_recommendation(resource)
+
+        return resource
+
+    def parse_resource(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        解析单个资源，添加类型、语言、评分等信息
+
+        启用分类缓存时，分类输入未变化的资源直接复用缓存的类型与语言；
+        评分与推荐理由依赖星标数与当前日期，总是重新计算。
+
+        Args:
+            resource: 原始资源字典（原地修改）
+
+        Returns:
+            解析后的资源字典
+        """
+        if self.memo is None:
+            return self._apply_classification(resource, self.classify(resource))
+
+        key = self.memo_key(resource)
+        classification = self.memo.get(key)
+        if classification is None:
+            classification = self.classify(resource)
+            self.memo.put(key, classification)
+        return self._apply_classification(resource, classification)
+
+    def classify(self, resource: Dict[str, Any]) -> Tuple[str, str]:
+        """
+        检测资源类型与语言
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            (资源类型, 语言) 元组
+        """
+        return self.detect_resource_type(resource), self.detect_language(resource)
+
+    def _apply_classification(self, resource: Dict[str, Any], classification: Tuple[str, str]) -> Dict[str, Any]:
+        """
+        写入类型与语言，并计算评分、更新状态、推荐理由与收集时间
+
+        Args:
+            resource: 资源字典（原地修改）
+            classification: (资源类型, 语言) 元组
+
+        Returns:
+            解析后的资源字典
+        """
+        # 添加解析信息
+        resource['type'], resource['language_detected'] = classification
+
+        # 评分、更新状态与推荐理由
+        self.rescore_resource(resource)
+
+        # 添加收集时间
+        resource['collected_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        return resource
+
     def parse_resources(self, resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         解析资源列表，添加类型、语言、评分等信息
 
+        启用分类缓存时先批量查询缓存，命中的资源只重新计算评分与推荐理由，其余资源完整解析后写入缓存。
+        需要完整解析的资源数达到 min_parallel_size 且 workers 大于1时，按 chunk_size 分块交给进程池
+        并行解析，结果按原始顺序写回原资源字典；进程池不可用时回退到串行解析。
+
         Args:
-            resources: 原始资源列表
+            resources: 原始资源列表（原地修改）
 
         Returns:
             解析后的资源列表
         """
-        parsed_resources = []
+        if self.memo is None:
+            self._parse_uncached(resources)
+        else:
+            keys = [self.memo_key(resource) for resource in resources]
+            cached = self.memo.get_many(keys)
+            misses = []
+            for resource, key in zip(resources, keys):
+                classification = cached.get(key)
+                if classification is None:
+                    misses.append((resource, key))
+                else:
+                    self._apply_classification(resource, classification)
+
+            self._parse_uncached([resource for resource, _ in misses])
+            for resource, key in misses:
+                self.memo.put(key, (resource['type'], resource['language_detected']))
+            self.memo.flush()
+            logger.info(f"分类缓存命中 {len(resources) - len(misses)}/{len(resources)} 个资源")
+
+        logger.info(f"成功解析 {len(resources)} 个资源")
+        return list(resources)
+
+    def _parse_uncached(self, resources: List[Dict[str, Any]]):
+        """
+        不经过分类缓存完整解析资源列表（原地修改），资源较多时使用进程池
 
+        Args:
+            resources: 原始资源列表
+        """
+        if self.workers > 1 and len(resources) >= self.min_parallel_size:
+            try:
+                self._parse_parallel(resources)
+                return
+            except Exception as e:
+                logger.warning(f"并行解析失败，回退到串行解析: {e}")
         for resource in resources:
-            # 添加解析信息
-            resource['type'] = self.detect_resource_type(resource)
-            resource['language_detected'] = self.detect_language(resource)
-            resource['quality_score'] = self.calculate_quality_score(resource)
+            self._apply_classification(resource, self.classify(resource))
 
-            # 检查是否最近更新
-            updated_at = resource.get('updated_at', '')
-            if updated_at:
-                try:
-                    update_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-                    days_ago = (datetime.now(update_date.tzinfo) - update_date).days
-                    resource['updated_recently'] = days_ago < 90
-                except:
-                    resource['updated_recently'] = False
-            else:
-                resource['updated_recently'] = False
+    def flush_memo(self):
+        """提交分类缓存中缓冲的写入（逐条解析结束后调用）"""
+        if self.memo is not None:
+            self.memo.flush()
 
-            # 生成推荐理由
-            resource['recommendation'] = self.generate_recommendation(resource)
+    def _parse_parallel(self, resources: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        使用进程池分块解析资源
 
-            # 添加收集时间
-            resource['collected_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        Args:
+            resources: 原始资源列表（原地修改）
 
-            parsed_resources.append(resource)
+        Returns:
+            解析后的资源列表（与输入为同一批字典对象，顺序不变）
+        """
+        chunks = [resources[start:start + self.chunk_size] for start in range(0, len(resources), self.chunk_size)]
+        workers = min(self.workers, len(chunks))
+        started_at = datetime.now()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_parse_worker, initargs=(self,)) as executor:
+            # map 按提交顺序返回结果
+            for chunk, parsed_chunk in zip(chunks, executor.map(_parse_chunk, chunks)):
+                for resource, parsed in zip(chunk, parsed_chunk):
+                    resource.update(parsed)
+
+        logger.info(f"并行解析: {len(chunks)} 个任务块，{workers} 个进程，"
+                    f"耗时 {(datetime.now() - started_at).total_seconds():.1f} 秒")
+        return resources
+
+    def parse_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        批量解析资源表，结果与对每行调用 parse_resource 一致
 
-        logger.info(f"成功解析 {len(parsed_resources)} 个资源")
-        return parsed_resources
+        类型、语言、评分、更新状态与推荐理由均按列计算：字符串匹配使用向量化字符串操作，
+        分段加分使用 np.select，更新时间只解析一次。缺失值（None / NaN）视为字段不存在。
+
+        Args:
+            df: 资源表（列名为资源字典的英文键）
+
+        Returns:
+            添加了 type、language_detected、quality_score、updated_recently、
+            recommendation、collected_at 列的新资源表
+        """
+        result = df.copy()
+        if result.empty:
+            return result
+
+        result['type'] = self._batch_types(result)
+        result['language_detected'] = self._batch_languages(result)
+        days_ago = self._batch_days_ago(self._column(result, 'updated_at'))
+        result['quality_score'] = self._batch_scores(result, days_ago)
+        result['updated_recently'] = days_ago < 90
+        result['recommendation'] = self._batch_recommendations(result)
+        result['collected_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        logger.info(f"成功批量解析 {len(result)} 个资源")
+        return result
+
+    @staticmethod
+    def _column(df: pd.DataFrame, name: str) -> pd.Series:
+        """读取列（缺失的列视为全部为 None），NaN 统一替换为 None"""
+        if name not in df.columns:
+            return pd.Series([None] * len(df), index=df.index, dtype=object)
+        column = df[name].astype(object)
+        return column.where(column.notna(), None)
+
+    def _text_column(self, df: pd.DataFrame, name: str) -> pd.Series:
+        """读取文本列，缺失值替换为空字符串（对应逐行路径中的 `value or ''`）"""
+        column = self._column(df, name)
+        return column.where(column.astype(bool), '').astype(str)
+
+    def _batch_types(self, df: pd.DataFrame) -> np.ndarray:
+        """按列检测资源类型（与 detect_resource_type 一致）"""
+        title = self._text_column(df, 'title').str.lower()
+        url = self._text_column(df, 'url').str.lower()
+        final_url = self._text_column(df, 'final_url').str.lower()
+        redirected = (final_url != '') & (final_url != url)
+        url = url.where(~redirected, url + ' ' + final_url)
+
+        combined = title + ' ' + url + ' ' + self._text_column(df, 'description').str.lower()
+        page_text = (self._text_column(df, 'page_title') + ' ' + self._text_column(df, 'meta_description')
+                     + ' ' + self._text_column(df, 'topics'))
+        has_page_text = page_text.str.strip() != ''
+        combined = combined.where(~has_page_text, combined + ' ' + page_text.str.lower())
+
+        types = list(self.type_keywords)
+        type_index = {resource_type: index for index, resource_type in enumerate(types)}
+        scores = np.zeros((len(df), len(types)), dtype=np.int64)
+
+        # 每个不同的关键词对整列只扫描一次，命中后为其所属的每个类型加分
+        contains = _substring_finder(combined)
+        keyword_types: Dict[str, List[str]] = {}
+        for resource_type, keywords in self.type_keywords.items():
+            for keyword in keywords:
+                keyword_types.setdefault(keyword, []).append(resource_type)
+        for keyword, keyword_type_list in keyword_types.items():
+            hits = contains(keyword)
+            for resource_type in keyword_type_list:
+                scores[:, type_index[resource_type]] += hits
+
+        # URL特殊规则：规则内任一模式出现在URL中即加分
+        url_contains = _substring_finder(url)
+        pdf_in_url = url_contains('.pdf')
+        for patterns, resource_type, weight in self.url_type_rules:
+            fired = np.zeros(len(df), dtype=bool)
+            for pattern in patterns:
+                fired = fired | url_contains(pattern)
+            scores[:, type_index[resource_type]] += fired * weight
+
+        for column_name, hints in (('og_type', self.og_type_hints), ('content_type', self.content_type_hints)):
+            values = self._text_column(df, column_name)
+            for value, (resource_type, weight) in hints.items():
+                matched = (values == value).to_numpy(dtype=bool)
+                if column_name == 'content_type' and resource_type == 'book':
+                    # URL 中已有 .pdf 时不重复加分
+                    matched = matched & ~pdf_in_url
+                scores[:, type_index[resource_type]] += matched * weight
+
+        # 得分最高的类型（并列时取先定义的类型），全部为0时为 other
+        best = scores.argmax(axis=1)
+        return np.where(scores.max(axis=1) > 0, np.array(types, dtype=object)[best], 'other')
+
+    def _batch_languages(self, df: pd.DataFrame) -> np.ndarray:
+        """按列检测语言（与 detect_language 一致）"""
+        combined = self._text_column(df, 'title') + ' ' + self._text_column(df, 'description')
+        has_chinese = combined.str.contains(SCRIPT_PATTERNS['zh'], regex=True).to_numpy(dtype=bool)
+        has_english = (combined.str.count(SCRIPT_PATTERNS['en']) > ENGLISH_WORD_THRESHOLD).to_numpy(dtype=bool)
+        languages = np.select(
+            [has_chinese & has_english, has_chinese, has_english],
+            ['mixed', 'zh', 'en'],
+            default='unknown'
+        ).astype(object)
+
+        # 附加语言以文本中最先出现的假名或谚文为准（每行只有最先匹配的命名分组非空）
+        extra_scripts = self.language_detector.extra_scripts
+        if extra_scripts:
+            first_match = combined.str.extract(
+                '|'.join(f"(?P<{script}>{SCRIPT_PATTERNS[script]})" for script in extra_scripts)
+            )
+            for script in extra_scripts:
+                languages = np.where(first_match[script].notna().to_numpy(dtype=bool), script, languages)
+        return languages
+
+    def _batch_days_ago(self, updated_at: pd.Series) -> np.ndarray:
+        """
+        计算每行更新时间距今的天数（与逐行路径中的 days_ago 一致）
+
+        带时区的时间与当前UTC时间比较，不带时区的时间与本地当前时间比较；
+        无法解析或为空的行返回 NaN。
+
+        Returns:
+            天数数组（float，NaN 表示无有效更新时间）
+        """
+        days_ago = np.full(len(updated_at), np.nan)
+        is_text = updated_at.map(lambda value: isinstance(value, str) and value != '').to_numpy(dtype=bool)
+        if not is_text.any():
+            return days_ago
+
+        positions = np.flatnonzero(is_text)
+        text = updated_at[is_text].astype(str)
+        simple = text.str.fullmatch(_SIMPLE_ISO_PATTERN).to_numpy(dtype=bool)
+
+        # 常见格式：一次 pd.to_datetime 解析（不带时区的时间按UTC解析，与按UTC表示的本地当前时间相减）
+        parsed_ok = np.zeros(len(text), dtype=bool)
+        if simple.any():
+            simple_text = text[simple]
+            aware = simple_text.str.contains(_TZ_SUFFIX_PATTERN, regex=True).to_numpy(dtype=bool)
+            parsed = pd.to_datetime(simple_text, format='ISO8601', utc=True, errors='coerce')
+            valid = parsed.notna().to_numpy(dtype=bool)
+            now_aware = pd.Timestamp(datetime.now(timezone.utc)).value
+            now_naive = pd.Timestamp(datetime.now()).tz_localize('UTC').value
+            now = np.where(aware, now_aware, now_naive)[valid]
+            parsed_ns = parsed[valid].to_numpy(dtype='datetime64[ns]').astype(np.int64)
+            elapsed = pd.to_timedelta(now - parsed_ns, unit='ns')
+            simple_positions = np.flatnonzero(simple)[valid]
+            days_ago[positions[simple_positions]] = elapsed.days.to_numpy(dtype=float)
+            parsed_ok[simple_positions] = True
+
+        # 其他写法（以及日期不合法的行）逐行解析
+        for position, value in zip(positions[~parsed_ok], text[~parsed_ok]):
+            days = self._days_since(value)
+            if days is not None:
+                days_ago[position] = days
+        return days_ago
+
+    @staticmethod
+    def _days_since(updated_at: str) -> Optional[int]:
+        """按逐行路径的方式计算更新时间距今的天数，无法解析时返回 None"""
+        try:
+            update_date = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
+            return (datetime.now(update_date.tzinfo) - update_date).days
+        except Exception:
+            return None
+
+    def _batch_scores(self, df: pd.DataFrame, days_ago: np.ndarray) -> np.ndarray:
+        """按列计算质量评分（与 calculate_quality_score 一致，加分顺序相同以保证浮点结果相同）"""
+        score = np.full(len(df), 3.0)
+
+        # GitHub仓库特殊评分
+        stars_column = self._column(df, 'stars')
+        has_stars = stars_column.notna().to_numpy(dtype=bool)
+        is_repository = (self._column(df, 'source') == 'GitHub').to_numpy(dtype=bool) | has_stars
+        stars = pd.to_numeric(stars_column, errors='coerce').fillna(0).to_numpy(dtype=float)
+        score += np.where(is_repository, np.select(
+            [stars >= 1000, stars >= 100, stars >= 10], [2.0, 1.5, 0.5], default=0.0
+        ), 0.0)
+
+        archived = self._column(df, 'archived').map(lambda value: value is True or value is np.True_).to_numpy(dtype=bool)
+        score += np.where(is_repository & archived, -1.0, 0.0)
+
+        recent = is_repository & ~archived & ~np.isnan(days_ago)
+        score += np.where(recent, np.select(
+            [days_ago < 30, days_ago < 180], [0.5, 0.3], default=0.0
+        ), 0.0)
+
+        # 官方网站加分
+        url_contains = _substring_finder(self._text_column(df, 'url').str.lower())
+        official = np.zeros(len(df), dtype=bool)
+        for site in self.official_sites:
+            official = official | url_contains(site)
+        score += np.where(official, 1.0, 0.0)
+
+        # 描述完整度加分
+        description_length = self._text_column(df, 'description').str.len().to_numpy()
+        meta_length = self._text_column(df, 'meta_description').str.len().to_numpy()
+        description_length = np.maximum(description_length, meta_length)
+        score += np.where(description_length > 100, 0.3, 0.0)
+        score += np.where(description_length > 200, 0.2, 0.0)
+
+        # 命中次数加分
+        hit_count = pd.to_numeric(self._column(df, 'hit_count'), errors='coerce').fillna(0).to_numpy(dtype=float)
+        score += np.where(hit_count > 1, np.minimum(0.2 * (hit_count - 1), 0.6), 0.0)
+
+        # 页面正文长度
+        text_length = pd.to_numeric(self._column(df, 'text_length'), errors='coerce').to_numpy(dtype=float)
+        score += np.select([text_length >= 3000, text_length < 300], [0.3, -0.3], default=0.0)
+
+        return np.clip(score, 1.0, 5.0)
+
+    def _batch_recommendations(self, df: pd.DataFrame) -> pd.Series:
+        """按列生成推荐理由（与 generate_recommendation 一致）"""
+        score = df['quality_score'].to_numpy(dtype=float)
+        # 混合来源的表中 stars / hit_count 含缺失值时为 float64 列，按整数格式化以与逐行路径一致（100★ 而非 100.0★）
+        stars_column = pd.to_numeric(self._column(df, 'stars'), errors='coerce').fillna(0)
+        stars = stars_column.to_numpy(dtype=float)
+        star_text = stars_column.astype(np.int64).astype(str)
+        hit_column = pd.to_numeric(self._column(df, 'hit_count'), errors='coerce').fillna(0)
+        hit_count = hit_column.to_numpy(dtype=float)
+        hit_text = hit_column.astype(np.int64).astype(str)
+        language = df['language_detected']
+
+        parts = [
+            df['type'].map(self.type_reasons).fillna(''),
+            pd.Series(np.select([score >= 4.5, score >= 4.0], ["高质量资源", "优质资源"], default=''), index=df.index),
+            pd.Series(np.select(
+                [stars >= 1000, stars >= 100],
+                ["社区广泛认可(" + star_text + "★)", "受欢迎项目(" + star_text + "★)"],
+                default=''
+            ), index=df.index),
+            ("多个关键词命中(" + hit_text + "次)").where(hit_count >= 3, ''),
+            pd.Series(np.where(df['updated_recently'].to_numpy(dtype=bool), "持续更新维护", ''), index=df.index),
+            language.map({'zh': "中文友好", 'mixed': "中英双语"}).fillna('')
+        ]
+
+        recommendation = parts[0]
+        for part in parts[1:]:
+            joined = recommendation + "；" + part
+            recommendation = joined.where((recommendation != '') & (part != ''), recommendation + part)
+        return recommendation.where(recommendation != '', "值得关注的资源")
 
     def categorize_resources(self, resources: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -310,6 +838,28 @@ class ResourceParser:
         return sorted_resources[:top_n]
 
 
+def create_resource_parser(parse_config: Dict[str, Any] = None, cache_dir: str = None) -> ResourceParser:
+    """
+    根据配置创建资源解析器
+
+    Args:
+        parse_config: 解析配置（config.yaml 中的 parsing 段）
+        cache_dir: 分类缓存目录，为空时不使用分类缓存
+
+    Returns:
+        资源解析器
+    """
+    parse_config = parse_config or {}
+    parser = ResourceParser(
+        workers=parse_config.get('workers', 1),
+        chunk_size=parse_config.get('chunk_size', 500),
+        min_parallel_size=parse_config.get('min_parallel_size', 2000),
+        extra_languages=parse_config.get('extra_languages') or ()
+    )
+    parser.memo = create_parse_memo(cache_dir, parse_config.get('memo'), parser.rules_version())
+    return parser
+
+
 # 测试代码
 if __name__ == "__main__":
     parser = ResourceParser()
@@ -0,0 +1,136 @@
+"""
+来源记录模块 - 以位集记录每个资源被哪些 (搜索源, 关键词) 命中，导出时展开为拼接文本
+"""
+from typing import Dict, Any, List, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 导出列中各命中项之间的分隔符，以及搜索源与关键词之间的分隔符
+ITEM_SEPARATOR = ' | '
+SOURCE_SEPARATOR = ':'
+
+
+class ProvenanceTable:
+    """
+    (搜索源, 关键词) 编号表
+
+    每个 (搜索源, 关键词) 在表中分配一个编号，资源的 provenance 字段为整数位集，
+    第 i 位为 1 表示被第 i 个 (搜索源, 关键词) 命中。重复命中只需按位或，不复制关键词字符串。
+    编号只在本次运行内有效，导出时展开为 matched_keywords（拼接文本）与 hit_count（命中数）。
+    """
+
+    def __init__(self):
+        """初始化编号表"""
+        self._pairs: List[Tuple[str, str]] = []
+        self._index: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._pairs)
+
+    def bit(self, source: str, keyword: str) -> int:
+        """
+        获取 (搜索源, 关键词) 对应的位（首次出现时分配编号）
+
+        Args:
+            source: 搜索源名称
+            keyword: 关键词
+
+        Returns:
+            只有该位为 1 的整数
+        """
+        pair = (source or '', keyword or '')
+        index = self._index.get(pair)
+        if index is None:
+            index = len(self._pairs)
+            self._pairs.append(pair)
+            self._index[pair] = index
+        return 1 << index
+
+    def decode(self, bits: int) -> List[Tuple[str, str]]:
+        """
+        将位集展开为 (搜索源, 关键词) 列表（按编号顺序）
+
+        Args:
+            bits: 位集
+
+        Returns:
+            (搜索源, 关键词) 列表
+        """
+        pairs = []
+        while bits:
+            lowest = bits & -bits
+            pairs.append(self._pairs[lowest.bit_length() - 1])
+            bits ^= lowest
+        return pairs
+
+    def format(self, bits: int) -> str:
+        """
+        将位集格式化为导出列文本，如 "GitHub:flash attention | DuckDuckGo:cuda教程"
+
+        Args:
+            bits: 位集
+
+        Returns:
+            拼接后的文本
+        """
+        return ITEM_SEPARATOR.join(f"{source}{SOURCE_SEPARATOR}{keyword}" for source, keyword in self.decode(bits))
+
+    def parse(self, text: str) -> int:
+        """
+        将导出列文本解析为位集（用于增量更新时合并已有资源的来源记录）
+
+        Args:
+            text: format 生成的文本
+
+        Returns:
+            位集
+        """
+        bits = 0
+        for item in (text or '').split(ITEM_SEPARATOR):
+            source, separator, keyword = item.strip().partition(SOURCE_SEPARATOR)
+            if separator and keyword:
+                bits |= self.bit(source, keyword)
+        return bits
+
+    def mark(self, resource: Dict[str, Any]) -> int:
+        """
+        用资源自身的 source / keyword 字段初始化其位集
+
+        Args:
+            resource: 资源字典（原地修改）
+
+        Returns:
+            资源的位集
+        """
+        resource['provenance'] = resource.get('provenance', 0) | self.bit(resource.get('source'), resource.get('keyword'))
+        return resource['provenance']
+
+    def annotate(self, resource: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        根据位集写入导出字段 matched_keywords 与 hit_count
+
+        Args:
+            resource: 资源字典（原地修改）
+
+        Returns:
+            资源字典
+        """
+        bits = resource.get('provenance')
+        if bits:
+            resource['matched_keywords'] = self.format(bits)
+            resource['hit_count'] = bits.bit_count()
+        return resource
+
+
+def merge_provenance(target: Dict[str, Any], other: Dict[str, Any]):
+    """
+    将 other 的位集合并到 target（同一资源被多次命中时使用）
+
+    Args:
+        target: 保留的资源字典（原地修改）
+        other: 被合并的资源字典
+    """
+    bits = other.get('provenance')
+    if bits:
+        target['provenance'] = target.get('provenance', 0) | bits
@@ -0,0 +1,189 @@
+"""
+速率限制模块 - 为每个搜索源提供令牌桶限流，并根据API响应头动态调整速率
+"""
+import time
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Any, Mapping, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """令牌桶限流器（线程安全）"""
+
+    def __init__(self, name: str, rate: float, burst: int = 1, max_rate: Optional[float] = None):
+        """
+        初始化令牌桶
+
+        Args:
+            name: 限流器名称（通常为搜索源名称）
+            rate: 平均请求速率（次/秒）
+            burst: 桶容量，即允许的突发请求数
+            max_rate: 根据响应头调整速率时的上限（次/秒），None 表示不设上限
+        """
+        self.name = name
+        self.base_rate = max(rate, 1e-6)
+        self.rate = self.base_rate
+        self.burst = max(int(burst), 1)
+        self.max_rate = max_rate
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        """按经过的时间补充令牌（调用方需持有锁）"""
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated_at = now
+
+    def acquire(self) -> float:
+        """
+        获取一个令牌，必要时阻塞等待
+
+        令牌可以被预支（余额为负），等待时间按预支额度计算，
+        因此多个线程并发获取时会依次排队，而不会同时放行。
+
+        Returns:
+            实际等待的秒数
+        """
+        waited = 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= 1
+            wait = max(-self._tokens / self.rate, self._paused_until - now, 0.0)
+
+        while wait > 0:
+            time.sleep(wait)
+            waited += wait
+            # 等待期间可能收到 Retry-After 等暂停指令，需要再次检查
+            with self._lock:
+                wait = max(self._paused_until - time.monotonic(), 0.0)
+
+        if waited > 0:
+            logger.debug(f"[{self.name}] 限流等待 {waited:.2f} 秒")
+        return waited
+
+    def pause(self, seconds: float):
+        """
+        暂停发放令牌
+
+        Args:
+            seconds: 暂停时长（秒）
+        """
+        if seconds <= 0:
+            return
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        logger.warning(f"[{self.name}] 触发速率限制，暂停 {seconds:.1f} 秒")
+
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """
+        根据响应头调整限流状态
+
+        支持 Retry-After（秒数或HTTP日期）以及 GitHub 的
+        X-RateLimit-Remaining / X-RateLimit-Reset 响应头：
+        额度耗尽时暂停到重置时间，否则把速率调整为剩余额度在重置前均匀使用的速率。
+
+        Args:
+            headers: HTTP响应头
+        """
+        if not headers:
+            return
+
+        retry_after = _parse_retry_after(headers.get('Retry-After'))
+        if retry_after is not None:
+            self.pause(retry_after)
+
+        remaining = _parse_int(headers.get('X-RateLimit-Remaining'))
+        reset_at = _parse_int(headers.get('X-RateLimit-Reset'))
+        if remaining is None or reset_at is None:
+            return
+
+        seconds_to_reset = max(reset_at - time.time(), 1.0)
+        if remaining <= 0:
+            self.pause(seconds_to_reset + 1)
+            return
+
+        rate = remaining / seconds_to_reset
+        if self.max_rate:
+            rate = min(rate, self.max_rate)
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            # 桶内令牌不能超过服务端剩余额度
+            self._tokens = min(self._tokens, remaining)
+        logger.debug(f"[{self.name}] 剩余额度 {remaining}，{seconds_to_reset:.0f} 秒后重置，速率调整为 {rate:.3f} 次/秒")
+
+
+def _parse_int(value: Optional[str]) -> Optional[int]:
+    """解析整数响应头，无效时返回 None"""
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析 Retry-After 响应头
+
+    Args:
+        value: 响应头取值（秒数或HTTP日期）
+
+    Returns:
+        需要等待的秒数，无法解析时返回 None
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_rate_limited(status_code: int, headers: Mapping[str, str]) -> bool:
+    """
+    判断响应是否因速率限制被拒绝
+
+    Args:
+        status_code: HTTP状态码
+        headers: HTTP响应头
+
+    Returns:
+        是否为限流响应
+    """
+    if status_code == 429:
+        return True
+    return status_code == 403 and (
+        'Retry-After' in headers or headers.get('X-RateLimit-Remaining') == '0'
+    )
+
+
+def create_rate_limiter(name: str, source_config: Dict[str, Any], default_rate: float) -> TokenBucket:
+    """
+    根据搜索源配置创建限流器
+
+    Args:
+        name: 搜索源名称
+        source_config: 搜索源配置（读取其中的 rate_limit 段）
+        default_rate: 未配置 requests_per_second 时使用的默认速率（次/秒）
+
+    Returns:
+        令牌桶限流器
+    """
+    rate_config = source_config.get('rate_limit') or {}
+    return TokenBucket(
+        name=name,
+        rate=float(rate_config.get('requests_per_second') or default_rate),
+        burst=int(rate_config.get('burst', 1)),
+        max_rate=rate_config.get('max_requests_per_second')
+    )
@@ -0,0 +1,197 @@
+"""
+仓库元数据刷新模块 - 从 github.com 链接解析仓库，按优先级批量刷新星标数、更新时间、主题、许可证、归档状态与README大小
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Iterable, Iterator, Callable, Optional, Tuple
+import logging
+
+from github_graphql import parse_repository_url
+
+logger = logging.getLogger(__name__)
+
+# 元数据刷新写入资源的字段
+METADATA_FIELDS = ('stars', 'updated_at', 'topics', 'license', 'archived', 'readme_size', 'language')
+
+# GraphQL 每次请求最多查询的仓库数
+MAX_BATCH_SIZE = 100
+
+
+class RepoMetadataRefresher:
+    """
+    仓库元数据刷新器
+
+    每次GraphQL请求通过别名合并最多100个仓库；每次运行的请求数受 max_requests 限制，
+    额度优先分配给先验评分最高的候选资源。最近刷新过的资源不重复刷新。
+    """
+
+    def __init__(self, fetch: Callable[[List[Tuple[str, str]]], Dict[Tuple[str, str], Dict[str, Any]]],
+                 batch_size: int = 100, max_requests: int = 10, refresh_after_hours: float = 72):
+        """
+        初始化刷新器
+
+        Args:
+            fetch: 批量获取元数据的函数，接收 (所有者, 仓库名) 列表，返回 (所有者, 仓库名) -> 元数据字段
+            batch_size: 每次请求查询的仓库数（上限100）
+            max_requests: 每次运行最多发送的请求数，0 表示不限
+            refresh_after_hours: 距上次刷新超过该时长（小时）的资源才会再次刷新
+        """
+        self.fetch = fetch
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_requests = max_requests
+        self.refresh_after = timedelta(hours=refresh_after_hours)
+        self._requests = 0
+
+    def is_candidate(self, resource: Dict[str, Any]) -> bool:
+        """
+        判断资源是否需要刷新：链接为 github.com 仓库且未在有效期内刷新过
+
+        Args:
+            resource: 资源字典
+
+        Returns:
+            是否需要刷新
+        """
+        if parse_repository_url(resource.get('url') or '') is None:
+            return False
+        refreshed_at = resource.get('metadata_refreshed_at')
+        if not refreshed_at:
+            return True
+        try:
+            return datetime.now() - datetime.strptime(str(refreshed_at), '%Y-%m-%d %H:%M:%S') >= self.refresh_after
+        except ValueError:
+            return True
+
+    def _budget_left(self) -> bool:
+        """本次运行是否还有请求额度"""
+        return not self.max_requests or self._requests < self.max_requests
+
+    def _refresh_batch(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        刷新一批资源（原地修改）
+
+        同一仓库的多个链接（如仓库主页与其子目录）只查询一次。
+
+        Returns:
+            成功刷新的资源列表
+        """
+        by_repository: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        for resource in batch:
+            owner, name = parse_repository_url(resource['url'])
+            # GitHub 的仓库名不区分大小写
+            by_repository.setdefault((owner.lower(), name.lower()), []).append(resource)
+
+        self._requests += 1
+        metadata = self.fetch(list(by_repository))
+        refreshed_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+        refreshed = []
+        for repository, resources in by_repository.items():
+            fields = metadata.get(repository)
+            if fields is None:
+                continue
+            for resource in resources:
+                resource.update((key, value) for key, value in fields.items() if value not in (None, ''))
+                resource['metadata_refreshed_at'] = refreshed_at
+                refreshed.append(resource)
+        return refreshed
+
+    def _batches(self, candidates: List[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
+        """按去重后的仓库数切分批次（同一仓库的链接放在同一批）"""
+        batch, repositories = [], set()
+        for resource in candidates:
+            owner, name = parse_repository_url(resource['url'])
+            repository = (owner.lower(), name.lower())
+            if repository not in repositories and len(repositories) >= self.batch_size:
+                yield batch
+                batch, repositories = [], set()
+            batch.append(resource)
+            repositories.add(repository)
+        if batch:
+            yield batch
+
+    def refresh(self, resources: List[Dict[str, Any]],
+                priority: Callable[[Dict[str, Any]], Any] = None) -> List[Dict[str, Any]]:
+        """
+        刷新资源列表中仓库链接的元数据（原地修改）
+
+        Args:
+            resources: 资源列表
+            priority: 候选资源的优先级函数（返回可比较的值），额度不足时优先级高的资源优先刷新
+
+        Returns:
+            成功刷新的资源列表
+        """
+        started_at = time.monotonic()
+        candidates = [resource for resource in resources if self.is_candidate(resource)]
+        if priority is not None:
+            candidates.sort(key=priority, reverse=True)
+
+        refreshed = []
+        for batch in self._batches(candidates):
+            if not self._budget_left():
+                break
+            refreshed.extend(self._refresh_batch(batch))
+
+        if candidates:
+            logger.info(f"仓库元数据刷新完成: {len(candidates)} 个候选，刷新 {len(refreshed)} 个，"
+                        f"请求 {self._requests} 次，耗时 {time.monotonic() - started_at:.1f} 秒")
+        return refreshed
+
+    def iter_refresh(self, resources: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        流式刷新：缓存候选资源直到凑满一批再请求，其余资源直接产出
+
+        流式模式下无法全局排序，额度按到达顺序使用。
+
+        Args:
+            resources: 资源迭代器
+
+        Yields:
+            资源（候选资源在所在批次刷新后产出）
+        """
+        pending, repositories = [], set()
+        for resource in resources:
+            if not self._budget_left() or not self.is_candidate(resource):
+                yield resource
+                continue
+            owner, name = parse_repository_url(resource['url'])
+            repositories.add((owner.lower(), name.lower()))
+            pending.append(resource)
+            if len(repositories) >= self.batch_size:
+                self._refresh_batch(pending)
+                yield from pending
+                pending, repositories = [], set()
+
+        if pending:
+            if self._budget_left():
+                self._refresh_batch(pending)
+            yield from pending
+
+
+def create_repo_metadata_refresher(fetch: Callable[[List[Tuple[str, str]]], Dict[Tuple[str, str], Dict[str, Any]]],
+                                   refresh_config: Dict[str, Any] = None,
+                                   has_token: bool = True) -> Optional[RepoMetadataRefresher]:
+    """
+    根据配置创建仓库元数据刷新器
+
+    Args:
+        fetch: 批量获取元数据的函数（ResourceCollector.fetch_repository_metadata）
+        refresh_config: 刷新配置（search.sources.github.metadata_refresh 段）
+        has_token: 是否配置了GitHub访问令牌（GraphQL API 需要令牌）
+
+    Returns:
+        仓库元数据刷新器，未启用或没有令牌时返回 None
+    """
+    refresh_config = refresh_config or {}
+    if not refresh_config.get('enabled', True):
+        return None
+    if not has_token:
+        logger.info("未配置 GitHub 访问令牌，跳过仓库元数据刷新")
+        return None
+    return RepoMetadataRefresher(
+        fetch,
+        batch_size=refresh_config.get('batch_size', 100),
+        max_requests=refresh_config.get('max_requests', 10),
+        refresh_after_hours=refresh_config.get('refresh_after_hours', 72)
+    )
@@ -0,0 +1,173 @@
+"""
+robots.txt模块 - 按主机缓存 robots.txt 规则（内存 + 磁盘持久化），判断URL是否允许抓取并读取 Crawl-delay
+"""
+import os
+import time
+import threading
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+from typing import Dict, Any, Optional
+import requests
+import logging
+
+from cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+
+class RobotsCache:
+    """
+    robots.txt 缓存
+
+    每个主机的 robots.txt 只请求一次：解析结果保存在内存中，原始内容写入磁盘缓存并在 TTL 内跨运行复用。
+    按 RFC 9309 处理异常状态：4xx 视为没有限制，5xx 或网络错误视为禁止抓取（仅在本次运行内缓存）。
+    """
+
+    def __init__(self, session: requests.Session, store: DiskCache = None, ttl_seconds: float = 86400,
+                 timeout: float = 10):
+        """
+        初始化 robots.txt 缓存
+
+        Args:
+            session: 共享的HTTP会话
+            store: 持久化磁盘缓存，为 None 时只在内存中缓存
+            ttl_seconds: 磁盘缓存有效期（秒）
+            timeout: 请求 robots.txt 的超时时间（秒）
+        """
+        self.session = session
+        self.store = store
+        self.ttl = ttl_seconds
+        # 匹配 robots.txt 规则使用会话实际发送的 User-Agent（advanced.user_agent），
+        # 规则按其首个产品标识（第一个 / 之前的部分）匹配，未单独配置规则时使用 * 规则
+        self.user_agent = session.headers.get('User-Agent') or '*'
+        self.timeout = timeout
+        self._parsers: Dict[str, RobotFileParser] = {}
+        self._lock = threading.Lock()
+        self._host_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def robots_url(url: str) -> Optional[str]:
+        """
+        获取URL所在站点的 robots.txt 地址
+
+        Args:
+            url: 页面地址
+
+        Returns:
+            robots.txt 地址，URL无效时返回 None
+        """
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.netloc:
+            return None
+        return f"{parts.scheme}://{parts.netloc.lower()}/robots.txt"
+
+    def _get_parser(self, robots_url: str) -> RobotFileParser:
+        """获取站点的规则解析器，同一站点并发请求时只有一个线程真正下载 robots.txt"""
+        parser = self._parsers.get(robots_url)
+        if parser is not None:
+            return parser
+
+        with self._lock:
+            host_lock = self._host_locks.setdefault(robots_url, threading.Lock())
+        with host_lock:
+            parser = self._parsers.get(robots_url)
+            if parser is None:
+                parser = self._load(robots_url)
+                self._parsers[robots_url] = parser
+        return parser
+
+    def _load(self, robots_url: str) -> RobotFileParser:
+        """从磁盘缓存或网络加载 robots.txt"""
+        parser = RobotFileParser(robots_url)
+
+        if self.store is not None:
+            entry = self.store.get(robots_url)
+            if entry and time.time() - entry.stored_at < self.ttl:
+                self._apply(parser, entry.meta.get('status', 200), entry.value)
+                return parser
+
+        try:
+            response = self.session.get(robots_url, timeout=self.timeout)
+            status, content = response.status_code, response.content
+        except requests.RequestException as e:
+            logger.debug(f"robots.txt 请求失败 ({robots_url}): {e}")
+            parser.disallow_all = True
+            return parser
+
+        self._apply(parser, status, content)
+        # 服务端错误不写入磁盘缓存，下次运行重新请求
+        if self.store is not None and status < 500:
+            self.store.set(robots_url, content if status == 200 else b'', {'status': status})
+        return parser
+
+    @staticmethod
+    def _apply(parser: RobotFileParser, status: int, content: bytes):
+        """根据 robots.txt 的响应状态与内容设置解析器"""
+        if status >= 500:
+            parser.disallow_all = True
+        elif status >= 400:
+            parser.allow_all = True
+        else:
+            parser.parse(content.decode('utf-8', errors='replace').splitlines())
+        parser.modified()
+
+    def allowed(self, url: str) -> bool:
+        """
+        判断URL是否允许抓取
+
+        Args:
+            url: 页面地址
+
+        Returns:
+            是否允许抓取
+        """
+        robots_url = self.robots_url(url)
+        if robots_url is None:
+            return False
+        return self._get_parser(robots_url).can_fetch(self.user_agent, url)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """
+        读取URL所在站点声明的 Crawl-delay
+
+        Args:
+            url: 页面地址
+
+        Returns:
+            抓取间隔（秒），未声明时返回 None
+        """
+        robots_url = self.robots_url(url)
+        if robots_url is None:
+            return None
+        delay = self._get_parser(robots_url).crawl_delay(self.user_agent)
+        return float(delay) if delay is not None else None
+
+
+def create_robots_cache(session: requests.Session, cache_dir: str = None,
+                        robots_config: Dict[str, Any] = None) -> Optional[RobotsCache]:
+    """
+    根据配置创建 robots.txt 缓存
+
+    Args:
+        session: 共享的HTTP会话
+        cache_dir: 缓存目录，为 None 时只在内存中缓存
+        robots_config: robots 配置（enrichment.robots 段）
+
+    Returns:
+        robots.txt 缓存，未启用时返回 None
+    """
+    robots_config = robots_config or {}
+    if not robots_config.get('enabled', True):
+        return None
+    if robots_config.get('user_agent'):
+        logger.warning("enrichment.robots.user_agent 已不再使用，robots.txt 规则按 advanced.user_agent 匹配")
+
+    store = None
+    if cache_dir:
+        store = DiskCache(os.path.join(cache_dir, 'robots_cache.sqlite3'), max_size_mb=robots_config.get('max_size_mb', 20))
+    return RobotsCache(
+        session,
+        store,
+        ttl_seconds=robots_config.get('ttl_seconds', 86400),
+        timeout=robots_config.get('timeout', 10)
+    )
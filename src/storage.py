@@ -2,11 +2,14 @@
 数据存储模块 - 负责将收集的资源保存到CSV和Excel文件
 """
 import os
+import csv
 import pandas as pd
 from typing import List, Dict, Any
 from datetime import datetime
 import logging
 
+from url_utils import ensure_url_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -26,11 +29,47 @@ class ResourceStorage:
         'language': '编程语言',
         'updated_at': '更新时间',
         'collected_at': '收集时间',
-        'keyword': '搜索关键词'
+        'keyword': '搜索关键词',
+        'matched_keywords': '命中关键词',
+        'hit_count': '命中次数',
+        'alternate_urls': '其他来源链接',
+        'page_title': '页面标题',
+        'meta_description': '页面描述',
+        'og_type': '页面类型',
+        'canonical_url': '规范链接',
+        'text_length': '正文长度',
+        'http_status': '状态码',
+        'final_url': '最终链接',
+        'content_type': '内容类型',
+        'content_length': '内容长度',
+        'alive': '链接有效',
+        'topics': '主题标签',
+        'license': '许可证',
+        'archived': '已归档',
+        'readme_size': 'README大小',
+        'metadata_refreshed_at': '元数据刷新时间'
     }
 
     REVERSE_COLUMN_MAPPING = {v: k for k, v in COLUMN_MAPPING.items()}
 
+    # 来源元数据字段，增量更新时这些字段变化的已有资源需要重新评分
+    SOURCE_METADATA_FIELDS = ('stars', 'updated_at')
+
+    # 导出后需要恢复为整数的字段
+    INTEGER_FIELDS = ('stars', 'hit_count', 'text_length', 'http_status', 'content_length', 'readme_size')
+
+    # CSV文件的列顺序
+    CSV_COLUMNS = [
+        'title', 'url', 'type', 'language_detected', 'source',
+        'quality_score', 'recommendation', 'description',
+        'stars', 'language', 'updated_at', 'collected_at', 'keyword',
+        'matched_keywords', 'hit_count',
+        'alternate_urls', 'page_title', 'meta_description', 'og_type',
+        'canonical_url', 'text_length', 'http_status', 'final_url',
+        'content_type', 'content_length', 'alive', 'topics', 'license',
+        'archived', 'readme_size', 'metadata_refreshed_at'
+    ]
+
     def __init__(self, output_dir: str = "resources"):
         """
         初始化存储管理器
@@ -67,15 +106,8 @@ class ResourceStorage:
         # 转换为DataFrame
         df = pd.DataFrame(resources)
 
-        # 选择和重排列列
-        columns_order = [
-            'title', 'url', 'type', 'language_detected', 'source',
-            'quality_score', 'recommendation', 'description',
-            'stars', 'language', 'updated_at', 'collected_at', 'keyword'
-        ]
-
-        # 只保留存在的列
-        existing_columns = [col for col in columns_order if col in df.columns]
+        # 选择和重排列列，只保留存在的列
+        existing_columns = [col for col in self.CSV_COLUMNS if col in df.columns]
         df = df[existing_columns]
 
         # 保存到CSV
@@ -84,6 +116,24 @@ class ResourceStorage:
 
         return filepath
 
+    def open_csv_stream(self, filename: str = None) -> 'CSVStreamWriter':
+        """
+        打开可逐条追加资源的CSV写入器（用于流式收集）
+
+        Args:
+            filename: 文件名（可选）
+
+        Returns:
+            CSV流式写入器，需调用 close() 或配合 with 语句使用
+        """
+        if not filename:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            filename = f"cuda_hpc_resources_{timestamp}.csv"
+
+        filepath = os.path.join(self.output_dir, filename)
+        logger.info(f"流式写入CSV文件: {filepath}")
+        return CSVStreamWriter(filepath, self.CSV_COLUMNS)
+
     def save_to_excel(self, resources: List[Dict[str, Any]],
                       categorized: Dict[str, List[Dict[str, Any]]] = None,
                       filename: str = None) -> str:
@@ -238,6 +288,10 @@ class ResourceStorage:
         stats['中文资源数'] = lang_counts.get('zh', 0)
         stats['英文资源数'] = lang_counts.get('en', 0)
         stats['双语资源数'] = lang_counts.get('mixed', 0)
+        # 附加语言标签（parsing.extra_languages 启用时才会出现）
+        for language, label in (('ja', '日文资源数'), ('ko', '韩文资源数')):
+            if lang_counts.get(language):
+                stats[label] = lang_counts[language]
 
         # 按来源统计
         source_counts = {}
@@ -285,6 +339,12 @@ class ResourceStorage:
 
             df = self._normalize_dataframe_columns(df)
 
+            # 星标数等整数字段恢复为整数，空单元格恢复为 None（而不是 NaN）
+            for field in self.INTEGER_FIELDS:
+                if field in df.columns:
+                    df[field] = pd.to_numeric(df[field], errors='coerce').round().astype('Int64')
+            df = df.astype(object).where(pd.notna(df), None)
+
             # 转换回字典列表
             resources = df.to_dict('records')
             logger.info(f"从 {filepath} 加载了 {len(resources)} 个资源")
@@ -294,6 +354,52 @@ class ResourceStorage:
             logger.error(f"加载文件失败: {e}")
             return []
 
+    @staticmethod
+    def build_url_index(resources: List[Dict[str, Any]]) -> Dict[int, int]:
+        """
+        构建URL键到资源下标的索引（用于增量更新）
+
+        Args:
+            resources: 资源列表
+
+        Returns:
+            规范化URL键（resource['url_key']）-> 资源在列表中的下标
+        """
+        index = {}
+        for position, resource in enumerate(resources):
+            key = ensure_url_key(resource)
+            if key is not None and key not in index:
+                index[key] = position
+        return index
+
+    @classmethod
+    def source_metadata_changed(cls, existing: Dict[str, Any], new: Dict[str, Any]) -> bool:
+        """
+        判断来源元数据（星标数、更新时间）是否发生变化
+
+        Args:
+            existing: 已有资源
+            new: 新收集的同一资源
+
+        Returns:
+            是否需要重新评分
+        """
+        for field in cls.SOURCE_METADATA_FIELDS:
+            new_value = new.get(field)
+            if new_value in (None, ''):
+                continue
+            old_value = existing.get(field)
+            if field == 'stars':
+                try:
+                    if old_value is not None and int(old_value) == int(new_value):
+                        continue
+                except (TypeError, ValueError):
+                    pass
+            elif str(old_value) == str(new_value):
+                continue
+            return True
+        return False
+
     def merge_resources(self, existing: List[Dict[str, Any]],
                         new: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -306,24 +412,68 @@ class ResourceStorage:
         Returns:
             合并后的资源列表
         """
-        # 使用URL作为唯一标识
-        existing_urls = {r.get('url', '') for r in existing}
+        # 使用规范化URL键作为唯一标识
+        existing_keys = {ensure_url_key(r) for r in existing}
 
         # 添加新资源
         merged = existing.copy()
         added_count = 0
 
         for resource in new:
-            url = resource.get('url', '')
-            if url and url not in existing_urls:
+            key = ensure_url_key(resource)
+            if key is not None and key not in existing_keys:
                 merged.append(resource)
-                existing_urls.add(url)
+                existing_keys.add(key)
                 added_count += 1
 
         logger.info(f"合并资源: 已有{len(existing)}个，新增{added_count}个，总计{len(merged)}个")
         return merged
 
 
+class CSVStreamWriter:
+    """CSV流式写入器：资源逐条追加写入并定期刷新到磁盘，列与 save_to_csv 保持一致"""
+
+    def __init__(self, filepath: str, columns: List[str], flush_every: int = 20):
+        """
+        初始化写入器并写入表头
+
+        Args:
+            filepath: 文件路径
+            columns: 列顺序
+            flush_every: 每写入多少条资源刷新一次文件
+        """
+        self.filepath = filepath
+        self.count = 0
+        self.flush_every = max(1, flush_every)
+        self._file = open(filepath, 'w', newline='', encoding='utf-8-sig')
+        self._writer = csv.DictWriter(self._file, fieldnames=columns, extrasaction='ignore')
+        self._writer.writeheader()
+
+    def write(self, resource: Dict[str, Any]):
+        """
+        追加写入一个资源
+
+        Args:
+            resource: 资源字典
+        """
+        self._writer.writerow(resource)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._file.flush()
+
+    def close(self):
+        """刷新并关闭文件"""
+        if not self._file.closed:
+            self._file.close()
+            logger.info(f"保存CSV文件: {self.filepath}（{self.count} 条）")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
 # 测试代码
 if __name__ == "__main__":
     storage = ResourceStorage()
@@ -0,0 +1,116 @@
+"""
+URL工具模块 - URL规范化与用于去重的紧凑URL键
+"""
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from typing import Dict, Any
+
+# 不影响页面内容的跟踪参数
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'msclkid', 'dclid', 'yclid', 'igshid',
+    'mc_cid', 'mc_eid', 'ref_src', 'spm', 'share_token', '_hsenc', '_hsmi'
+}
+TRACKING_PREFIXES = ('utm_',)
+
+# 路径中 owner/repo 不区分大小写的代码托管站点
+CASE_INSENSITIVE_REPO_HOSTS = {'github.com', 'gitlab.com'}
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def _is_tracking_param(name: str) -> bool:
+    """判断查询参数是否为跟踪参数"""
+    name = name.lower()
+    return name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    规范化URL，使指向同一资源的不同写法得到相同结果
+
+    规则：统一为 https、主机名小写并去掉 www.、去掉默认端口与片段、
+    删除 utm_* 等跟踪参数并对剩余参数排序、去掉末尾斜杠，
+    GitHub / GitLab 的 owner/repo 部分转为小写并去掉 .git 后缀。
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        规范化后的URL，无法解析时返回去除首尾空白的原始字符串
+    """
+    url = (url or '').strip()
+    if not url:
+        return ''
+
+    try:
+        parts = urlsplit(url if '://' in url else f"https://{url}")
+        scheme = parts.scheme.lower()
+        host = (parts.hostname or '').lower()
+        port = parts.port
+    except ValueError:
+        return url
+
+    if host.startswith('www.'):
+        host = host[4:]
+    if ':' in host:
+        # IPv6 地址需要保留方括号
+        host = f"[{host}]"
+    netloc = host
+    if port and port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{host}:{port}"
+
+    path = parts.path or '/'
+    if host in CASE_INSENSITIVE_REPO_HOSTS:
+        segments = path.split('/')
+        # segments[0] 为空字符串，segments[1:3] 为 owner/repo
+        segments[1:3] = [segment.lower() for segment in segments[1:3]]
+        if len(segments) == 3 and segments[2].endswith('.git'):
+            segments[2] = segments[2][:-4]
+        path = '/'.join(segments)
+    if len(path) > 1:
+        path = path.rstrip('/') or '/'
+
+    query_pairs = [
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(name)
+    ]
+    query = urlencode(sorted(query_pairs))
+
+    return urlunsplit(('https', netloc, path, query, ''))
+
+
+def url_key(url: str) -> int:
+    """
+    计算URL的紧凑去重键：规范化URL的64位哈希
+
+    返回有符号64位整数，可直接作为 SQLite INTEGER 存储。
+
+    Args:
+        url: 原始URL
+
+    Returns:
+        64位整数键
+    """
+    digest = hashlib.blake2b(canonicalize_url(url).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def ensure_url_key(resource: Dict[str, Any]) -> int:
+    """
+    获取资源的URL去重键，缺失时计算并写入 resource['url_key']
+
+    Args:
+        resource: 资源字典
+
+    Returns:
+        64位整数键；资源没有URL时返回 None
+    """
+    key = resource.get('url_key')
+    if key is None:
+        url = resource.get('url')
+        if not url:
+            return None
+        key = url_key(url)
+        resource['url_key'] = key
+    return key
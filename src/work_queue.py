@@ -0,0 +1,322 @@
+"""
+工作队列模块 - 基于SQLite的 (搜索源, 关键词) 任务队列，支持多进程/多机器 worker 以租约方式领取任务
+"""
+import os
+import json
+import time
+import socket
+import sqlite3
+import threading
+from collections import namedtuple
+from typing import Dict, Any, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 已领取的任务
+Task = namedtuple('Task', ['id', 'run_id', 'source', 'keyword', 'attempts'])
+
+# 已结束的任务：status 为 done 或 failed
+FinishedTask = namedtuple('FinishedTask', ['id', 'source', 'keyword', 'status', 'results', 'error'])
+
+
+def default_worker_id() -> str:
+    """生成默认的 worker 标识（主机名-进程号）"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    SQLite任务队列
+
+    coordinator 为每次运行（run_id）写入 (搜索源, 关键词) 任务，worker 以租约方式领取：
+    领取时记录持有者与租约到期时间，worker 崩溃后租约过期，任务会被其他 worker 重新领取。
+    结果写回队列，只有仍持有租约的 worker 才能提交结果。
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 300, max_attempts: int = 3,
+                 journal_mode: str = 'WAL', poll_interval: float = 2):
+        """
+        初始化任务队列
+
+        Args:
+            path: SQLite数据库文件路径（多机器时应位于共享文件系统上）
+            lease_seconds: 任务租约时长（秒），worker 在此期间未完成或续约时任务可被重新领取
+            max_attempts: 每个任务的最大尝试次数，超过后标记为失败
+            journal_mode: SQLite日志模式；WAL 依赖共享内存，仅适用于同一台机器上的多个进程，
+                          多机器共享网络文件系统时应使用 DELETE
+            poll_interval: coordinator 与空闲 worker 轮询队列的间隔（秒）
+        """
+        self.path = path
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None：手动控制事务，领取任务时使用 BEGIN IMMEDIATE 加写锁
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute(f'PRAGMA journal_mode={journal_mode}')
+        self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                run_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                keyword TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                results TEXT,
+                error TEXT,
+                collected INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                UNIQUE (run_id, source, keyword)
+            )
+        ''')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status, lease_expires)')
+
+    def enqueue(self, run_id: str, source: str, keywords: List[str]) -> int:
+        """
+        写入任务（同一次运行中重复的 (搜索源, 关键词) 只保留一个）
+
+        Args:
+            run_id: 运行标识
+            source: 搜索源名称
+            keywords: 关键词列表
+
+        Returns:
+            新写入的任务数
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.executemany(
+                'INSERT OR IGNORE INTO tasks (run_id, source, keyword, updated_at) VALUES (?, ?, ?, ?)',
+                [(run_id, source, keyword, now) for keyword in keywords]
+            )
+            return cursor.rowcount
+
+    def claim(self, worker_id: str, sources: List[str] = None) -> Optional[Task]:
+        """
+        领取一个待处理任务或租约已过期的任务
+
+        Args:
+            worker_id: worker 标识
+            sources: 只领取这些搜索源的任务，None 表示不限
+
+        Returns:
+            领取到的任务，没有可领取的任务时返回 None
+        """
+        now = time.time()
+        query = ("SELECT id, run_id, source, keyword, attempts FROM tasks "
+                 "WHERE (status = 'pending' OR (status = 'leased' AND lease_expires < ?))")
+        params: List[Any] = [now]
+        if sources:
+            query += f" AND source IN ({', '.join('?' for _ in sources)})"
+            params.extend(sources)
+        query += " ORDER BY id LIMIT 1"
+
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                while True:
+                    row = self._conn.execute(query, params).fetchone()
+                    if row is None:
+                        self._conn.execute('COMMIT')
+                        return None
+
+                    task = Task(*row)
+                    if task.attempts < self.max_attempts:
+                        break
+                    # 多次租约过期（worker 反复崩溃）的任务不再重试
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'failed', error = ?, lease_owner = NULL, updated_at = ? "
+                        "WHERE id = ?",
+                        ('租约多次过期', now, task.id)
+                    )
+
+                self._conn.execute(
+                    "UPDATE tasks SET status = 'leased', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires = ?, updated_at = ? WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, task.id)
+                )
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+        return task._replace(attempts=task.attempts + 1)
+
+    def renew(self, task: Task, worker_id: str) -> bool:
+        """
+        续约任务
+
+        Args:
+            task: 任务
+            worker_id: worker 标识
+
+        Returns:
+            是否仍持有该任务的租约
+        """
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (now + self.lease_seconds, now, task.id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task: Task, worker_id: str, results: List[Dict[str, Any]]) -> bool:
+        """
+        提交任务结果
+
+        Args:
+            task: 任务
+            worker_id: worker 标识
+            results: 结果列表
+
+        Returns:
+            是否提交成功；租约已被其他 worker 接管时返回 False
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = 'done', results = ?, error = NULL, lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (json.dumps(results, ensure_ascii=False), time.time(), task.id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, task: Task, worker_id: str, error: str) -> bool:
+        """
+        报告任务失败：未达到最大尝试次数时重新排队，否则标记为失败
+
+        Args:
+            task: 任务
+            worker_id: worker 标识
+            error: 错误信息
+
+        Returns:
+            是否仍持有租约
+        """
+        status = 'failed' if task.attempts >= self.max_attempts else 'pending'
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+                (status, error, time.time(), task.id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def take_finished(self, run_id: str, source: str) -> List[FinishedTask]:
+        """
+        取出某次运行中某个搜索源新结束的任务（每个任务只返回一次）
+
+        Args:
+            run_id: 运行标识
+            source: 搜索源名称
+
+        Returns:
+            新结束的任务列表
+        """
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, source, keyword, status, results, error FROM tasks "
+                    "WHERE run_id = ? AND source = ? AND status IN ('done', 'failed') AND collected = 0 "
+                    "ORDER BY id",
+                    (run_id, source)
+                ).fetchall()
+                self._conn.executemany('UPDATE tasks SET collected = 1 WHERE id = ?', [(row[0],) for row in rows])
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+
+        return [
+            FinishedTask(task_id, task_source, keyword, status, json.loads(results) if results else [], error)
+            for task_id, task_source, keyword, status, results, error in rows
+        ]
+
+    def progress(self, run_id: str) -> Dict[str, int]:
+        """
+        统计某次运行的任务状态
+
+        Args:
+            run_id: 运行标识
+
+        Returns:
+            状态 -> 任务数
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status', (run_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+class LeaseKeeper:
+    """在后台线程中定期续约当前任务，避免耗时较长的任务被其他 worker 接管"""
+
+    def __init__(self, work_queue: WorkQueue, task: Task, worker_id: str):
+        """
+        初始化续约器
+
+        Args:
+            work_queue: 任务队列
+            task: 任务
+            worker_id: worker 标识
+        """
+        self.work_queue = work_queue
+        self.task = task
+        self.worker_id = worker_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="lease-keeper", daemon=True)
+
+    def _run(self):
+        """每隔三分之一租约时长续约一次"""
+        interval = max(1.0, self.work_queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            if not self.work_queue.renew(self.task, self.worker_id):
+                logger.warning(f"任务 {self.task.id} 的租约已失效")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._stop.set()
+        self._thread.join()
+
+
+def create_work_queue(output_dir: str, queue_config: Dict[str, Any] = None) -> WorkQueue:
+    """
+    根据配置创建任务队列
+
+    Args:
+        output_dir: 输出目录（未配置队列路径时队列位于其下的 .queue 目录）
+        queue_config: 队列配置（config.yaml 中的 work_queue 段）
+
+    Returns:
+        任务队列
+    """
+    queue_config = queue_config or {}
+    path = queue_config.get('path') or os.path.join(output_dir, '.queue', 'work_queue.sqlite3')
+    return WorkQueue(
+        path,
+        lease_seconds=queue_config.get('lease_seconds', 300),
+        max_attempts=queue_config.get('max_attempts', 3),
+        journal_mode=queue_config.get('journal_mode', 'WAL'),
+        poll_interval=queue_config.get('poll_interval', 2)
+    )
+